@@ -0,0 +1,178 @@
+"""
+Agent Registry: Process-wide pool of agent instances and Claude clients.
+
+Claude clients are created once per model and shared by every task in the process,
+so their HTTP connection pools (and TLS sessions) are reused across plans.
+
+Agent instances are expensive to build (static resource and video datasets) but keep
+per-run state (timings, token counts), so they are leased exclusively for one run
+and returned to an idle pool afterwards instead of being rebuilt on every dispatch.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from ..services.claude_client import DEFAULT_MODEL, HAIKU_MODEL, ClaudeClient
+from ..utils.logger import setup_logger
+from .base_agent import BaseAgent
+from .documentation_agent import DocumentationAgent
+from .financial_advisor_agent import FinancialAdvisorAgent
+from .resource_locator_agent import ResourceLocatorAgent
+from .risk_assessment_agent import RiskAssessmentAgent
+from .supply_planning_agent import SupplyPlanningAgent
+from .video_curator_agent import VideoCuratorAgent
+
+logger = setup_logger(__name__)
+
+
+class AgentRegistry:
+    """Thread-safe registry of shared Claude clients and pooled agent instances."""
+
+    AGENT_CLASSES: dict[str, type[BaseAgent]] = {
+        "RiskAssessmentAgent": RiskAssessmentAgent,
+        "SupplyPlanningAgent": SupplyPlanningAgent,
+        "FinancialAdvisorAgent": FinancialAdvisorAgent,
+        "ResourceLocatorAgent": ResourceLocatorAgent,
+        "VideoCuratorAgent": VideoCuratorAgent,
+        "DocumentationAgent": DocumentationAgent,
+    }
+
+    # Use Haiku for simple agents (cost optimization), Sonnet for complex reasoning
+    AGENT_MODELS: dict[str, str] = {
+        "RiskAssessmentAgent": HAIKU_MODEL,
+        "SupplyPlanningAgent": HAIKU_MODEL,
+        "FinancialAdvisorAgent": DEFAULT_MODEL,  # Keep Sonnet
+        "ResourceLocatorAgent": HAIKU_MODEL,  # No Claude API calls, but consistent
+        "VideoCuratorAgent": HAIKU_MODEL,  # No Claude API calls, but consistent
+        "DocumentationAgent": HAIKU_MODEL,
+    }
+
+    def __init__(self, max_idle_per_agent: int = 32) -> None:
+        """
+        Initialize registry.
+
+        Args:
+            max_idle_per_agent: Maximum idle instances kept per agent class
+        """
+        self.max_idle_per_agent = max_idle_per_agent
+        self._lock = threading.Lock()
+        self._clients: dict[str, ClaudeClient] = {}
+        self._idle: dict[str, list[BaseAgent]] = {name: [] for name in self.AGENT_CLASSES}
+        self._created: dict[str, int] = {name: 0 for name in self.AGENT_CLASSES}
+        self._leased: dict[str, int] = {name: 0 for name in self.AGENT_CLASSES}
+
+    def register_client(self, client: ClaudeClient) -> ClaudeClient:
+        """
+        Register an existing Claude client as the shared client for its model.
+
+        Args:
+            client: Claude client to share
+
+        Returns:
+            The shared client for that model (the first one registered wins)
+        """
+        with self._lock:
+            return self._clients.setdefault(client.model, client)
+
+    def get_client(self, model: Optional[str] = None) -> ClaudeClient:
+        """
+        Get the shared Claude client for a model, creating it on first use.
+
+        Args:
+            model: Claude model name (defaults to Sonnet)
+
+        Returns:
+            Shared ClaudeClient instance
+        """
+        model = model or DEFAULT_MODEL
+
+        with self._lock:
+            client = self._clients.get(model)
+            if client is None:
+                logger.info(f"Creating shared Claude client for model={model}")
+                client = ClaudeClient(model=model)
+                self._clients[model] = client
+            return client
+
+    def acquire(self, agent_name: str) -> BaseAgent:
+        """
+        Lease an agent instance for exclusive use during one run.
+
+        Args:
+            agent_name: Agent class name
+
+        Returns:
+            Idle pooled instance, or a newly created one if none is idle
+
+        Raises:
+            ValueError: If agent_name is unknown
+        """
+        if agent_name not in self.AGENT_CLASSES:
+            raise ValueError(f"Unknown agent: {agent_name}")
+
+        with self._lock:
+            idle = self._idle[agent_name]
+            agent = idle.pop() if idle else None
+            self._leased[agent_name] += 1
+
+        if agent is None:
+            agent = self.AGENT_CLASSES[agent_name](self.get_client(self.AGENT_MODELS[agent_name]))
+            with self._lock:
+                self._created[agent_name] += 1
+
+        agent.reset_run_state()
+        return agent
+
+    def release(self, agent: BaseAgent) -> None:
+        """
+        Return a leased agent instance to the idle pool.
+
+        Args:
+            agent: Agent instance previously returned by acquire()
+        """
+        agent_name = agent.agent_class_name
+
+        with self._lock:
+            self._leased[agent_name] = max(0, self._leased[agent_name] - 1)
+            idle = self._idle[agent_name]
+            if len(idle) < self.max_idle_per_agent:
+                idle.append(agent)
+
+    @contextmanager
+    def lease(self, agent_name: str) -> Iterator[BaseAgent]:
+        """
+        Context manager that acquires an agent and always releases it.
+
+        Args:
+            agent_name: Agent class name
+
+        Yields:
+            Leased agent instance
+        """
+        agent = self.acquire(agent_name)
+        try:
+            yield agent
+        finally:
+            self.release(agent)
+
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        """
+        Get pool statistics per agent class.
+
+        Returns:
+            Dict of agent name -> created/idle/leased counts
+        """
+        with self._lock:
+            return {
+                name: {
+                    "created": self._created[name],
+                    "idle": len(self._idle[name]),
+                    "leased": self._leased[name]
+                }
+                for name in self.AGENT_CLASSES
+            }
+
+
+# Singleton instance
+agent_registry = AgentRegistry()
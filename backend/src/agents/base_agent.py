@@ -1,11 +1,18 @@
 """Base agent interface for PrepSmart using blackboard pattern."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
+from ..models.agent_output import AgentOutput
 from ..models.blackboard import Blackboard
 from ..services.claude_client import ClaudeClient
+from ..services.rate_limiter import rate_limiter
+from ..services.response_cache import response_cache
+from ..utils.config import settings
+from ..utils.deadline import Deadline
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -15,7 +22,8 @@ class BaseAgent(ABC):
     """
     Abstract base class for all PrepSmart agents using blackboard pattern.
 
-    All agents read from and write to a shared blackboard for coordination.
+    All agents read from a shared blackboard and return their results as an
+    AgentOutput delta, which the coordinator merges into the blackboard.
     """
 
     # Agent emoji icons for UI display (mode-specific)
@@ -71,6 +79,171 @@ class BaseAgent(ABC):
         self.end_time: Optional[datetime] = None
         self.tokens_used: int = 0
         self.cost: float = 0.0
+        self.deadline: Optional[Deadline] = None
+        self.request_priority = "normal"
+        self.early_output_handler: Optional[Callable[[AgentOutput], None]] = None
+
+    def reset_run_state(self) -> None:
+        """Reset per-run tracking so a pooled instance can be reused for a new run."""
+        self.start_time = None
+        self.end_time = None
+        self.tokens_used = 0
+        self.cost = 0.0
+        self.deadline = None
+        self.request_priority = "normal"
+        self.early_output_handler = None
+
+    async def generate_within_deadline(
+        self,
+        prompt: str,
+        system: str = "",
+        max_tokens: Optional[int] = None,
+        progress_task_id: Optional[str] = None,
+        progress_range: tuple[int, int] = (25, 75),
+        on_text: Optional[Callable[[str], None]] = None,
+        prompt_prefix: str = "",
+        size_key: Optional[str] = None
+    ) -> Optional[tuple[str, int, float]]:
+        """
+        Call Claude within the task's remaining time budget.
+
+        Returns None instead of calling Claude when too little budget remains
+        (including the expected rate limiter queue wait), or when the call does
+        not finish before the deadline. Callers should then switch to their
+        deterministic fallback. Responses are served from the response cache
+        when it is enabled for this agent.
+
+        With a progress_task_id or on_text callback (and streaming enabled) the
+        response is streamed: the agent's progress moves through progress_range
+        as output tokens arrive, and on_text sees each text delta.
+
+        max_tokens is the hand-set budget for the call; once enough responses
+        were observed, Claude is called with a budget sized from their lengths.
+
+        Args:
+            prompt: User prompt
+            system: System prompt
+            max_tokens: Maximum tokens to generate
+            progress_task_id: Task ID to report live progress for (None disables it)
+            progress_range: Progress percentages at the start and end of generation
+            on_text: Called with each streamed text delta (e.g. to publish early outputs)
+            prompt_prefix: Static start of the prompt, shared by every call and
+                marked for prompt caching (prompt holds the request-specific rest)
+            size_key: Call site for output length tracking (defaults to the agent
+                name; agents with several kinds of prompts pass one per kind)
+
+        Returns:
+            Tuple of (response_text, tokens_used, cost_estimate), or None
+        """
+        size_key = size_key or self.agent_class_name
+        timeout = None
+
+        if self.deadline is not None:
+            timeout = self.deadline.remaining()
+            if timeout < settings.min_claude_budget_seconds:
+                logger.warning(
+                    f"[{self.agent_class_name}] Only {timeout:.1f}s left in plan deadline, "
+                    f"skipping Claude call and using fallback"
+                )
+                return None
+
+            expected_wait = await asyncio.to_thread(
+                rate_limiter.expected_wait,
+                self.claude_client.model,
+                rate_limiter.estimate_tokens(
+                    prompt_prefix + prompt, system, self.claude_client.max_tokens_for(max_tokens, size_key)
+                ),
+                self.request_priority
+            )
+            if timeout - expected_wait < settings.min_claude_budget_seconds:
+                logger.warning(
+                    f"[{self.agent_class_name}] Expected rate limit wait of {expected_wait:.1f}s "
+                    f"leaves too little of the {timeout:.1f}s budget, using fallback"
+                )
+                return None
+
+        try:
+            streamed = progress_task_id is not None or on_text is not None
+            if streamed and settings.claude_streaming_enabled:
+                async with asyncio.timeout(timeout):
+                    return await self._generate_with_progress(
+                        prompt, system, max_tokens, progress_task_id, progress_range, on_text,
+                        prompt_prefix, size_key
+                    )
+
+            return await self.claude_client.generate_async(
+                prompt=prompt,
+                system=system,
+                max_tokens=max_tokens,
+                timeout=timeout,
+                cache_ttl=response_cache.ttl_for(self.agent_class_name),
+                priority=self.request_priority,
+                prompt_prefix=prompt_prefix,
+                size_key=size_key
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"[{self.agent_class_name}] Claude call hit plan deadline, using fallback"
+            )
+            return None
+
+    async def _generate_with_progress(
+        self,
+        prompt: str,
+        system: str,
+        max_tokens: Optional[int],
+        task_id: Optional[str],
+        progress_range: tuple[int, int],
+        on_text: Optional[Callable[[str], None]] = None,
+        prompt_prefix: str = "",
+        size_key: Optional[str] = None
+    ) -> tuple[str, int, float]:
+        """
+        Stream a Claude response, turning output tokens into throttled progress updates.
+
+        Args:
+            prompt: User prompt
+            system: System prompt
+            max_tokens: Maximum tokens to generate
+            task_id: Task ID to report progress for (None disables progress updates)
+            progress_range: Progress percentages at the start and end of generation
+            on_text: Called with each streamed text delta
+            prompt_prefix: Static start of the prompt, marked for prompt caching
+            size_key: Call site for output length tracking
+
+        Returns:
+            Tuple of (response_text, tokens_used, cost_estimate)
+        """
+        start, end = progress_range
+        token_budget = self.claude_client.max_tokens_for(max_tokens, size_key)
+        last_progress, last_update = start, time.monotonic()
+
+        async for event in self.claude_client.generate_stream(
+            prompt=prompt,
+            system=system,
+            max_tokens=max_tokens,
+            cache_ttl=response_cache.ttl_for(self.agent_class_name),
+            priority=self.request_priority,
+            prompt_prefix=prompt_prefix,
+            size_key=size_key
+        ):
+            if event["type"] == "final":
+                return event["text"], event["tokens_used"], event["cost"]
+
+            if on_text is not None:
+                on_text(event["text"])
+            if task_id is None:
+                continue
+
+            progress = start + int((end - start) * min(1.0, event["output_tokens"] / token_budget))
+            now = time.monotonic()
+            if progress > last_progress and now - last_update >= settings.progress_update_interval_seconds:
+                await self.log_activity(
+                    task_id, "active", f"Generating response ({event['output_tokens']} tokens)", progress
+                )
+                last_progress, last_update = progress, now
+
+        raise RuntimeError("Claude stream ended without a final event")
 
     def get_agent_emoji(self, crisis_mode: str) -> str:
         """
@@ -99,7 +272,7 @@ class BaseAgent(ABC):
         return mode_labels.get(self.agent_class_name, self.agent_class_name)
 
     @abstractmethod
-    async def process(self, blackboard: Blackboard) -> Blackboard:
+    async def process(self, blackboard: Blackboard) -> AgentOutput:
         """
         Process blackboard and generate agent-specific output.
 
@@ -107,21 +280,58 @@ class BaseAgent(ABC):
         Agents should:
         1. Read inputs from blackboard (crisis_profile, other agent results)
         2. Perform their specialized task
-        3. Write results back to blackboard
+        3. Return results as an AgentOutput (never mutate the blackboard)
         4. Update tracking metrics (tokens, cost)
 
         Args:
-            blackboard: Shared blackboard state
+            blackboard: Read-only snapshot of the shared blackboard
 
         Returns:
-            Updated blackboard with agent's output
+            AgentOutput with the blackboard fields this agent produced
 
         Raises:
             NotImplementedError: If not implemented by subclass
         """
         pass
 
-    def log_activity(
+    def build_output(self, **fields: Any) -> AgentOutput:
+        """
+        Build this run's output delta from produced fields and tracked metrics.
+
+        Args:
+            **fields: Blackboard field name -> value produced by this agent
+
+        Returns:
+            AgentOutput with status "completed"
+        """
+        return AgentOutput(
+            agent_name=self.agent_class_name,
+            fields=fields,
+            tokens_used=self.tokens_used,
+            cost=self.cost
+        )
+
+    def publish_early_output(self, **fields: Any) -> None:
+        """
+        Publish a subset of this run's fields before the agent finishes.
+
+        Lets the coordinator start dependents that only read these fields (see
+        EARLY_OUTPUT_CONSUMERS). The final output replaces the early fields.
+        Does nothing when the agent runs outside the coordinator.
+
+        Args:
+            **fields: Blackboard field name -> early value
+        """
+        if self.early_output_handler is None:
+            return
+
+        self.early_output_handler(
+            AgentOutput(agent_name=self.agent_class_name, status="partial", fields=fields)
+        )
+        # Publish once per run
+        self.early_output_handler = None
+
+    async def log_activity(
         self,
         task_id: str,
         status: str,
@@ -131,6 +341,8 @@ class BaseAgent(ABC):
         """
         Log agent activity for UI display.
 
+        The database write runs in a worker thread so it never blocks the event loop.
+
         Args:
             task_id: Crisis plan task ID
             status: Agent status (waiting/active/complete/error)
@@ -141,7 +353,10 @@ class BaseAgent(ABC):
             f"[{self.agent_class_name}] Task {task_id}: {status} - {description} ({progress}%)"
         )
 
-        # Store in database for real-time UI updates
+        await asyncio.to_thread(self._write_activity, task_id, status, description, progress)
+
+    def _write_activity(self, task_id: str, status: str, description: str, progress: int) -> None:
+        """Store agent activity in the database for real-time UI updates."""
         try:
             from ..api.database import get_db
             import uuid
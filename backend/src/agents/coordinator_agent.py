@@ -2,20 +2,51 @@
 Coordinator Agent: Orchestrates multi-agent execution using blackboard pattern.
 
 The coordinator monitors the blackboard, determines which agents can run based on
-preconditions, dispatches agents in parallel when possible, and handles failures.
+preconditions, starts each agent as soon as its own dependencies are on the blackboard,
+and handles failures.
 """
 
 import asyncio
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Iterable, Optional
 
+from ..models.agent_output import AgentOutput
 from ..models.blackboard import Blackboard
 from ..services.blackboard_service import blackboard_service
 from ..services.claude_client import ClaudeClient
+from ..utils.config import settings
+from ..utils.deadline import Deadline
 from ..utils.logger import setup_logger
+from .agent_registry import AgentRegistry, agent_registry
 
 logger = setup_logger(__name__)
 
+# Agent dependency graph: an agent can start as soon as every agent it depends on
+# has written its results to the blackboard. Dependencies on agents that do not
+# take part in a plan (e.g. FinancialAdvisorAgent in natural disaster mode) are ignored.
+AGENT_DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    "RiskAssessmentAgent": (),
+    "SupplyPlanningAgent": ("RiskAssessmentAgent",),
+    "ResourceLocatorAgent": (),
+    "VideoCuratorAgent": (),
+    "FinancialAdvisorAgent": ("RiskAssessmentAgent",),
+    "DocumentationAgent": (
+        "RiskAssessmentAgent",
+        "SupplyPlanningAgent",
+        "ResourceLocatorAgent",
+        "VideoCuratorAgent",
+        "FinancialAdvisorAgent",
+    ),
+}
+
+# Dependents that only read the fields an agent publishes early (see
+# BaseAgent.publish_early_output), so they may start on its early output instead
+# of waiting for the agent to finish
+EARLY_OUTPUT_CONSUMERS: dict[str, tuple[str, ...]] = {
+    "RiskAssessmentAgent": ("SupplyPlanningAgent", "FinancialAdvisorAgent"),
+}
+
 
 class CoordinatorAgent:
     """
@@ -24,36 +55,76 @@ class CoordinatorAgent:
     The coordinator:
     1. Initializes blackboard with crisis profile
     2. Determines which agents can run (precondition checking)
-    3. Dispatches agents in parallel when dependencies allow
+    3. Starts each agent as soon as its dependencies complete (no batch barriers)
     4. Monitors completion and handles failures
     5. Updates blackboard status throughout execution
     """
 
-    def __init__(self, claude_client: ClaudeClient):
+    def __init__(self, claude_client: ClaudeClient, registry: Optional[AgentRegistry] = None):
         """
         Initialize coordinator.
 
         Args:
-            claude_client: Claude API client (passed to agents)
+            claude_client: Claude API client (shared with agents using its model)
+            registry: Agent/client registry (defaults to the process-wide registry)
         """
         self.claude_client = claude_client
+        self.registry = registry or agent_registry
+        self.registry.register_client(claude_client)
         self.max_retries = 2
-        self.agent_timeout = 120  # seconds per agent (increased for Financial Advisor)
+        self.agent_timeout = 120  # hard cap per agent (increased for Financial Advisor)
+        self.deadline_grace = 5  # seconds past the plan deadline for agents to finish fallbacks
+
+    def get_plan_agents(self, crisis_mode: Optional[str]) -> list[str]:
+        """
+        Get the agents that take part in a plan for the given crisis mode.
+
+        Args:
+            crisis_mode: "natural_disaster" or "economic_crisis"
+
+        Returns:
+            Agent class names in canonical order
+        """
+        return [
+            agent_name for agent_name in AGENT_DEPENDENCIES
+            if agent_name != "FinancialAdvisorAgent" or crisis_mode == "economic_crisis"
+        ]
+
+    def get_agent_dependencies(self, agent_name: str, crisis_mode: Optional[str]) -> list[str]:
+        """
+        Get the agents whose results must be on the blackboard before an agent can run.
+
+        Args:
+            agent_name: Agent class name
+            crisis_mode: "natural_disaster" or "economic_crisis"
 
-    def get_ready_agents(self, blackboard: Blackboard) -> list[str]:
+        Returns:
+            Dependency agent class names that take part in this plan
+        """
+        plan_agents = self.get_plan_agents(crisis_mode)
+        return [dep for dep in AGENT_DEPENDENCIES.get(agent_name, ()) if dep in plan_agents]
+
+    def get_ready_agents(
+        self,
+        blackboard: Blackboard,
+        running: Iterable[str] = (),
+        published_early: Iterable[str] = ()
+    ) -> list[str]:
         """
         Determine which agents can run based on preconditions.
 
-        Agent dependencies (discovered iteratively):
+        Agent dependencies (see AGENT_DEPENDENCIES):
         - RiskAssessmentAgent: No dependencies (always ready)
-        - SupplyPlanningAgent: Needs RiskAssessment complete
+        - SupplyPlanningAgent: Needs RiskAssessment complete (or its early risk level)
         - ResourceLocatorAgent: No strict dependencies (can run anytime)
         - VideoCuratorAgent: No strict dependencies (can run anytime)
-        - FinancialAdvisorAgent: Needs RiskAssessment (economic mode only)
+        - FinancialAdvisorAgent: Needs RiskAssessment (or its early risk level; economic mode only)
         - DocumentationAgent: Needs ALL other agents complete
 
         Args:
             blackboard: Current blackboard state
+            running: Agent class names that are already executing
+            published_early: Running agents whose early output is on the blackboard
 
         Returns:
             List of agent class names that are ready to execute
@@ -64,156 +135,329 @@ class CoordinatorAgent:
         crisis_mode = blackboard.crisis_profile.get("crisis_mode")
         completed = set(blackboard.agents_completed)
         failed = set(blackboard.agents_failed)
+        running = set(running)
+        published_early = set(published_early)
 
         ready = []
-
-        # RiskAssessmentAgent: Always ready if not done
-        if "RiskAssessmentAgent" not in completed and "RiskAssessmentAgent" not in failed:
-            ready.append("RiskAssessmentAgent")
-
-        # SupplyPlanningAgent: Needs RiskAssessment
-        if ("SupplyPlanningAgent" not in completed and
-            "SupplyPlanningAgent" not in failed and
-            blackboard.risk_assessment is not None):
-            ready.append("SupplyPlanningAgent")
-
-        # ResourceLocatorAgent: Can run anytime (no strict dependencies)
-        if ("ResourceLocatorAgent" not in completed and
-            "ResourceLocatorAgent" not in failed):
-            ready.append("ResourceLocatorAgent")
-
-        # VideoCuratorAgent: Can run anytime
-        if ("VideoCuratorAgent" not in completed and
-            "VideoCuratorAgent" not in failed):
-            ready.append("VideoCuratorAgent")
-
-        # FinancialAdvisorAgent: Only for economic crisis, needs RiskAssessment
-        if crisis_mode == "economic_crisis":
-            if ("FinancialAdvisorAgent" not in completed and
-                "FinancialAdvisorAgent" not in failed and
-                blackboard.risk_assessment is not None):
-                ready.append("FinancialAdvisorAgent")
-
-        # DocumentationAgent: Needs all others complete
-        required_for_docs = ["RiskAssessmentAgent", "SupplyPlanningAgent",
-                             "ResourceLocatorAgent", "VideoCuratorAgent"]
-        if crisis_mode == "economic_crisis":
-            required_for_docs.append("FinancialAdvisorAgent")
-
-        if ("DocumentationAgent" not in completed and
-            "DocumentationAgent" not in failed and
-            all(agent in completed for agent in required_for_docs)):
-            ready.append("DocumentationAgent")
+        for agent_name in self.get_plan_agents(crisis_mode):
+            if agent_name in completed or agent_name in failed or agent_name in running:
+                continue
+
+            dependencies = self.get_agent_dependencies(agent_name, crisis_mode)
+            if all(
+                dep in completed
+                or (dep in published_early and agent_name in EARLY_OUTPUT_CONSUMERS.get(dep, ()))
+                for dep in dependencies
+            ):
+                ready.append(agent_name)
 
         return ready
 
-    async def dispatch_agents(
+    async def run_agents(
         self,
-        agent_names: list[str],
-        blackboard: Blackboard
+        blackboard: Blackboard,
+        deadline: Optional[Deadline] = None
     ) -> Blackboard:
         """
-        Dispatch multiple agents in parallel.
+        Run all plan agents, starting each one as soon as its dependencies complete.
+
+        Unlike batch dispatch, a slow agent only delays the agents that actually
+        depend on it. Each agent reads a snapshot of the blackboard taken when it
+        starts and returns an AgentOutput delta; the coordinator is the only writer.
+        Outputs that finish together are merged in canonical agent order, and each
+        agent's columns are committed as soon as it finishes so its section is
+        visible immediately.
+
+        Early outputs published by a running agent are merged into the in-memory
+        blackboard (not committed) and start the dependents listed in
+        EARLY_OUTPUT_CONSUMERS. If the agent's final output disagrees with what it
+        published early, the dependents that started on the early output are
+        cancelled or reopened and run again on the final output.
 
         Args:
-            agent_names: List of agent class names to execute
             blackboard: Current blackboard state
+            deadline: Task deadline passed down to every agent
 
         Returns:
-            Updated blackboard after agent execution
+            Updated blackboard after all runnable agents have finished
         """
-        if not agent_names:
-            return blackboard
+        task_id = blackboard.task_id
+        crisis_mode = blackboard.crisis_profile.get("crisis_mode") if blackboard.crisis_profile else None
+
+        plan_agents = self.get_plan_agents(crisis_mode)
+        running: dict[asyncio.Task, str] = {}
+        timings: dict[str, tuple[float, float]] = {}
+        started_at: dict[str, float] = {}
+        plan_start = time.monotonic()
+
+        # Agents run on this loop, so they can hand early outputs over directly
+        early_outputs: asyncio.Queue = asyncio.Queue()
+        early_getter = asyncio.ensure_future(early_outputs.get())
+        published_early: set[str] = set()
+        # Agent -> fields it published early, and the dependents started on them
+        early_fields: dict[str, dict[str, Any]] = {}
+        started_on_early: dict[str, set[str]] = {}
 
-        logger.info(f"Dispatching agents in parallel: {', '.join(agent_names)}")
-
-        # Import agents dynamically to avoid circular imports
-        from .risk_assessment_agent import RiskAssessmentAgent
-        from .supply_planning_agent import SupplyPlanningAgent
-        from .financial_advisor_agent import FinancialAdvisorAgent
-        from .resource_locator_agent import ResourceLocatorAgent
-        from .video_curator_agent import VideoCuratorAgent
-        from .documentation_agent import DocumentationAgent
-        from ..services.claude_client import ClaudeClient
-
-        # Create Haiku client for simple agents (cost optimization)
-        # Use Claude 3.5 Haiku (latest available as of Oct 2024)
-        haiku_client = ClaudeClient(model="claude-3-5-haiku-20241022")
-
-        # Use Haiku for simple agents, Sonnet for complex reasoning (Financial Advisor)
-        agent_map = {
-            "RiskAssessmentAgent": RiskAssessmentAgent(haiku_client),
-            "SupplyPlanningAgent": SupplyPlanningAgent(haiku_client),
-            "FinancialAdvisorAgent": FinancialAdvisorAgent(self.claude_client),  # Keep Sonnet
-            "ResourceLocatorAgent": ResourceLocatorAgent(haiku_client),  # No Claude API calls, but consistent
-            "VideoCuratorAgent": VideoCuratorAgent(haiku_client),  # No Claude API calls, but consistent
-            "DocumentationAgent": DocumentationAgent(haiku_client),
-        }
-
-        # Filter to only agents we have implementations for
-        available_agents = [name for name in agent_names if name in agent_map]
-
-        if not available_agents:
-            logger.warning(f"No implementations available for agents: {agent_names}")
-            return blackboard
+        try:
+            while True:
+                # Start every agent whose dependencies are now on the blackboard
+                for agent_name in self.get_ready_agents(blackboard, running.values(), published_early):
+                    logger.info(f"Starting {agent_name} for task_id={task_id}")
+                    for dep in self.get_agent_dependencies(agent_name, crisis_mode):
+                        if dep in published_early:
+                            started_on_early.setdefault(dep, set()).add(agent_name)
+                    # Deep snapshot: the agent never sees outputs that land (or lists
+                    # appended to in place) while it is running
+                    snapshot = blackboard.snapshot()
+                    task = asyncio.create_task(
+                        self._run_pooled_agent(agent_name, snapshot, deadline, early_outputs.put_nowait)
+                    )
+                    running[task] = agent_name
+                    started_at[agent_name] = time.monotonic() - plan_start
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(
+                    [*running, early_getter], return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if early_getter in done:
+                    done.discard(early_getter)
+                    early_output = early_getter.result()
+                    early_getter = asyncio.ensure_future(early_outputs.get())
+
+                    # Ignore stragglers from agents that already finished
+                    if early_output.agent_name in running.values():
+                        logger.info(
+                            f"{early_output.agent_name} published early output "
+                            f"{list(early_output.fields)} for task_id={task_id}"
+                        )
+                        blackboard.apply_output(early_output)
+                        published_early.add(early_output.agent_name)
+                        early_fields[early_output.agent_name] = early_output.fields
+
+                # Merge in canonical order so the result never depends on task scheduling
+                for task in sorted(done, key=lambda t: plan_agents.index(running[t])):
+                    # Skip dependents just cancelled for a re-run
+                    agent_name = running.pop(task, None)
+                    if agent_name is None:
+                        continue
+                    published_early.discard(agent_name)
+                    timings[agent_name] = (started_at[agent_name], time.monotonic() - plan_start)
+                    output = self._collect_output(agent_name, task)
+                    changed = blackboard.apply_output(output)
+
+                    early = early_fields.pop(agent_name, None)
+                    dependents = started_on_early.pop(agent_name, set())
+                    if early is not None and dependents and self._early_output_differs(early, output):
+                        logger.warning(
+                            f"{agent_name} final output differs from its early output for "
+                            f"task_id={task_id}, re-running {sorted(dependents)}"
+                        )
+                        changed += self._rerun_dependents(blackboard, dependents, running)
+
+                    # Commit only this agent's columns so its section is visible immediately
+                    # (in a worker thread; nothing else touches the blackboard meanwhile)
+                    await asyncio.to_thread(blackboard_service.update_fields, blackboard, changed)
+
+        finally:
+            early_getter.cancel()
+            for task in running:
+                task.cancel()
+
+        critical_path = self.get_critical_path(timings, crisis_mode)
+        if critical_path:
+            path_str = " -> ".join(
+                f"{step['agent_name']} ({step['duration_seconds']:.2f}s)" for step in critical_path
+            )
+            logger.info(
+                f"Critical path for task_id={task_id}: {path_str} "
+                f"(finished at {critical_path[-1]['finished_at_seconds']:.2f}s)"
+            )
 
-        # Create tasks for parallel execution
-        tasks = []
-        for agent_name in available_agents:
-            agent = agent_map[agent_name]
-            task = self._execute_agent_safely(agent, blackboard, agent_name)
-            tasks.append(task)
-
-        # Execute agents in parallel
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Process results
-        for agent_name, result in zip(available_agents, results):
-            if isinstance(result, Exception):
-                logger.error(f"{agent_name} failed: {result}")
-                blackboard.mark_agent_failed(agent_name, str(result))
-            elif isinstance(result, Blackboard):
-                # Agent succeeded, blackboard was updated
-                blackboard = result
-                logger.info(f"{agent_name} completed successfully")
-            else:
-                logger.warning(f"{agent_name} returned unexpected result: {type(result)}")
+        return blackboard
+
+    @staticmethod
+    def _early_output_differs(early_fields: dict[str, Any], output: AgentOutput) -> bool:
+        """
+        Check whether an agent's final output disagrees with what it published early.
 
-        # Persist blackboard after agent batch
-        blackboard_service.update_blackboard(blackboard)
+        Args:
+            early_fields: Field name -> value published early
+            output: The agent's final output
 
-        return blackboard
+        Returns:
+            True if any early value (or key of an early dict value) differs in
+            the final output (a failed run's dependents cannot run again anyway)
+        """
+        if output.status != "completed":
+            return False
+
+        for field_name, early_value in early_fields.items():
+            final_value = output.fields.get(field_name)
+            if isinstance(early_value, dict) and isinstance(final_value, dict):
+                if any(final_value.get(key) != value for key, value in early_value.items()):
+                    return True
+            elif final_value != early_value:
+                return True
+        return False
+
+    def _rerun_dependents(
+        self,
+        blackboard: Blackboard,
+        dependents: set[str],
+        running: dict[asyncio.Task, str]
+    ) -> list[str]:
+        """
+        Make dependents that ran on a stale early output run again.
+
+        Running dependents are cancelled; finished ones are reopened. Either way
+        the scheduler starts them again on the current blackboard.
+
+        Args:
+            blackboard: Current blackboard state
+            dependents: Agent class names to run again
+            running: Running agent tasks (cancelled dependents are removed)
+
+        Returns:
+            Names of blackboard fields changed
+        """
+        changed = []
+        for task, agent_name in list(running.items()):
+            if agent_name in dependents:
+                task.cancel()
+                del running[task]
+
+        for agent_name in sorted(dependents):
+            changed += blackboard.reopen_agent(agent_name)
+        return changed
+
+    def _collect_output(self, agent_name: str, task: asyncio.Task) -> AgentOutput:
+        """
+        Turn a finished agent task into an output delta to merge.
+
+        Args:
+            agent_name: Agent class name
+            task: Finished agent task
+
+        Returns:
+            The agent's output, or a failed output if it raised or returned junk
+        """
+        if task.exception() is not None:
+            logger.error(f"{agent_name} failed: {task.exception()}")
+            return AgentOutput.failed(agent_name, str(task.exception()))
+
+        output = task.result()
+        if not isinstance(output, AgentOutput) or output.agent_name != agent_name:
+            logger.warning(f"{agent_name} returned unexpected result: {type(output)}")
+            return AgentOutput.failed(agent_name, f"{agent_name} returned an invalid output")
+
+        logger.info(f"{agent_name} finished with status={output.status}")
+        return output
+
+    def get_critical_path(
+        self,
+        timings: dict[str, tuple[float, float]],
+        crisis_mode: Optional[str]
+    ) -> list[dict[str, Any]]:
+        """
+        Compute the chain of agents that determined total plan latency.
+
+        Starting from the agent that finished last, walk back through the
+        dependency that finished last until reaching an agent with no
+        (executed) dependencies.
+
+        Args:
+            timings: Agent name -> (start, end) offsets in seconds from plan start
+            crisis_mode: "natural_disaster" or "economic_crisis"
+
+        Returns:
+            Critical path steps in execution order
+        """
+        if not timings:
+            return []
+
+        path = []
+        current: Optional[str] = max(timings, key=lambda name: timings[name][1])
+
+        while current is not None:
+            start, end = timings[current]
+            path.append({
+                "agent_name": current,
+                "started_at_seconds": round(start, 3),
+                "finished_at_seconds": round(end, 3),
+                "duration_seconds": round(end - start, 3)
+            })
+
+            executed_deps = [
+                dep for dep in self.get_agent_dependencies(current, crisis_mode)
+                if dep in timings
+            ]
+            current = max(executed_deps, key=lambda name: timings[name][1]) if executed_deps else None
+
+        path.reverse()
+        return path
+
+    async def _run_pooled_agent(
+        self,
+        agent_name: str,
+        blackboard: Blackboard,
+        deadline: Optional[Deadline] = None,
+        early_output_handler: Optional[Callable[[AgentOutput], None]] = None
+    ) -> AgentOutput:
+        """
+        Lease an agent from the registry, run it, and return it to the pool.
+
+        Args:
+            agent_name: Agent class name
+            blackboard: Blackboard snapshot for the agent to read
+            deadline: Task deadline for the agent's Claude calls
+            early_output_handler: Receives the agent's early output, if it publishes one
+
+        Returns:
+            The agent's output delta
+        """
+        with self.registry.lease(agent_name) as agent:
+            agent.deadline = deadline
+            agent.early_output_handler = early_output_handler
+            return await self._execute_agent_safely(agent, blackboard, agent_name)
 
     async def _execute_agent_safely(
         self,
         agent,
         blackboard: Blackboard,
         agent_name: str
-    ) -> Blackboard:
+    ) -> AgentOutput:
         """
         Execute an agent with timeout and error handling.
 
         Args:
             agent: Agent instance
-            blackboard: Current blackboard
+            blackboard: Blackboard snapshot for the agent to read
             agent_name: Agent class name for logging
 
         Returns:
-            Updated blackboard
+            The agent's output delta
 
         Raises:
             Exception: If agent fails after retries
         """
+        # Agents fall back to deterministic plans before the deadline; the grace
+        # period only bounds agents that fail to do so
+        timeout = self.agent_timeout
+        if agent.deadline is not None:
+            timeout = agent.deadline.timeout(cap=self.agent_timeout, grace=self.deadline_grace)
+
         try:
             # Execute agent with timeout
-            updated_blackboard = await asyncio.wait_for(
+            return await asyncio.wait_for(
                 agent.process(blackboard),
-                timeout=self.agent_timeout
+                timeout=timeout
             )
-            return updated_blackboard
 
         except asyncio.TimeoutError:
-            error_msg = f"{agent_name} timed out after {self.agent_timeout}s"
+            error_msg = f"{agent_name} timed out after {timeout:.1f}s"
             logger.error(error_msg)
             raise Exception(error_msg)
 
@@ -222,7 +466,32 @@ class CoordinatorAgent:
             logger.error(error_msg)
             raise Exception(error_msg)
 
-    async def generate_plan(self, crisis_profile: dict) -> Blackboard:
+    async def _prepare_resume(self, blackboard: Blackboard) -> None:
+        """
+        Prepare a persisted blackboard for resumption.
+
+        Agents already in agents_completed keep their persisted outputs and are
+        skipped by the scheduler, so their Claude calls are not paid for again.
+        Failed agents are cleared so they get another chance.
+
+        Args:
+            blackboard: Blackboard loaded from the database
+        """
+        logger.info(
+            f"Resuming plan generation for task_id={blackboard.task_id}: "
+            f"skipping completed agents {blackboard.agents_completed}, "
+            f"retrying failed agents {blackboard.agents_failed}"
+        )
+
+        blackboard.agents_failed = []
+        blackboard.status = "processing"
+        blackboard.execution_end = None
+        blackboard.total_execution_seconds = None
+        if blackboard.execution_start is None:
+            blackboard.execution_start = datetime.utcnow()
+        await asyncio.to_thread(blackboard_service.update_blackboard, blackboard)
+
+    async def generate_plan(self, crisis_profile: dict, resume: bool = False) -> Blackboard:
         """
         Generate complete crisis plan using multi-agent orchestration.
 
@@ -230,6 +499,8 @@ class CoordinatorAgent:
 
         Args:
             crisis_profile: User's crisis scenario (CrisisProfile as dict)
+            resume: Continue from the persisted blackboard if one exists
+                (used when an orphaned job is picked up after a worker restart)
 
         Returns:
             Completed blackboard with all agent results
@@ -238,47 +509,43 @@ class CoordinatorAgent:
             Exception: If plan generation fails
         """
         task_id = crisis_profile.get("task_id")
-        logger.info(f"Starting plan generation for task_id={task_id}")
 
-        # Create blackboard
-        blackboard = blackboard_service.create_blackboard(crisis_profile)
-        blackboard.status = "processing"
-        blackboard.execution_start = datetime.utcnow()
-        blackboard_service.update_blackboard(blackboard)
+        # SQLite calls run in worker threads so a busy database never stalls the shared event loop
+        blackboard = await asyncio.to_thread(blackboard_service.get_blackboard, task_id) if resume else None
+
+        if blackboard is None:
+            logger.info(f"Starting plan generation for task_id={task_id}")
+
+            # Create blackboard
+            blackboard = await asyncio.to_thread(blackboard_service.create_blackboard, crisis_profile)
+            blackboard.status = "processing"
+            blackboard.execution_start = datetime.utcnow()
+            await asyncio.to_thread(blackboard_service.update_blackboard, blackboard)
+
+        elif blackboard.status == "completed":
+            logger.info(f"Plan already completed for task_id={task_id}, nothing to resume")
+            return blackboard
+
+        else:
+            await self._prepare_resume(blackboard)
 
         try:
-            # Main orchestration loop
-            max_iterations = 20  # Prevent infinite loops
-            iteration = 0
-
-            while not blackboard.is_complete() and iteration < max_iterations:
-                iteration += 1
-                logger.info(f"Orchestration iteration {iteration}")
-
-                # Get agents that can run
-                ready_agents = self.get_ready_agents(blackboard)
-
-                if not ready_agents:
-                    # Check if we're stuck
-                    pending = blackboard.get_pending_agents()
-                    if pending:
-                        error_msg = f"No agents ready but {len(pending)} pending: {pending}"
-                        logger.error(error_msg)
-                        blackboard.status = "failed"
-                        blackboard.errors.append({
-                            "message": error_msg,
-                            "timestamp": datetime.utcnow().isoformat()
-                        })
-                        break
-                    else:
-                        # All done
-                        break
-
-                # Dispatch ready agents in parallel
-                blackboard = await self.dispatch_agents(ready_agents, blackboard)
-
-                # Small delay between iterations
-                await asyncio.sleep(0.1)
+            # One deadline for the whole task, shared by every agent and Claude call
+            deadline = Deadline(settings.plan_deadline_seconds)
+
+            # Event-driven orchestration: agents start as their dependencies complete
+            blackboard = await self.run_agents(blackboard, deadline)
+
+            if not blackboard.is_complete():
+                # Check if we're stuck
+                pending = blackboard.get_pending_agents()
+                if pending:
+                    error_msg = f"No agents ready but {len(pending)} pending: {pending}"
+                    logger.error(error_msg)
+                    blackboard.errors.append({
+                        "message": error_msg,
+                        "timestamp": datetime.utcnow().isoformat()
+                    })
 
             # Check completion
             if blackboard.is_complete():
@@ -291,7 +558,7 @@ class CoordinatorAgent:
             # Finalize
             blackboard.execution_end = datetime.utcnow()
             blackboard.calculate_execution_time()
-            blackboard_service.update_blackboard(blackboard)
+            await asyncio.to_thread(blackboard_service.update_blackboard, blackboard)
 
             logger.info(
                 f"Plan generation finished: status={blackboard.status}, "
@@ -311,7 +578,7 @@ class CoordinatorAgent:
                 "message": str(e),
                 "timestamp": datetime.utcnow().isoformat()
             })
-            blackboard_service.update_blackboard(blackboard)
+            await asyncio.to_thread(blackboard_service.update_blackboard, blackboard)
             raise
 
 
@@ -321,12 +588,12 @@ def create_coordinator(claude_client: Optional[ClaudeClient] = None) -> Coordina
     Create coordinator instance.
 
     Args:
-        claude_client: Optional Claude client (creates new if not provided)
+        claude_client: Optional Claude client (uses the shared default client if not provided)
 
     Returns:
         CoordinatorAgent instance
     """
     if claude_client is None:
-        claude_client = ClaudeClient()
+        claude_client = agent_registry.get_client()
 
     return CoordinatorAgent(claude_client)
@@ -20,7 +20,8 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 
 from .base_agent import BaseAgent
-from ..models.blackboard import Blackboard
+from ..models.agent_output import AgentOutput
+from ..models.blackboard import Blackboard, materialize_complete_plan
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -41,7 +42,7 @@ class DocumentationAgent(BaseAgent):
         super().__init__(claude_client, timeout)
         self.agent_type = "documentation"
 
-    async def process(self, blackboard: Blackboard) -> Blackboard:
+    async def process(self, blackboard: Blackboard) -> AgentOutput:
         """
         Assemble complete plan and generate PDF using blackboard pattern.
 
@@ -53,15 +54,15 @@ class DocumentationAgent(BaseAgent):
         - resource_locations
         - video_recommendations
 
-        Writes to blackboard:
-        - complete_plan (assembled plan data)
+        Writes (via AgentOutput):
+        - complete_plan (plan manifest referencing the sections above)
         - pdf_path (file path to generated PDF)
 
         Args:
-            blackboard: Shared blackboard state
+            blackboard: Read-only snapshot of the shared blackboard
 
         Returns:
-            Updated blackboard with complete_plan and pdf_path
+            AgentOutput with complete_plan and pdf_path
         """
         self.start_time = datetime.utcnow()
         crisis_profile = blackboard.crisis_profile
@@ -84,29 +85,19 @@ class DocumentationAgent(BaseAgent):
 
             logger.info(f"{agent_emoji} Complete plan assembled, generating PDF...")
 
-            # Generate PDF
-            pdf_path = self._generate_pdf(blackboard, complete_plan)
+            # Generate PDF (the one place the full document is needed)
+            pdf_path = self._generate_pdf(blackboard, materialize_complete_plan(complete_plan, blackboard))
 
             logger.info(f"{agent_emoji} PDF generated: {pdf_path}")
 
-            # Write to blackboard
-            blackboard.complete_plan = complete_plan
-            blackboard.pdf_path = pdf_path
-
             # No tokens used (no Claude API call for PDF generation)
             self.tokens_used = 0
             self.cost = 0.0
 
-            blackboard.mark_agent_complete(
-                self.agent_class_name,
-                self.tokens_used,
-                self.cost
-            )
-
             self.end_time = datetime.utcnow()
 
             # Log completion for UI
-            self.log_activity(
+            await self.log_activity(
                 task_id,
                 "completed",
                 "Documentation and PDF generation complete",
@@ -118,7 +109,7 @@ class DocumentationAgent(BaseAgent):
                 f"PDF generated at {pdf_path}"
             )
 
-            return blackboard
+            return self.build_output(complete_plan=complete_plan, pdf_path=pdf_path)
 
         except Exception as e:
             self.end_time = datetime.utcnow()
@@ -126,7 +117,13 @@ class DocumentationAgent(BaseAgent):
             raise
 
     def _assemble_complete_plan(self, blackboard: Blackboard) -> Dict[str, Any]:
-        """Assemble complete plan from all agent results."""
+        """
+        Assemble the complete plan manifest from all agent results.
+
+        Agent sections are referenced by name (section_refs) rather than copied, so
+        they are stored and returned once; materialize_complete_plan() inlines them
+        when the full document is needed.
+        """
         crisis_profile = blackboard.crisis_profile
         crisis_mode = crisis_profile.get('crisis_mode')
 
@@ -140,30 +137,30 @@ class DocumentationAgent(BaseAgent):
             "budget_tier": crisis_profile.get('budget_tier'),
         }
 
-        # Include agent results (with graceful handling of missing data)
+        # Reference agent results (with graceful handling of missing data)
+        section_refs = []
+
         if blackboard.risk_assessment:
-            complete_plan["risk_assessment"] = blackboard.risk_assessment
+            section_refs.append("risk_assessment")
         else:
             logger.warning("⚠️ Risk assessment missing from blackboard")
-            complete_plan["risk_assessment"] = None
 
         if blackboard.supply_plan:
-            complete_plan["supply_plan"] = blackboard.supply_plan
+            section_refs.append("supply_plan")
         else:
             logger.warning("⚠️ Supply plan missing from blackboard")
-            complete_plan["supply_plan"] = None
 
         # Economic plan (only for economic crisis)
         if crisis_mode == "economic_crisis" and blackboard.economic_plan:
-            complete_plan["economic_plan"] = blackboard.economic_plan
-        else:
-            complete_plan["economic_plan"] = None
+            section_refs.append("economic_plan")
 
-        # Resource locations
-        complete_plan["resource_locations"] = blackboard.resource_locations or []
+        # Resource locations and video recommendations
+        if blackboard.resource_locations:
+            section_refs.append("resource_locations")
+        if blackboard.video_recommendations:
+            section_refs.append("video_recommendations")
 
-        # Video recommendations
-        complete_plan["video_recommendations"] = blackboard.video_recommendations or []
+        complete_plan["section_refs"] = section_refs
 
         # Status tracking
         complete_plan["agents_completed"] = blackboard.agents_completed
@@ -9,11 +9,172 @@ from datetime import datetime
 from typing import Any, Dict
 
 from .base_agent import BaseAgent
+from ..models.agent_output import AgentOutput
 from ..models.blackboard import Blackboard
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Static part of the survival strategy prompt. It is sent before the household
+# details and is identical for every request, so it is served from the prompt cache.
+SURVIVAL_PLAN_INSTRUCTIONS = """Your task is to create a detailed 30-day action plan to help a household survive financially.
+The household and its financial situation are described at the end of this message.
+
+PART 1: EXPENSE CATEGORIZATION
+Categorize typical household expenses into three buckets:
+
+1. MUST-PAY (Cannot defer without severe consequences):
+   - Rent/mortgage
+   - Utilities (electricity, water, heat)
+   - Groceries (minimum)
+   - Essential medications
+   - Car payment (if needed for job search)
+
+2. DEFER (Can negotiate 30-90 day forbearance):
+   - Credit card payments
+   - Student loans
+   - Medical bills
+   - Non-essential insurance
+
+3. ELIMINATE (Cancel immediately):
+   - Streaming services
+   - Gym memberships
+   - Dining out
+   - Non-essential subscriptions
+
+For each expense category, provide:
+- Typical monthly amount
+- Negotiation strategy (for DEFER items)
+- Cancellation steps (for ELIMINATE items)
+
+PART 2: DAILY ACTION PLAN (Days 1-30)
+Create a day-by-day checklist of specific actions:
+
+Day 1-3: Immediate crisis response
+- File unemployment claim
+- Contact landlord/mortgage servicer
+- Apply for SNAP benefits
+- Contact utility companies about hardship programs
+
+Day 4-7: Benefits and assistance
+- Complete unemployment certification
+- Visit local food bank
+- Apply for Medicaid (if eligible)
+- Research rental assistance programs
+
+Day 8-14: Income replacement
+- Update resume
+- Apply to 10+ jobs
+- Sign up for gig work (Uber, TaskRabbit, etc.)
+- Explore local temp agencies
+
+Day 15-30: Long-term sustainability
+- Follow up on applications
+- Attend required unemployment meetings
+- Network with contacts
+- Plan for next 30 days
+
+PART 3: BENEFITS ELIGIBILITY
+Identify programs this household likely qualifies for:
+
+1. Unemployment Insurance
+   - Estimated weekly benefit: $XXX
+   - Timeline: 2-3 weeks for first payment
+   - Duration: Up to 26 weeks (state-dependent)
+
+2. SNAP (Food Stamps)
+   - Estimated monthly benefit: $XXX (based on household size)
+   - Timeline: 7-30 days for approval
+   - Application: Online or in-person
+
+3. Medicaid
+   - Eligibility: If household income is below the state threshold
+   - Timeline: 30-45 days
+
+4. Emergency Rental Assistance
+   - Potential: 1-3 months rent coverage
+   - Availability: Limited, apply ASAP
+
+5. Utility Assistance (LIHEAP)
+   - Heating/cooling bill help
+   - Seasonal availability
+
+PART 4: HARDSHIP LETTER TEMPLATES
+Provide 2-3 letter templates for:
+
+1. Landlord (requesting 30-60 day rent deferral)
+2. Credit card company (requesting hardship forbearance)
+3. Utility company (requesting payment plan)
+
+Each template should:
+- Be respectful and concise
+- Explain situation briefly
+- Propose specific solution (e.g., "defer payment for 60 days, then resume with $50 extra/month")
+- Include household details like children
+
+PART 5: SURVIVAL OUTLOOK
+Provide three scenarios:
+
+1. Without action: "Savings depleted in X days"
+2. With action (cuts + benefits): "Can survive X days"
+3. Best case (all benefits + income): "Financial stability restored in X days"
+
+Return as JSON:
+{
+  "financial_summary": {
+    "available_savings": <available budget/savings>,
+    "estimated_monthly_expenses_before": 2500,
+    "estimated_monthly_expenses_after": 1200,
+    "monthly_deficit": -800,
+    "runway_days": <days until savings run out>
+  },
+  "expense_categories": {
+    "must_pay": [
+      {"name": "Rent", "amount": 1200, "strategy": "Contact landlord immediately"},
+      ...
+    ],
+    "defer": [
+      {"name": "Credit cards", "amount": 200, "strategy": "Call for hardship forbearance"},
+      ...
+    ],
+    "eliminate": [
+      {"name": "Netflix", "amount": 15, "action": "Cancel online today"},
+      ...
+    ]
+  },
+  "revised_monthly_expenses": 1200,
+  "daily_actions": [
+    {"day": 1, "action": "File unemployment claim online", "priority": "critical", "time_required": "1 hour"},
+    {"day": 1, "action": "Email landlord about situation", "priority": "critical", "time_required": "30 min"},
+    ...
+  ],
+  "eligible_benefits": [
+    {
+      "program": "Unemployment Insurance",
+      "estimated_amount": "$350/week",
+      "timeline": "2-3 weeks",
+      "application_steps": ["Go to state website", "Create account", "File claim", "Certify weekly"],
+      "eligibility_notes": "Must have lost job through no fault of your own"
+    },
+    ...
+  ],
+  "estimated_total_relief": "$1,400-$2,000/month (unemployment + SNAP)",
+  "hardship_letters": [
+    {
+      "recipient_type": "landlord",
+      "template_text": "Dear [Landlord Name],\\n\\nI am writing to inform you...",
+      "tips": ["Send via certified mail", "Propose specific payment plan", "Emphasize good rental history"]
+    },
+    ...
+  ],
+  "survival_outlook": {
+    "without_action": "Savings depleted in 15 days, eviction risk in 45 days",
+    "with_action": "Can survive 45-60 days with expense cuts + benefits",
+    "best_case": "Financial stability restored in 60-90 days if benefits approved and job found"
+  }
+}
+"""
+
 
 class FinancialAdvisorAgent(BaseAgent):
     """Agent that creates 30-day economic survival strategies.
@@ -27,7 +188,7 @@ class FinancialAdvisorAgent(BaseAgent):
         super().__init__(claude_client, timeout)
         self.agent_type = "financial_advisor"
 
-    async def process(self, blackboard: Blackboard) -> Blackboard:
+    async def process(self, blackboard: Blackboard) -> AgentOutput:
         """
         Create 30-day economic survival plan using blackboard pattern.
 
@@ -37,14 +198,14 @@ class FinancialAdvisorAgent(BaseAgent):
         - crisis_profile (crisis_mode, specific_threat, household, budget_tier, runtime_questions)
         - risk_assessment (for financial runway context)
 
-        Writes to blackboard:
+        Writes (via AgentOutput):
         - economic_plan (expense categorization, daily actions, benefits, letters)
 
         Args:
-            blackboard: Shared blackboard state
+            blackboard: Read-only snapshot of the shared blackboard
 
         Returns:
-            Updated blackboard with economic_plan populated
+            AgentOutput with economic_plan populated
         """
         self.start_time = datetime.utcnow()
         crisis_profile = blackboard.crisis_profile
@@ -61,7 +222,7 @@ class FinancialAdvisorAgent(BaseAgent):
                 f"💼 Financial Advisor Agent skipped: only runs for economic_crisis, got {crisis_mode}"
             )
             # Don't mark as failed, just skip
-            return blackboard
+            return AgentOutput(agent_name=self.agent_class_name, status="skipped")
 
         # Get mode-specific UI presentation
         agent_label = self.get_agent_label(crisis_mode)
@@ -116,37 +277,39 @@ Base recommendations on:
 
 IMPORTANT: Return valid JSON only. Ensure all strings are properly escaped with no unescaped quotes or newlines inside string values. Use \\n for newlines within strings."""
 
-            # Call Claude API
-            response, tokens, cost = await self.claude_client.generate_async(
+            # Call Claude API (within the task deadline)
+            result = await self.generate_within_deadline(
                 prompt=prompt,
                 system=system_prompt,
-                max_tokens=4000
+                max_tokens=4000,
+                progress_task_id=task_id,
+                prompt_prefix=SURVIVAL_PLAN_INSTRUCTIONS
             )
 
-            self.tokens_used = tokens
-            self.cost = cost
+            if result is None:
+                # Not enough time budget left: use template-based economic plan
+                economic_plan = self._generate_fallback_economic_plan(
+                    threat, household_size, budget, financial_runway, task_id
+                )
+            else:
+                response, tokens, cost = result
+                self.tokens_used = tokens
+                self.cost = cost
 
-            logger.info(f"{agent_emoji} Processing economic plan (tokens={tokens}, cost=${cost:.4f})")
+                logger.info(f"{agent_emoji} Processing economic plan (tokens={tokens}, cost=${cost:.4f})")
 
-            # Parse Claude's response
-            economic_plan = self._parse_economic_response(
-                response, threat, household_size, budget, financial_runway, task_id
-            )
-            economic_plan['tokens_used'] = tokens
-            economic_plan['cost_estimate'] = cost
-
-            # Write to blackboard
-            blackboard.economic_plan = economic_plan
-            blackboard.mark_agent_complete(
-                self.agent_class_name,
-                self.tokens_used,
-                self.cost
-            )
+                # Parse Claude's response
+                economic_plan = self._parse_economic_response(
+                    response, threat, household_size, budget, financial_runway, task_id
+                )
+
+            economic_plan['tokens_used'] = self.tokens_used
+            economic_plan['cost_estimate'] = self.cost
 
             self.end_time = datetime.utcnow()
 
             # Log completion for UI
-            self.log_activity(
+            await self.log_activity(
                 task_id,
                 "completed",
                 "Economic survival strategy complete",
@@ -162,7 +325,7 @@ IMPORTANT: Return valid JSON only. Ensure all strings are properly escaped with
             # Log comprehensive debug output
             self.log_agent_output(task_id, economic_plan, agent_emoji)
 
-            return blackboard
+            return self.build_output(economic_plan=economic_plan)
 
         except Exception as e:
             self.end_time = datetime.utcnow()
@@ -178,7 +341,7 @@ IMPORTANT: Return valid JSON only. Ensure all strings are properly escaped with
         risk_level: str,
         runtime_questions: Dict
     ) -> str:
-        """Build prompt for 30-day economic survival planning."""
+        """Build the household-specific part of the survival planning prompt (follows SURVIVAL_PLAN_INSTRUCTIONS)."""
         adults = household.get('adults', 0)
         children = household.get('children', 0)
         special_needs = household.get('special_needs', '')
@@ -187,7 +350,7 @@ IMPORTANT: Return valid JSON only. Ensure all strings are properly escaped with
         primary_concern = runtime_questions.get('primary_concern', 'Unknown')
         current_expenses = runtime_questions.get('current_expenses', 'Unknown')
 
-        prompt = f"""Create a 30-day economic survival strategy for a household facing {threat}:
+        prompt = f"""Create the 30-day economic survival strategy for this household facing {threat}:
 
 Household:
 - Adults: {adults}
@@ -201,162 +364,7 @@ Financial Situation:
 - Primary concern: {primary_concern}
 - Current monthly expenses: {current_expenses}
 
-Your task is to create a detailed 30-day action plan to help this household survive financially.
-
-PART 1: EXPENSE CATEGORIZATION
-Categorize typical household expenses into three buckets:
-
-1. MUST-PAY (Cannot defer without severe consequences):
-   - Rent/mortgage
-   - Utilities (electricity, water, heat)
-   - Groceries (minimum)
-   - Essential medications
-   - Car payment (if needed for job search)
-
-2. DEFER (Can negotiate 30-90 day forbearance):
-   - Credit card payments
-   - Student loans
-   - Medical bills
-   - Non-essential insurance
-
-3. ELIMINATE (Cancel immediately):
-   - Streaming services
-   - Gym memberships
-   - Dining out
-   - Non-essential subscriptions
-
-For each expense category, provide:
-- Typical monthly amount
-- Negotiation strategy (for DEFER items)
-- Cancellation steps (for ELIMINATE items)
-
-PART 2: DAILY ACTION PLAN (Days 1-30)
-Create a day-by-day checklist of specific actions:
-
-Day 1-3: Immediate crisis response
-- File unemployment claim
-- Contact landlord/mortgage servicer
-- Apply for SNAP benefits
-- Contact utility companies about hardship programs
-
-Day 4-7: Benefits and assistance
-- Complete unemployment certification
-- Visit local food bank
-- Apply for Medicaid (if eligible)
-- Research rental assistance programs
-
-Day 8-14: Income replacement
-- Update resume
-- Apply to 10+ jobs
-- Sign up for gig work (Uber, TaskRabbit, etc.)
-- Explore local temp agencies
-
-Day 15-30: Long-term sustainability
-- Follow up on applications
-- Attend required unemployment meetings
-- Network with contacts
-- Plan for next 30 days
-
-PART 3: BENEFITS ELIGIBILITY
-Identify programs this household likely qualifies for:
-
-1. Unemployment Insurance
-   - Estimated weekly benefit: $XXX
-   - Timeline: 2-3 weeks for first payment
-   - Duration: Up to 26 weeks (state-dependent)
-
-2. SNAP (Food Stamps)
-   - Estimated monthly benefit: $XXX (based on household size)
-   - Timeline: 7-30 days for approval
-   - Application: Online or in-person
-
-3. Medicaid
-   - Eligibility: If income below ${budget}/month threshold
-   - Timeline: 30-45 days
-
-4. Emergency Rental Assistance
-   - Potential: 1-3 months rent coverage
-   - Availability: Limited, apply ASAP
-
-5. Utility Assistance (LIHEAP)
-   - Heating/cooling bill help
-   - Seasonal availability
-
-PART 4: HARDSHIP LETTER TEMPLATES
-Provide 2-3 letter templates for:
-
-1. Landlord (requesting 30-60 day rent deferral)
-2. Credit card company (requesting hardship forbearance)
-3. Utility company (requesting payment plan)
-
-Each template should:
-- Be respectful and concise
-- Explain situation briefly
-- Propose specific solution (e.g., "defer payment for 60 days, then resume with $50 extra/month")
-- Include household details like children
-
-PART 5: SURVIVAL OUTLOOK
-Provide three scenarios:
-
-1. Without action: "Savings depleted in X days"
-2. With action (cuts + benefits): "Can survive X days"
-3. Best case (all benefits + income): "Financial stability restored in X days"
-
-Return as JSON:
-{{
-  "financial_summary": {{
-    "available_savings": {budget},
-    "estimated_monthly_expenses_before": 2500,
-    "estimated_monthly_expenses_after": 1200,
-    "monthly_deficit": -800,
-    "runway_days": {financial_runway}
-  }},
-  "expense_categories": {{
-    "must_pay": [
-      {{"name": "Rent", "amount": 1200, "strategy": "Contact landlord immediately"}},
-      ...
-    ],
-    "defer": [
-      {{"name": "Credit cards", "amount": 200, "strategy": "Call for hardship forbearance"}},
-      ...
-    ],
-    "eliminate": [
-      {{"name": "Netflix", "amount": 15, "action": "Cancel online today"}},
-      ...
-    ]
-  }},
-  "revised_monthly_expenses": 1200,
-  "daily_actions": [
-    {{"day": 1, "action": "File unemployment claim online", "priority": "critical", "time_required": "1 hour"}},
-    {{"day": 1, "action": "Email landlord about situation", "priority": "critical", "time_required": "30 min"}},
-    ...
-  ],
-  "eligible_benefits": [
-    {{
-      "program": "Unemployment Insurance",
-      "estimated_amount": "$350/week",
-      "timeline": "2-3 weeks",
-      "application_steps": ["Go to state website", "Create account", "File claim", "Certify weekly"],
-      "eligibility_notes": "Must have lost job through no fault of your own"
-    }},
-    ...
-  ],
-  "estimated_total_relief": "$1,400-$2,000/month (unemployment + SNAP)",
-  "hardship_letters": [
-    {{
-      "recipient_type": "landlord",
-      "template_text": "Dear [Landlord Name],\\n\\nI am writing to inform you...",
-      "tips": ["Send via certified mail", "Propose specific payment plan", "Emphasize good rental history"]
-    }},
-    ...
-  ],
-  "survival_outlook": {{
-    "without_action": "Savings depleted in 15 days, eviction risk in 45 days",
-    "with_action": "Can survive 45-60 days with expense cuts + benefits",
-    "best_case": "Financial stability restored in 60-90 days if benefits approved and job found"
-  }}
-}}
-
+Use the budget/savings and financial runway above in financial_summary.
 Be specific to {threat}. Scale for household of {adults + children} people. Be realistic about timelines and benefit amounts."""
 
         return prompt
@@ -14,6 +14,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from .base_agent import BaseAgent
+from ..models.agent_output import AgentOutput
 from ..models.blackboard import Blackboard
 from ..utils.logger import setup_logger
 
@@ -447,7 +448,7 @@ class ResourceLocatorAgent(BaseAgent):
             },
         ]
 
-    async def process(self, blackboard: Blackboard) -> Blackboard:
+    async def process(self, blackboard: Blackboard) -> AgentOutput:
         """
         Find local assistance resources using blackboard pattern.
 
@@ -455,14 +456,14 @@ class ResourceLocatorAgent(BaseAgent):
         - crisis_profile (crisis_mode, specific_threat, location)
         - risk_assessment (optional, for prioritizing resource types)
 
-        Writes to blackboard:
+        Writes (via AgentOutput):
         - resource_locations (list of nearby resources sorted by distance)
 
         Args:
-            blackboard: Shared blackboard state
+            blackboard: Read-only snapshot of the shared blackboard
 
         Returns:
-            Updated blackboard with resource_locations populated
+            AgentOutput with resource_locations populated
         """
         self.start_time = datetime.utcnow()
         crisis_profile = blackboard.crisis_profile
@@ -526,23 +527,14 @@ class ResourceLocatorAgent(BaseAgent):
             # Format resource locations
             resource_locations = self._format_resource_locations(resources, task_id)
 
-            # Write to blackboard
-            blackboard.resource_locations = resource_locations
-
             # No tokens used for static lookup (no Claude API call)
             self.tokens_used = 0
             self.cost = 0.0
 
-            blackboard.mark_agent_complete(
-                self.agent_class_name,
-                self.tokens_used,
-                self.cost
-            )
-
             self.end_time = datetime.utcnow()
 
             # Log completion for UI
-            self.log_activity(
+            await self.log_activity(
                 task_id,
                 "completed",
                 "Resource search complete",
@@ -557,7 +549,7 @@ class ResourceLocatorAgent(BaseAgent):
             # Log comprehensive debug output
             self.log_agent_output(task_id, resource_locations, agent_emoji)
 
-            return blackboard
+            return self.build_output(resource_locations=resource_locations)
 
         except Exception as e:
             self.end_time = datetime.utcnow()
@@ -595,9 +587,9 @@ class ResourceLocatorAgent(BaseAgent):
             state == 'NY' and city.lower() in ['new york', 'nyc']
         )
 
-        # Filter by resource type
+        # Filter by resource type (copy entries: the static dataset is shared across runs)
         filtered = [
-            r for r in self.static_resources
+            dict(r) for r in self.static_resources
             if r.get('resource_type') in resource_types
         ]
 
@@ -661,7 +653,7 @@ class ResourceLocatorAgent(BaseAgent):
             logger.warning(f"No resources found for {city}, {state}. Falling back to NYC resources.")
             # Get NYC resources as fallback
             nyc_resources = [
-                r for r in self.static_resources
+                dict(r) for r in self.static_resources
                 if r.get('state') == 'NY' and r.get('resource_type') in resource_types
             ]
             # Remove distance info since it's not accurate for fallback
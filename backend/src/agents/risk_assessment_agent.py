@@ -1,14 +1,19 @@
 """Risk Assessment Agent for disaster threat analysis (natural + economic)."""
 
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
 from .base_agent import BaseAgent
+from ..models.agent_output import AgentOutput
 from ..models.blackboard import Blackboard
+from ..services.area_risk_cache import area_risk_cache
+from ..utils.json_stream import JsonFieldScanner
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+RISK_LEVELS = ("EXTREME", "HIGH", "MEDIUM", "LOW")
+
 
 class RiskAssessmentAgent(BaseAgent):
     """
@@ -24,18 +29,18 @@ class RiskAssessmentAgent(BaseAgent):
         super().__init__(claude_client, timeout)
         self.agent_type = "risk_assessment"
 
-    async def process(self, blackboard: Blackboard) -> Blackboard:
+    async def process(self, blackboard: Blackboard) -> AgentOutput:
         """
         Analyze disaster risk using blackboard pattern.
 
         Reads: crisis_profile from blackboard
-        Writes: risk_assessment to blackboard
+        Writes: risk_assessment (via AgentOutput)
 
         Args:
-            blackboard: Shared blackboard state
+            blackboard: Read-only snapshot of the shared blackboard
 
         Returns:
-            Updated blackboard with risk_assessment
+            AgentOutput with risk_assessment
         """
         self.start_time = datetime.utcnow()
 
@@ -56,7 +61,7 @@ class RiskAssessmentAgent(BaseAgent):
 
             logger.info(f"{agent_emoji} {agent_label} starting for task_id={task_id}")
 
-            self.log_activity(
+            await self.log_activity(
                 task_id,
                 "active",
                 f"Analyzing {threat} risk for {location.get('city') if location else 'location'}",
@@ -71,18 +76,10 @@ class RiskAssessmentAgent(BaseAgent):
             else:
                 raise ValueError(f"Unknown crisis_mode: {crisis_mode}")
 
-            # Write to blackboard
-            blackboard.risk_assessment = risk_assessment
-            blackboard.mark_agent_complete(
-                self.agent_class_name,
-                tokens_used=self.tokens_used,
-                cost=self.cost
-            )
-
             self.end_time = datetime.utcnow()
 
             # Log completion for UI
-            self.log_activity(
+            await self.log_activity(
                 task_id,
                 "completed",
                 f"Risk assessment complete: {risk_assessment.get('overall_risk_level')} risk",
@@ -98,12 +95,11 @@ class RiskAssessmentAgent(BaseAgent):
             # Log comprehensive debug output
             self.log_agent_output(task_id, risk_assessment, agent_emoji)
 
-            return blackboard
+            return self.build_output(risk_assessment=risk_assessment)
 
         except Exception as e:
             self.end_time = datetime.utcnow()
             logger.error(f"Risk Assessment Agent error: {e}")
-            blackboard.mark_agent_failed(self.agent_class_name, str(e))
             raise
 
     async def _process_natural_disaster(
@@ -115,6 +111,41 @@ class RiskAssessmentAgent(BaseAgent):
         location = crisis_profile['location']
         threat = crisis_profile['specific_threat']
 
+        # Reuse a fresh assessment made for another user in the same area
+        area_assessment = await area_risk_cache.get_async(threat, location)
+        if area_assessment is not None:
+            logger.info(
+                f"Reusing area risk assessment {area_assessment['area_assessment']['area_key']} "
+                f"for task_id={task_id}"
+            )
+            await self.log_activity(task_id, "active", "Reusing recent risk assessment for this area", 75)
+            risk_assessment = self._personalize_area_assessment(area_assessment, location)
+        else:
+            risk_assessment, reusable = await self._assess_natural_disaster(location, threat, task_id)
+            if reusable and area_risk_cache.enabled:
+                await area_risk_cache.put_async(threat, location, risk_assessment, task_id)
+
+        risk_assessment['crisis_mode'] = 'natural_disaster'
+
+        return risk_assessment
+
+    async def _assess_natural_disaster(
+        self,
+        location: Dict[str, Any],
+        threat: str,
+        task_id: Optional[str]
+    ) -> tuple[Dict[str, Any], bool]:
+        """
+        Assess natural disaster risk with Claude.
+
+        Args:
+            location: Location to assess
+            threat: Specific threat (e.g. "hurricane")
+            task_id: Task to report progress for (None for warm-up runs)
+
+        Returns:
+            Tuple of (risk_assessment, reusable); fallback assessments are not reusable
+        """
         # Build prompt for Claude
         prompt = self._build_natural_disaster_prompt(location, threat)
         system_prompt = """You are a disaster risk assessment expert working for FEMA.
@@ -123,23 +154,72 @@ Your assessments are used to help families prepare for emergencies.
 Always cite authoritative sources (NOAA, USGS, FEMA historical data).
 Be realistic but not alarmist. Focus on actionable risk levels."""
 
-        # Call Claude API
-        response, tokens, cost = await self.claude_client.generate_async(
+        # Call Claude API (within the task deadline)
+        result = await self.generate_within_deadline(
             prompt=prompt,
             system=system_prompt,
-            max_tokens=2000
+            max_tokens=2000,
+            progress_task_id=task_id,
+            size_key=f"{self.agent_class_name}:natural_disaster",
+            on_text=self._early_risk_publisher(crisis_mode="natural_disaster")
         )
 
+        if result is None:
+            # Not enough time budget left: use deterministic assessment
+            return self._generate_fallback_risk_assessment(location, threat), False
+
+        response, tokens, cost = result
         self.tokens_used = tokens
         self.cost = cost
 
-        self.log_activity(task_id, "active", "Processing risk analysis data", 75)
+        if task_id is not None:
+            await self.log_activity(task_id, "active", "Processing risk analysis data", 75)
 
         # Parse response
         risk_assessment = self._parse_risk_response(response, location, threat)
+        if risk_assessment is None:
+            # Fallback: Create basic assessment
+            return self._generate_fallback_risk_assessment(
+                location, threat, historical_context=response[:200]  # Use first part of response
+            ), False
+
+        return risk_assessment, True
+
+    async def warm_area_assessment(self, location: Dict[str, Any], threat: str) -> Optional[str]:
+        """
+        Precompute and store the area risk assessment for a location and threat.
+
+        Used by the warm-up CLI before a season; makes one Claude call.
+
+        Args:
+            location: Representative location for the area
+            threat: Specific threat (e.g. "hurricane")
+
+        Returns:
+            Area key the assessment was stored under, or None on failure
+        """
+        self.reset_run_state()
+        self.request_priority = "low"  # never take budget from live plans
+        # Warm-up belongs to no task: no progress updates or agent_logs rows
+        risk_assessment, reusable = await self._assess_natural_disaster(location, threat, None)
+        if not reusable:
+            return None
+
         risk_assessment['crisis_mode'] = 'natural_disaster'
+        return await area_risk_cache.put_async(threat, location, risk_assessment)
 
-        return risk_assessment
+    def _personalize_area_assessment(
+        self,
+        area_assessment: Dict[str, Any],
+        location: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Layer the requesting user's fields on top of a shared area assessment."""
+        return {
+            **area_assessment,
+            "task_id": location.get('task_id', ''),
+            "generated_at": datetime.utcnow().isoformat() + "Z",
+            "location": f"{location.get('city')}, {location.get('state')}"
+        }
 
     async def _process_economic_crisis(
         self,
@@ -163,24 +243,71 @@ You assess financial risk levels based on their situation (income loss, expenses
 Provide realistic, actionable guidance focused on immediate survival (30-90 days).
 Be empathetic but honest about risks. Cite resources like unemployment benefits, food assistance."""
 
-        # Call Claude API
-        response, tokens, cost = await self.claude_client.generate_async(
+        # Call Claude API (within the task deadline)
+        result = await self.generate_within_deadline(
             prompt=prompt,
             system=system_prompt,
-            max_tokens=1500
+            max_tokens=1500,
+            progress_task_id=task_id,
+            size_key=f"{self.agent_class_name}:economic_crisis",
+            on_text=self._early_risk_publisher(crisis_mode="economic_crisis", financial_runway=runway)
         )
 
-        self.tokens_used = tokens
-        self.cost = cost
+        if result is None:
+            # Not enough time budget left: use runway-based assessment
+            risk_assessment = self._generate_fallback_economic_risk(threat, primary_concern, runway)
+        else:
+            response, tokens, cost = result
+            self.tokens_used = tokens
+            self.cost = cost
 
-        self.log_activity(task_id, "active", "Analyzing financial risk", 75)
+            await self.log_activity(task_id, "active", "Analyzing financial risk", 75)
+
+            # Parse response
+            risk_assessment = self._parse_economic_risk_response(response, threat, primary_concern, runway)
 
-        # Parse response
-        risk_assessment = self._parse_economic_risk_response(response, threat, primary_concern, runway)
         risk_assessment['crisis_mode'] = 'economic_crisis'
 
         return risk_assessment
 
+    def _early_risk_publisher(self, **known_fields: Any) -> Callable[[str], None]:
+        """
+        Build a streaming callback that publishes the risk level as soon as it arrives.
+
+        Supply planning and financial advice only read the overall risk level and
+        the financial runway, so they can start while the rest of the assessment
+        is still streaming. Both prompts ask for the risk level near the top.
+
+        The scanner is dropped once the level is published (or the JSON object
+        ended without one), so the rest of the stream is not scanned again.
+
+        Args:
+            **known_fields: Risk assessment fields known without Claude (e.g. financial_runway)
+
+        Returns:
+            Callback for generate_within_deadline(on_text=...)
+        """
+        scanner: Optional[JsonFieldScanner] = JsonFieldScanner()
+
+        def on_text(text: str) -> None:
+            nonlocal scanner
+            if scanner is None:
+                return
+
+            risk_level = scanner.feed(text).get("risk_level")
+            if risk_level not in RISK_LEVELS:
+                if scanner.done:
+                    scanner = None
+                return
+
+            early_assessment = {**known_fields, "overall_risk_level": risk_level}
+            if "severity_score" in scanner.fields:
+                early_assessment["overall_severity_score"] = scanner.fields["severity_score"]
+            self.publish_early_output(risk_assessment=early_assessment)
+            scanner = None
+
+        return on_text
+
     def _build_natural_disaster_prompt(self, location: Dict[str, Any], threat: str) -> str:
         """Build prompt for natural disaster risk assessment."""
         city = location.get('city', 'Unknown')
@@ -231,8 +358,13 @@ Be specific to {threat} risks. Use real data when possible."""
 
         return prompt
 
-    def _parse_risk_response(self, response: str, location: Dict[str, Any], threat: str) -> Dict[str, Any]:
-        """Parse Claude's response into structured risk assessment."""
+    def _parse_risk_response(
+        self,
+        response: str,
+        location: Dict[str, Any],
+        threat: str
+    ) -> Optional[Dict[str, Any]]:
+        """Parse Claude's response into structured risk assessment (None if unparseable)."""
         import json
 
         try:
@@ -273,29 +405,35 @@ Be specific to {threat} risks. Use real data when possible."""
 
         except (json.JSONDecodeError, KeyError, IndexError) as e:
             logger.warning(f"Could not parse structured response: {e}. Using fallback.")
+            return None
 
-            # Fallback: Create basic assessment
-            return {
-                "task_id": location.get('task_id', ''),
-                "generated_at": datetime.utcnow().isoformat() + "Z",
-                "location": f"{location.get('city')}, {location.get('state')}",
-                "primary_threat": {
-                    "threat_type": threat,
-                    "severity_score": 50,
-                    "risk_level": "MEDIUM",
-                    "distance_to_threat": None,
-                    "historical_context": response[:200],  # Use first part of response
-                    "specific_warnings": ["Unable to parse detailed warnings. Please check with local authorities."]
-                },
-                "secondary_threats": [],
-                "overall_severity_score": 50,
-                "overall_risk_level": "MEDIUM",
-                "time_sensitive": False,
-                "evacuation_recommended": False,
-                "recommendations": ["Consult local emergency management", "Monitor weather/alerts", "Prepare emergency supplies"],
-                "source": "AI Risk Assessment Agent"
-            }
-
+    def _generate_fallback_risk_assessment(
+        self,
+        location: Dict[str, Any],
+        threat: str,
+        historical_context: str = "Historical data unavailable"
+    ) -> Dict[str, Any]:
+        """Generate basic natural disaster assessment without Claude."""
+        return {
+            "task_id": location.get('task_id', ''),
+            "generated_at": datetime.utcnow().isoformat() + "Z",
+            "location": f"{location.get('city')}, {location.get('state')}",
+            "primary_threat": {
+                "threat_type": threat,
+                "severity_score": 50,
+                "risk_level": "MEDIUM",
+                "distance_to_threat": None,
+                "historical_context": historical_context,
+                "specific_warnings": ["Unable to parse detailed warnings. Please check with local authorities."]
+            },
+            "secondary_threats": [],
+            "overall_severity_score": 50,
+            "overall_risk_level": "MEDIUM",
+            "time_sensitive": False,
+            "evacuation_recommended": False,
+            "recommendations": ["Consult local emergency management", "Monitor weather/alerts", "Prepare emergency supplies"],
+            "source": "AI Risk Assessment Agent"
+        }
 
     def _build_economic_crisis_prompt(self, threat: str, primary_concern: str, runway: str) -> str:
         """Build prompt for economic crisis financial risk assessment."""
@@ -377,35 +515,44 @@ Be realistic but supportive. Focus on 30-90 day survival strategies."""
         except (json.JSONDecodeError, KeyError, IndexError) as e:
             logger.warning(f"Could not parse economic risk response: {e}. Using fallback.")
 
-            # Fallback based on runway
-            if "less than 2 weeks" in runway.lower() or "<2" in runway:
-                severity = 95
-                risk_level = "EXTREME"
-            elif "2-4 weeks" in runway.lower():
-                severity = 85
-                risk_level = "EXTREME"
-            elif "1-3 months" in runway.lower():
-                severity = 65
-                risk_level = "HIGH"
-            else:
-                severity = 45
-                risk_level = "MEDIUM"
+            return self._generate_fallback_economic_risk(threat, primary_concern, runway)
 
-            return {
-                "generated_at": datetime.utcnow().isoformat() + "Z",
-                "crisis_type": threat,
-                "primary_concern": primary_concern,
-                "financial_runway": runway,
-                "overall_severity_score": severity,
-                "overall_risk_level": risk_level,
-                "immediate_concerns": [primary_concern, "Income loss", "Expense management"],
-                "survival_timeline": runway,
-                "recommendations": [
-                    "Apply for unemployment benefits immediately",
-                    "Contact creditors about hardship programs",
-                    "Find local food assistance resources",
-                    "Cut non-essential expenses now"
-                ],
-                "time_sensitive": severity >= 75,
-                "source": "Financial Risk Assessment Agent"
-            }
+    def _generate_fallback_economic_risk(
+        self,
+        threat: str,
+        primary_concern: str,
+        runway: str
+    ) -> Dict[str, Any]:
+        """Generate economic risk assessment from financial runway without Claude."""
+        # Fallback based on runway
+        if "less than 2 weeks" in runway.lower() or "<2" in runway:
+            severity = 95
+            risk_level = "EXTREME"
+        elif "2-4 weeks" in runway.lower():
+            severity = 85
+            risk_level = "EXTREME"
+        elif "1-3 months" in runway.lower():
+            severity = 65
+            risk_level = "HIGH"
+        else:
+            severity = 45
+            risk_level = "MEDIUM"
+
+        return {
+            "generated_at": datetime.utcnow().isoformat() + "Z",
+            "crisis_type": threat,
+            "primary_concern": primary_concern,
+            "financial_runway": runway,
+            "overall_severity_score": severity,
+            "overall_risk_level": risk_level,
+            "immediate_concerns": [primary_concern, "Income loss", "Expense management"],
+            "survival_timeline": runway,
+            "recommendations": [
+                "Apply for unemployment benefits immediately",
+                "Contact creditors about hardship programs",
+                "Find local food assistance resources",
+                "Cut non-essential expenses now"
+            ],
+            "time_sensitive": severity >= 75,
+            "source": "Financial Risk Assessment Agent"
+        }
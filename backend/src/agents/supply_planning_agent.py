@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Any, Dict
 
 from .base_agent import BaseAgent
+from ..models.agent_output import AgentOutput
 from ..models.blackboard import Blackboard
 from ..utils.logger import setup_logger
 
@@ -61,7 +62,7 @@ class SupplyPlanningAgent(BaseAgent):
             }
         }
 
-    async def process(self, blackboard: Blackboard) -> Blackboard:
+    async def process(self, blackboard: Blackboard) -> AgentOutput:
         """
         Create personalized supply plan using blackboard pattern.
 
@@ -69,14 +70,14 @@ class SupplyPlanningAgent(BaseAgent):
         - crisis_profile (crisis_mode, specific_threat, household, budget_tier)
         - risk_assessment (for context on severity)
 
-        Writes to blackboard:
+        Writes (via AgentOutput):
         - supply_plan (tier-based supply recommendations)
 
         Args:
-            blackboard: Shared blackboard state
+            blackboard: Read-only snapshot of the shared blackboard
 
         Returns:
-            Updated blackboard with supply_plan populated
+            AgentOutput with supply_plan populated
         """
         self.start_time = datetime.utcnow()
         crisis_profile = blackboard.crisis_profile
@@ -102,18 +103,10 @@ class SupplyPlanningAgent(BaseAgent):
             else:
                 raise ValueError(f"Unknown crisis_mode: {crisis_mode}")
 
-            # Write to blackboard
-            blackboard.supply_plan = supply_plan
-            blackboard.mark_agent_complete(
-                self.agent_class_name,
-                self.tokens_used,
-                self.cost
-            )
-
             self.end_time = datetime.utcnow()
 
             # Log completion for UI
-            self.log_activity(
+            await self.log_activity(
                 task_id,
                 "completed",
                 "Supply plan complete",
@@ -125,7 +118,7 @@ class SupplyPlanningAgent(BaseAgent):
             # Log comprehensive debug output
             self.log_agent_output(task_id, supply_plan, agent_emoji)
 
-            return blackboard
+            return self.build_output(supply_plan=supply_plan)
 
         except Exception as e:
             self.end_time = datetime.utcnow()
@@ -175,22 +168,30 @@ You must respect budget constraints and provide practical, actionable recommenda
 Always include free alternatives when possible.
 Base recommendations on FEMA and Red Cross guidance."""
 
-        # Call Claude API
-        response, tokens, cost = await self.claude_client.generate_async(
+        # Call Claude API (within the task deadline)
+        result = await self.generate_within_deadline(
             prompt=prompt,
             system=system_prompt,
-            max_tokens=3000
+            max_tokens=3000,
+            progress_task_id=task_id,
+            size_key=f"{self.agent_class_name}:natural_disaster"
         )
 
-        self.tokens_used = tokens
-        self.cost = cost
+        if result is None:
+            # Not enough time budget left: use template-based supply list
+            supply_plan = self._generate_fallback_supply_plan(threat, household_size, budget)
+        else:
+            response, tokens, cost = result
+            self.tokens_used = tokens
+            self.cost = cost
 
-        logger.info(f"📦 Processing supply recommendations (tokens={tokens}, cost=${cost:.4f})")
+            logger.info(f"📦 Processing supply recommendations (tokens={tokens}, cost=${cost:.4f})")
 
-        # Parse Claude's response
-        supply_plan = self._parse_supply_response(response, threat, household_size, budget)
-        supply_plan['tokens_used'] = tokens
-        supply_plan['cost_estimate'] = cost
+            # Parse Claude's response
+            supply_plan = self._parse_supply_response(response, threat, household_size, budget)
+
+        supply_plan['tokens_used'] = self.tokens_used
+        supply_plan['cost_estimate'] = self.cost
         supply_plan['task_id'] = task_id
 
         return supply_plan
@@ -243,22 +244,30 @@ You must respect strict budget constraints and focus on maximizing calories per
 Prioritize non-perishable staples with long shelf life.
 Base recommendations on USDA nutrition guidelines and emergency food storage best practices."""
 
-        # Call Claude API
-        response, tokens, cost = await self.claude_client.generate_async(
+        # Call Claude API (within the task deadline)
+        result = await self.generate_within_deadline(
             prompt=prompt,
             system=system_prompt,
-            max_tokens=3000
+            max_tokens=3000,
+            progress_task_id=task_id,
+            size_key=f"{self.agent_class_name}:economic_crisis"
         )
 
-        self.tokens_used = tokens
-        self.cost = cost
+        if result is None:
+            # Not enough time budget left: use template-based supply list
+            supply_plan = self._generate_fallback_supply_plan(threat, household_size, budget)
+        else:
+            response, tokens, cost = result
+            self.tokens_used = tokens
+            self.cost = cost
+
+            logger.info(f"📊 Processing food stockpiling recommendations (tokens={tokens}, cost=${cost:.4f})")
 
-        logger.info(f"📊 Processing food stockpiling recommendations (tokens={tokens}, cost=${cost:.4f})")
+            # Parse Claude's response
+            supply_plan = self._parse_supply_response(response, threat, household_size, budget)
 
-        # Parse Claude's response
-        supply_plan = self._parse_supply_response(response, threat, household_size, budget)
-        supply_plan['tokens_used'] = tokens
-        supply_plan['cost_estimate'] = cost
+        supply_plan['tokens_used'] = self.tokens_used
+        supply_plan['cost_estimate'] = self.cost
         supply_plan['task_id'] = task_id
         supply_plan['financial_runway'] = runway
         supply_plan['primary_concern'] = primary_concern
@@ -13,6 +13,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from .base_agent import BaseAgent
+from ..models.agent_output import AgentOutput
 from ..models.blackboard import Blackboard
 from ..utils.logger import setup_logger
 
@@ -165,7 +166,7 @@ class VideoCuratorAgent(BaseAgent):
             },
         ]
 
-    async def process(self, blackboard: Blackboard) -> Blackboard:
+    async def process(self, blackboard: Blackboard) -> AgentOutput:
         """
         Curate video recommendations using blackboard pattern.
 
@@ -173,14 +174,14 @@ class VideoCuratorAgent(BaseAgent):
         - crisis_profile (crisis_mode, specific_threat, household)
         - risk_assessment (optional, for prioritizing video topics)
 
-        Writes to blackboard:
+        Writes (via AgentOutput):
         - video_recommendations (list of 5-7 curated videos)
 
         Args:
-            blackboard: Shared blackboard state
+            blackboard: Read-only snapshot of the shared blackboard
 
         Returns:
-            Updated blackboard with video_recommendations populated
+            AgentOutput with video_recommendations populated
         """
         self.start_time = datetime.utcnow()
         crisis_profile = blackboard.crisis_profile
@@ -241,23 +242,14 @@ class VideoCuratorAgent(BaseAgent):
                 f"(total runtime: {total_runtime_formatted})"
             )
 
-            # Write to blackboard
-            blackboard.video_recommendations = video_recommendations
-
             # No tokens used for static lookup (no Claude API call)
             self.tokens_used = 0
             self.cost = 0.0
 
-            blackboard.mark_agent_complete(
-                self.agent_class_name,
-                self.tokens_used,
-                self.cost
-            )
-
             self.end_time = datetime.utcnow()
 
             # Log completion for UI
-            self.log_activity(
+            await self.log_activity(
                 task_id,
                 "completed",
                 "Video curation complete",
@@ -272,7 +264,7 @@ class VideoCuratorAgent(BaseAgent):
             # Log comprehensive debug output
             self.log_agent_output(task_id, video_recommendations, agent_emoji)
 
-            return blackboard
+            return self.build_output(video_recommendations=video_recommendations)
 
         except Exception as e:
             self.end_time = datetime.utcnow()
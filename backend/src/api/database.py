@@ -1,7 +1,9 @@
 """Database utilities for the API."""
 
 import sqlite3
+import threading
 from pathlib import Path
+from typing import Any, Optional
 
 from ..utils.config import settings
 from ..utils.logger import setup_logger
@@ -9,26 +11,185 @@ from ..utils.logger import setup_logger
 logger = setup_logger(__name__)
 
 
+def _db_path() -> str:
+    """Get the SQLite database file path from the database URL."""
+    return settings.database_url.replace('sqlite:///', '')
+
+
+def _configure(conn: sqlite3.Connection) -> None:
+    """
+    Apply connection pragmas (journal mode, durability, busy timeout, caches).
+
+    Args:
+        conn: Newly opened SQLite connection
+    """
+    if settings.database_journal_mode:
+        conn.execute(f"PRAGMA journal_mode={settings.database_journal_mode}")
+    if settings.database_synchronous:
+        conn.execute(f"PRAGMA synchronous={settings.database_synchronous}")
+    conn.execute(f"PRAGMA busy_timeout={int(settings.database_busy_timeout_ms)}")
+    conn.execute(f"PRAGMA cache_size={-int(settings.database_cache_size_kib)}")
+    if settings.database_mmap_size_mb > 0:
+        conn.execute(f"PRAGMA mmap_size={int(settings.database_mmap_size_mb) * 1024 * 1024}")
+
+
+class PooledConnection(sqlite3.Connection):
+    """SQLite connection whose close() returns it to the pool of the calling thread."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize connection (arguments as for sqlite3.connect)."""
+        super().__init__(*args, **kwargs)
+        self.db_path: str = str(args[0] if args else kwargs["database"])
+        self.owner_thread = threading.get_ident()
+        self.idle = False
+
+    def close(self) -> None:
+        """Roll back any open transaction and return the connection to its pool."""
+        connection_pool.release(self)
+
+    def close_for_good(self) -> None:
+        """Close the underlying SQLite connection."""
+        super().close()
+
+
+class ConnectionPool:
+    """
+    Per-thread pool of configured SQLite connections.
+
+    Every get_db() used to open a new connection (and re-read the schema) and
+    every close() threw it away. Connections are never shared between threads:
+    each thread keeps up to max_idle_per_thread idle connections per database
+    and opens another one while all of its connections are checked out (e.g.
+    nested get_db() calls).
+    """
+
+    def __init__(self, max_idle_per_thread: Optional[int] = None) -> None:
+        """
+        Initialize pool.
+
+        Args:
+            max_idle_per_thread: Idle connections kept per thread and database
+                (defaults to settings)
+        """
+        self.max_idle_per_thread = (
+            settings.database_pool_size if max_idle_per_thread is None else max_idle_per_thread
+        )
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {"opened": 0, "reused": 0, "discarded": 0}
+
+    def _idle(self, db_path: str) -> list[PooledConnection]:
+        """Get the calling thread's idle connections for a database."""
+        pools = getattr(self._local, "pools", None)
+        if pools is None:
+            pools = self._local.pools = {}
+        return pools.setdefault(db_path, [])
+
+    def _count(self, stat: str) -> None:
+        """Increment a pool statistic."""
+        with self._lock:
+            self._stats[stat] += 1
+
+    def acquire(self, db_path: str) -> PooledConnection:
+        """
+        Check out a connection for the calling thread.
+
+        Args:
+            db_path: SQLite database file path
+
+        Returns:
+            Configured connection with rows accessible by column name
+        """
+        idle = self._idle(db_path)
+        if idle:
+            conn = idle.pop()
+            conn.idle = False
+            self._count("reused")
+            return conn
+
+        conn = sqlite3.connect(
+            db_path,
+            timeout=settings.database_busy_timeout_ms / 1000,
+            factory=PooledConnection
+        )
+        conn.row_factory = sqlite3.Row  # Access columns by name
+        _configure(conn)
+        self._count("opened")
+        return conn
+
+    def release(self, conn: PooledConnection) -> None:
+        """
+        Return a connection to its thread's pool (or close it if the pool is full).
+
+        Uncommitted changes are rolled back, as closing a connection would, and
+        settings callers may have changed are reset.
+
+        Args:
+            conn: Connection obtained from acquire()
+        """
+        if conn.idle:
+            return
+
+        if conn.owner_thread != threading.get_ident():
+            conn.close_for_good()
+            return
+
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.isolation_level = ""
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error as e:
+            logger.warning(f"Discarding broken database connection: {e}")
+            conn.close_for_good()
+            self._count("discarded")
+            return
+
+        idle = self._idle(conn.db_path)
+        if len(idle) >= self.max_idle_per_thread:
+            conn.close_for_good()
+            self._count("discarded")
+            return
+
+        conn.idle = True
+        idle.append(conn)
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dict with counts of opened, reused and discarded connections
+        """
+        with self._lock:
+            return dict(self._stats)
+
+
+# Singleton instance
+connection_pool = ConnectionPool()
+
+
 def get_db() -> sqlite3.Connection:
     """
-    Get database connection.
+    Get database connection from the calling thread's pool.
+
+    close() returns the connection to the pool (rolling back anything not
+    committed) instead of closing it.
 
     Returns:
         SQLite connection
     """
-    db_path = settings.database_url.replace('sqlite:///', '')
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row  # Access columns by name
-    return conn
+    return connection_pool.acquire(_db_path())
 
 
 def init_db() -> None:
     """Initialize SQLite database with schema."""
-    db_path = Path(settings.database_url.replace('sqlite:///', ''))
+    db_path = Path(_db_path())
 
     logger.info(f"Initializing database at {db_path}")
 
     conn = sqlite3.connect(str(db_path))
+    _configure(conn)  # journal_mode=WAL persists in the database file
     cursor = conn.cursor()
 
     # Create crisis_profiles table
@@ -137,7 +298,76 @@ def init_db() -> None:
         ON blackboards(updated_at)
     """)
 
+    # Create plan_jobs table (persistent job queue for plan generation)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS plan_jobs (
+            task_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL DEFAULT 'queued',
+            payload_json TEXT NOT NULL,
+            enqueued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            worker_id TEXT,
+            lease_expires_at REAL,
+            attempts INTEGER DEFAULT 0,
+            error_message TEXT,
+
+            FOREIGN KEY (task_id) REFERENCES crisis_profiles(task_id)
+        )
+    """)
+
+    # Create index for claiming the oldest queued job
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_plan_jobs_status
+        ON plan_jobs(status, enqueued_at)
+    """)
+
+    # Create claude_response_cache table (disk tier of the Claude response cache)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS claude_response_cache (
+            cache_key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            response_text TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            last_accessed_at REAL NOT NULL,
+            hit_count INTEGER DEFAULT 0
+        )
+    """)
+
+    # Create index for size-bounded (least recently used) eviction
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_claude_response_cache_accessed
+        ON claude_response_cache(last_accessed_at)
+    """)
+
+    # Create area_risk_assessments table (risk assessments reused within an area)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS area_risk_assessments (
+            area_key TEXT PRIMARY KEY,
+            threat TEXT NOT NULL,
+            state TEXT NOT NULL,
+            assessment_json TEXT NOT NULL,
+            assessed_at REAL NOT NULL,
+            source_task_id TEXT,
+            hit_count INTEGER DEFAULT 0
+        )
+    """)
+
+    # Create rate_limit_buckets table (token buckets shared by all workers)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+            bucket_key TEXT PRIMARY KEY,
+            level REAL NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    """)
+
     conn.commit()
     conn.close()
 
-    logger.info("✓ Database initialized successfully (crisis_profiles, agent_logs, blackboards)")
+    logger.info(
+        "✓ Database initialized successfully (crisis_profiles, agent_logs, blackboards, "
+        "plan_jobs, claude_response_cache, area_risk_assessments, rate_limit_buckets)"
+    )
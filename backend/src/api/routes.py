@@ -1,6 +1,6 @@
 """API routes for PrepSmart."""
 
-import asyncio
+import hmac
 import json
 import uuid
 from datetime import datetime
@@ -10,22 +10,59 @@ from flask import Flask, jsonify, request, send_file
 
 from ..models.crisis_profile import CrisisProfile
 from ..services.cache_service import CacheService
-from ..services.claude_client import ClaudeClient
+from ..services.column_codec import column_codec
 from ..services.location_service import LocationService
+from ..services.area_risk_cache import area_risk_cache
+from ..services.async_runtime import async_runtime
 from ..services.blackboard_service import blackboard_service
+from ..services.health_monitor import health_monitor
+from ..services.job_queue import QueueFullError, job_queue
+from ..services.output_budget import output_budget
+from ..services.rate_limiter import rate_limiter
+from ..services.request_policy import request_metrics
+from ..services.response_cache import response_cache
+from ..agents.agent_registry import agent_registry
 from ..agents.coordinator_agent import CoordinatorAgent
+from ..utils.config import settings
 from ..utils.logger import setup_logger
-from .database import get_db
+from .database import connection_pool, get_db
 
 logger = setup_logger(__name__)
 
 # Initialize services
 cache_service = CacheService()
 location_service = LocationService()
-claude_client = ClaudeClient()
+claude_client = agent_registry.get_client()
 coordinator = CoordinatorAgent(claude_client)
 
 
+def run_plan_job(crisis_dict: dict, attempt: int = 1) -> None:
+    """
+    Generate a crisis plan for a queued job (runs on a job queue worker thread).
+
+    Args:
+        crisis_dict: Crisis profile payload stored with the job
+        attempt: Job attempt number (> 1 when resuming an orphaned job)
+    """
+    task_id = crisis_dict.get('task_id')
+    logger.info(f"🎯 Starting coordinator for task_id={task_id}")
+
+    # Run on the shared long-lived event loops instead of a per-job loop
+    try:
+        completed_blackboard = async_runtime.run(
+            coordinator.generate_plan(crisis_dict, resume=attempt > 1)
+        )
+    except Exception as e:
+        logger.error(f"❌ Coordinator error for task_id={task_id}: {e}", exc_info=True)
+        raise
+
+    logger.info(f"✅ Coordinator completed for task_id={task_id}")
+    logger.info(f"   Agents completed: {completed_blackboard.agents_completed}")
+    logger.info(f"   Agents failed: {completed_blackboard.agents_failed}")
+    logger.info(f"   Total tokens: {completed_blackboard.total_tokens_used}")
+    logger.info(f"   Total cost: ${completed_blackboard.total_cost_estimate:.4f}")
+
+
 def register_routes(app: Flask) -> None:
     """
     Register all API routes.
@@ -33,6 +70,11 @@ def register_routes(app: Flask) -> None:
     Args:
         app: Flask application
     """
+    # Start the bounded worker pool that executes queued plans
+    job_queue.start(run_plan_job)
+
+    # Refresh dependency health in the background so probes never call Claude
+    health_monitor.start(claude_client)
 
     @app.route('/debug-viewer', methods=['GET'])
     def debug_viewer():
@@ -49,20 +91,12 @@ def register_routes(app: Flask) -> None:
 
     @app.route('/api/health', methods=['GET'])
     def health_check():
-        """Health check endpoint."""
-        # Test Claude API connection
-        claude_status = "up" if claude_client.test_connection() else "down"
+        """Health check endpoint (dependency status from the cached probe snapshot)."""
+        dependencies = health_monitor.get_snapshot()["dependencies"]
 
-        # Test database connection
-        try:
-            conn = get_db()
-            conn.execute("SELECT 1")
-            conn.close()
-            db_status = "up"
-        except Exception:
-            db_status = "down"
-
-        status = "healthy" if claude_status == "up" and db_status == "up" else "degraded"
+        claude_status = dependencies["claude_api"]["status"]
+        db_status = dependencies["database"]["status"]
+        status = "healthy" if claude_status in ("up", "unknown") and db_status == "up" else "degraded"
 
         return jsonify({
             "status": status,
@@ -73,6 +107,54 @@ def register_routes(app: Flask) -> None:
             }
         })
 
+    @app.route('/api/internal/stats', methods=['GET'])
+    def internal_stats():
+        """
+        Operational statistics (pools, caches, rate limits, LLM backend).
+
+        Only served with an X-Internal-Token header matching INTERNAL_STATS_TOKEN;
+        otherwise (or when no token is configured) the endpoint does not exist.
+        """
+        token = request.headers.get("X-Internal-Token", "")
+        if not settings.internal_stats_token or not hmac.compare_digest(token, settings.internal_stats_token):
+            return jsonify({"error": "NotFound", "message": "Not found"}), 404
+
+        return jsonify({
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "probe": health_monitor.get_snapshot(),
+            "claude_requests": request_metrics.get_stats()["models"],
+            "response_cache": response_cache.get_stats(),
+            "area_risk_cache": area_risk_cache.get_stats(),
+            "rate_limiter": rate_limiter.get_stats(),
+            "output_budgets": output_budget.get_stats(),
+            "database_pool": connection_pool.get_stats(),
+            "blackboard_compression": column_codec.get_stats(),
+            "llm_backend": claude_client.backend.get_stats()
+        })
+
+    @app.route('/api/health/live', methods=['GET'])
+    def liveness_check():
+        """Liveness probe: the process is up and serving requests (no dependency calls)."""
+        return jsonify({
+            "status": "alive",
+            "uptime_seconds": round(health_monitor.uptime_seconds(), 1)
+        })
+
+    @app.route('/api/health/ready', methods=['GET'])
+    def readiness_check():
+        """Readiness probe: answered from the background prober's cached snapshot."""
+        snapshot = health_monitor.get_snapshot()
+
+        # A snapshot that stopped refreshing means the prober is stuck
+        stale = snapshot["age_seconds"] > 3 * health_monitor.probe_interval
+        ready = snapshot["ready"] and not stale
+
+        return jsonify({
+            **snapshot,
+            "ready": ready,
+            "stale": stale
+        }), 200 if ready else 503
+
     @app.route('/api/crisis/validate-location', methods=['POST'])
     def validate_location():
         """Validate and geocode location."""
@@ -129,7 +211,7 @@ def register_routes(app: Flask) -> None:
             # Validate with Pydantic
             crisis_profile = CrisisProfile(**data)
 
-            # Store in database
+            # Store in database first: a queued job must never run without its profile
             conn = get_db()
             cursor = conn.cursor()
             cursor.execute("""
@@ -153,51 +235,38 @@ def register_routes(app: Flask) -> None:
             conn.commit()
             conn.close()
 
-            logger.info(f"Created crisis plan task: {task_id}")
-
-            # Trigger async agent processing in background
-            # Flask doesn't natively support async, so we run in a thread
-            import threading
-
-            def run_coordinator():
-                """Run coordinator in background thread."""
-                try:
-                    logger.info(f"🎯 Starting coordinator for task_id={task_id}")
-
-                    # Create asyncio event loop for this thread
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-
-                    # Convert crisis_profile to dict
-                    crisis_dict = crisis_profile.model_dump()
-
-                    # Run coordinator
-                    completed_blackboard = loop.run_until_complete(
-                        coordinator.generate_plan(crisis_dict)
-                    )
-
-                    logger.info(f"✅ Coordinator completed for task_id={task_id}")
-                    logger.info(f"   Agents completed: {completed_blackboard.agents_completed}")
-                    logger.info(f"   Agents failed: {completed_blackboard.agents_failed}")
-                    logger.info(f"   Total tokens: {completed_blackboard.total_tokens_used}")
-                    logger.info(f"   Total cost: ${completed_blackboard.total_cost_estimate:.4f}")
-
-                    loop.close()
-
-                except Exception as e:
-                    logger.error(f"❌ Coordinator error for task_id={task_id}: {e}", exc_info=True)
+            # Admission control last: a rejected (or failed) enqueue removes the profile again
+            try:
+                queue_position = job_queue.enqueue(
+                    crisis_profile.task_id,
+                    crisis_profile.model_dump(mode="json")
+                )
+            except Exception:
+                conn = get_db()
+                conn.execute("DELETE FROM crisis_profiles WHERE task_id = ?", (task_id,))
+                conn.commit()
+                conn.close()
+                raise
 
-            # Start background thread
-            thread = threading.Thread(target=run_coordinator, daemon=True)
-            thread.start()
+            logger.info(f"Created crisis plan task: {task_id}")
 
             return jsonify({
                 "task_id": task_id,
-                "status": "processing",
-                "message": "Crisis plan generation started. Use task_id to check status.",
+                "status": "queued",
+                "queue_position": queue_position,
+                "message": "Crisis plan generation queued. Use task_id to check status.",
                 "estimated_time_seconds": 180
             }), 202
 
+        except QueueFullError as e:
+            logger.warning(f"Rejected crisis plan request: {e}")
+            response = jsonify({
+                "error": "QueueFull",
+                "message": "Too many plans are being generated right now. Please retry shortly.",
+                "retry_after_seconds": 30
+            })
+            response.headers['Retry-After'] = '30'
+            return response, 429
         except ValueError as e:
             return jsonify({"error": "ValidationError", "message": str(e)}), 400
         except Exception as e:
@@ -208,62 +277,38 @@ def register_routes(app: Flask) -> None:
     def get_crisis_status(task_id: str):
         """Get crisis plan generation status."""
         try:
-            # Check blackboard for authoritative status
-            from ..services.blackboard_service import blackboard_service
-            blackboard = blackboard_service.get_blackboard(task_id)
+            # Status projection: coordination columns + agent logs in one query
+            status_row = blackboard_service.get_status(task_id)
 
-            if not blackboard:
+            if not status_row:
                 # Check if task exists in crisis_profiles
                 conn = get_db()
                 cursor = conn.cursor()
-                cursor.execute("SELECT * FROM crisis_profiles WHERE task_id = ?", (task_id,))
+                cursor.execute("SELECT 1 FROM crisis_profiles WHERE task_id = ?", (task_id,))
                 task = cursor.fetchone()
                 conn.close()
 
                 if not task:
                     return jsonify({"error": "NotFound", "message": "Task not found"}), 404
 
-                # Task exists but no blackboard yet - still initializing
+                # Task exists but no blackboard yet - waiting in the job queue or initializing
+                queue_position = job_queue.get_position(task_id)
                 return jsonify({
                     "task_id": task_id,
-                    "status": "processing",
+                    "status": "queued" if queue_position else "processing",
+                    "queue_position": queue_position,
                     "progress_percentage": 0,
                     "agents": [],
                     "estimated_completion_seconds": 180
                 })
 
-            # Get agent logs for detailed progress
-            conn = get_db()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM agent_logs
-                WHERE task_id = ?
-                ORDER BY started_at
-            """, (task_id,))
-            logs = cursor.fetchall()
-            conn.close()
-
-            # Convert logs to dict
-            agents = []
-            for log in logs:
-                agents.append({
-                    "agent_name": log['agent_name'],
-                    "agent_type": log['agent_type'],
-                    "status": log['status'],
-                    "current_task_description": log['current_task_description'],
-                    "progress_percentage": log['progress_percentage'],
-                    "started_at": log['started_at'],
-                    "completed_at": log['completed_at'],
-                    "error_message": log['error_message']
-                })
-
             # Use blackboard status as authoritative source
-            status = blackboard.status
+            status = status_row["status"]
 
             # Calculate progress based on agents completed
             total_agents = 5  # RiskAssessment, SupplyPlanning, ResourceLocator, VideoCurator, Documentation
-            completed_agents = len(blackboard.agents_completed)
-            failed_agents = len(blackboard.agents_failed)
+            completed_agents = len(status_row["agents_completed"])
+            failed_agents = len(status_row["agents_failed"])
 
             if status == "completed":
                 progress = 100
@@ -276,7 +321,7 @@ def register_routes(app: Flask) -> None:
                 "task_id": task_id,
                 "status": status,
                 "progress_percentage": progress,
-                "agents": agents,
+                "agents": status_row["agents"],
                 "estimated_completion_seconds": None
             })
 
@@ -286,10 +331,16 @@ def register_routes(app: Flask) -> None:
 
     @app.route('/api/crisis/<task_id>/result', methods=['GET'])
     def get_crisis_result(task_id: str):
-        """Get complete crisis plan."""
+        """
+        Get complete crisis plan.
+
+        complete_plan is returned as a manifest (the sections it references are
+        already top-level fields); ?materialize=true inlines them for clients that
+        need the full plan document.
+        """
         try:
-            # Get blackboard from database
-            blackboard = blackboard_service.get_blackboard(task_id)
+            # Lazy view: only the fields this response reads are decoded
+            blackboard = blackboard_service.get_view(task_id)
 
             if not blackboard:
                 return jsonify({"error": "NotFound", "message": "Task not found"}), 404
@@ -301,7 +352,19 @@ def register_routes(app: Flask) -> None:
                     "task_id": task_id,
                     "status": blackboard.status,
                     "agents_completed": blackboard.agents_completed,
-                    "agents_failed": blackboard.agents_failed
+                    "agents_failed": blackboard.agents_failed,
+                    # Sections already committed by finished agents (progressive rendering)
+                    "partial_results": {
+                        field: getattr(blackboard, field)
+                        for field in (
+                            "risk_assessment",
+                            "supply_plan",
+                            "economic_plan",
+                            "resource_locations",
+                            "video_recommendations"
+                        )
+                        if getattr(blackboard, field) is not None
+                    }
                 }), 202
 
             # Return plan (even if failed, return partial results)
@@ -315,7 +378,11 @@ def register_routes(app: Flask) -> None:
                 "economic_plan": blackboard.economic_plan,
                 "resource_locations": blackboard.resource_locations,
                 "video_recommendations": blackboard.video_recommendations,
-                "complete_plan": blackboard.complete_plan,
+                "complete_plan": (
+                    blackboard.materialize_complete_plan()
+                    if request.args.get("materialize", "").lower() in ("1", "true")
+                    else blackboard.complete_plan
+                ),
                 "pdf_path": blackboard.pdf_path,
                 "execution_time_seconds": blackboard.total_execution_seconds,
                 "total_tokens_used": blackboard.total_tokens_used,
@@ -332,8 +399,8 @@ def register_routes(app: Flask) -> None:
     def download_pdf(task_id: str):
         """Download crisis plan PDF."""
         try:
-            # Get blackboard from database
-            blackboard = blackboard_service.get_blackboard(task_id)
+            # Load just the two columns needed (never the plan itself)
+            blackboard = blackboard_service.get_view(task_id, ["status", "pdf_path"])
 
             if not blackboard:
                 return jsonify({"error": "NotFound", "message": "Task not found"}), 404
@@ -376,8 +443,8 @@ def register_routes(app: Flask) -> None:
         useful for debugging when results aren't showing up in the UI.
         """
         try:
-            # Get blackboard from database
-            blackboard = blackboard_service.get_blackboard(task_id)
+            # Read-only view of the blackboard from the database
+            blackboard = blackboard_service.get_view(task_id)
 
             if not blackboard:
                 return jsonify({"error": "NotFound", "message": "Task not found"}), 404
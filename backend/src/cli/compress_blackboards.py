@@ -0,0 +1,197 @@
+"""
+Migration CLI: Compress (or decompress) the JSON columns of existing blackboards.
+
+New writes are compressed by the column codec as they happen; rows written before
+compression was enabled stay plain text until they are rewritten. This walks the
+blackboards table in rowid batches and rewrites every large JSON column into the
+current format, reporting the bytes saved and the time spent encoding and decoding.
+--decompress turns every column back into plain text (for rolling back).
+
+Usage (from backend/):
+    python -m src.cli.compress_blackboards --dry-run
+    python -m src.cli.compress_blackboards --batch-size 200 --vacuum
+    python -m src.cli.compress_blackboards --decompress
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Optional
+
+from ..api.database import _db_path, get_db, init_db
+from ..services.blackboard_service import BLACKBOARD_COLUMNS
+from ..services.column_codec import column_codec
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# JSON columns written through the column codec
+JSON_COLUMNS = sorted({column for column, _ in BLACKBOARD_COLUMNS.values() if column.endswith("_json")})
+
+
+def stored_size(value: Any) -> int:
+    """
+    Get the stored size of a column value in bytes.
+
+    Args:
+        value: Value as read from or written to the database
+
+    Returns:
+        Size in bytes (text is measured as UTF-8)
+    """
+    return len(value) if isinstance(value, bytes) else len(value.encode("utf-8"))
+
+
+def migrate(batch_size: int, decompress: bool = False, dry_run: bool = False) -> dict[str, Any]:
+    """
+    Rewrite the JSON columns of every blackboard in rowid batches.
+
+    Each batch is committed on its own, so an interrupted run can simply be started
+    again (values already in the target format are left untouched). Rows are
+    rewritten with a compare-and-set, so the migration is safe on a live database:
+    a row a plan wrote to after it was read is skipped rather than overwritten with
+    stale values (its new values are already in the current format, or are picked
+    up by the next run).
+
+    Args:
+        batch_size: Rows read and committed per batch
+        decompress: Convert to plain text instead of compressing
+        dry_run: Compute the report without writing anything
+
+    Returns:
+        Dict with rows scanned, columns rewritten, rows skipped because they
+        changed, bytes before and after, and decode/encode seconds
+    """
+    report = {
+        "rows": 0,
+        "rewritten": 0,
+        "skipped": 0,
+        "bytes_before": 0,
+        "bytes_after": 0,
+        "decode_seconds": 0.0,
+        "encode_seconds": 0.0
+    }
+    columns = ", ".join(JSON_COLUMNS)
+    last_rowid = 0
+
+    conn = get_db()
+
+    try:
+        while True:
+            rows = conn.execute(
+                f"SELECT rowid, {columns} FROM blackboards WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last_rowid, batch_size)
+            ).fetchall()
+            if not rows:
+                break
+
+            for row in rows:
+                last_rowid = row['rowid']
+                report["rows"] += 1
+                changes = {}
+                bytes_before = bytes_after = 0
+
+                for column in JSON_COLUMNS:
+                    value = row[column]
+                    if value is None:
+                        continue
+
+                    start_time = time.perf_counter()
+                    text = column_codec.decompress(value)
+                    decoded_at = time.perf_counter()
+                    new_value = text if decompress else column_codec.compress(text, force=True)
+                    report["decode_seconds"] += decoded_at - start_time
+                    report["encode_seconds"] += time.perf_counter() - decoded_at
+
+                    bytes_before += stored_size(value)
+                    bytes_after += stored_size(new_value)
+                    if new_value != value:
+                        changes[column] = new_value
+
+                if changes and not dry_run:
+                    # Only if none of the columns changed since they were read
+                    assignments = ", ".join(f"{column} = ?" for column in changes)
+                    unchanged = " AND ".join(f"{column} IS ?" for column in changes)
+                    updated = conn.execute(
+                        f"UPDATE blackboards SET {assignments} WHERE rowid = ? AND {unchanged}",
+                        (*changes.values(), row['rowid'], *(row[column] for column in changes))
+                    ).rowcount
+                    if not updated:
+                        report["skipped"] += 1
+                        continue
+
+                report["bytes_before"] += bytes_before
+                report["bytes_after"] += bytes_after
+                report["rewritten"] += len(changes)
+
+            conn.commit()
+            print(f"  scanned {report['rows']} row(s), rewrote {report['rewritten']} column(s)")
+    finally:
+        conn.close()
+
+    return report
+
+
+def vacuum() -> tuple[int, int]:
+    """
+    Rebuild the database file so space freed by the migration is returned.
+
+    Returns:
+        Database file size in bytes before and after
+    """
+    conn = get_db()
+
+    try:
+        # In WAL mode pages only reach the main file at a checkpoint
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size_before = os.path.getsize(_db_path())
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return size_before, os.path.getsize(_db_path())
+    finally:
+        conn.close()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Run the migration CLI.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Compress the JSON columns of existing blackboards.")
+    parser.add_argument("--batch-size", type=int, default=100, help="Rows committed per batch")
+    parser.add_argument("--decompress", action="store_true", help="Rewrite every column as plain text")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM the database file afterwards")
+    parser.add_argument("--dry-run", action="store_true", help="Report savings without writing")
+    args = parser.parse_args(argv)
+
+    init_db()
+
+    action = "Decompressing" if args.decompress else "Compressing"
+    print(f"{action} blackboard columns (min {column_codec.min_bytes} bytes, level {column_codec.level})"
+          f"{' [dry run]' if args.dry_run else ''}:")
+
+    report = migrate(args.batch_size, decompress=args.decompress, dry_run=args.dry_run)
+
+    change = report["bytes_after"] - report["bytes_before"]
+    change_percent = 100 * change / report["bytes_before"] if report["bytes_before"] else 0.0
+    print(f"Rewrote {report['rewritten']} column(s) in {report['rows']} row(s): "
+          f"{report['bytes_before']} -> {report['bytes_after']} bytes ({change_percent:+.1f}%)")
+    if report["skipped"]:
+        print(f"Skipped {report['skipped']} row(s) written to during the migration (run again to include them)")
+    print(f"Decode {report['decode_seconds'] * 1000:.1f} ms, encode {report['encode_seconds'] * 1000:.1f} ms")
+
+    if args.vacuum and not args.dry_run:
+        size_before, size_after = vacuum()
+        print(f"Vacuumed database file: {size_before} -> {size_after} bytes")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
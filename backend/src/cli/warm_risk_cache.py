@@ -0,0 +1,183 @@
+"""
+Warm-up CLI: Precompute area risk assessments before a season.
+
+Finds the most requested (area, threat) pairs in crisis_profiles history and stores
+a fresh risk assessment for each, so the first users in a surge already hit the
+area risk cache.
+
+Usage (from backend/):
+    python -m src.cli.warm_risk_cache --top 50
+    python -m src.cli.warm_risk_cache --threat hurricane --top 20 --days 365
+    python -m src.cli.warm_risk_cache --pair "hurricane:Miami,FL" --pair "wildfire:Paradise,CA"
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections import Counter
+from typing import Any, Optional
+
+from ..agents.agent_registry import agent_registry
+from ..api.database import get_db, init_db
+from ..services.area_risk_cache import area_risk_cache
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def find_top_pairs(top: int, threat: Optional[str] = None, days: int = 365) -> list[dict[str, Any]]:
+    """
+    Find the most requested (area, threat) pairs for natural disasters.
+
+    Args:
+        top: Number of pairs to return
+        threat: Only consider this threat (all threats if None)
+        days: Only consider plans created within this many days
+
+    Returns:
+        List of dicts with area_key, threat, location (most recent) and requests
+    """
+    conn = get_db()
+
+    try:
+        query = """
+            SELECT specific_threat, location_json FROM crisis_profiles
+            WHERE crisis_mode = 'natural_disaster'
+              AND created_at >= datetime('now', ?)
+        """
+        params: list[Any] = [f"-{days} days"]
+        if threat:
+            query += " AND specific_threat = ?"
+            params.append(threat)
+        query += " ORDER BY created_at DESC"
+
+        rows = conn.execute(query, params).fetchall()
+    finally:
+        conn.close()
+
+    counts: Counter = Counter()
+    pairs: dict[str, dict[str, Any]] = {}
+
+    for row in rows:
+        location = json.loads(row['location_json'])
+        key = area_risk_cache.area_key(row['specific_threat'], location)
+        if key is None:
+            continue
+
+        counts[key] += 1
+        # Rows are newest first, so the first location seen represents the area
+        pairs.setdefault(key, {"area_key": key, "threat": row['specific_threat'], "location": location})
+
+    return [
+        {**pairs[key], "requests": count}
+        for key, count in counts.most_common(top)
+    ]
+
+
+def parse_pair(spec: str) -> dict[str, Any]:
+    """
+    Parse a "threat:City,ST" pair given on the command line.
+
+    Args:
+        spec: Pair specification
+
+    Returns:
+        Dict with threat and location
+
+    Raises:
+        argparse.ArgumentTypeError: If the format is invalid
+    """
+    threat, _, place = spec.partition(":")
+    city, _, state = place.rpartition(",")
+
+    if not threat.strip() or not city.strip() or not state.strip():
+        raise argparse.ArgumentTypeError(f"Expected threat:City,ST, got {spec!r}")
+
+    return {
+        "threat": threat.strip(),
+        "location": {"city": city.strip(), "state": state.strip().upper()},
+        "requests": 0
+    }
+
+
+async def warm_pairs(pairs: list[dict[str, Any]], concurrency: int) -> int:
+    """
+    Compute and store area assessments for each pair.
+
+    Args:
+        pairs: Pairs from find_top_pairs() or parse_pair()
+        concurrency: Maximum Claude calls in flight
+
+    Returns:
+        Number of pairs stored successfully
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def warm(pair: dict[str, Any]) -> bool:
+        async with semaphore:
+            with agent_registry.lease("RiskAssessmentAgent") as agent:
+                try:
+                    key = await agent.warm_area_assessment(pair["location"], pair["threat"])
+                except Exception as e:
+                    logger.error(f"Failed to warm {pair['threat']} for {pair['location']}: {e}")
+                    return False
+
+        if key is None:
+            logger.warning(f"Could not warm {pair['threat']} for {pair['location']}")
+            return False
+
+        print(f"  warmed {key} ({pair['requests']} recent requests)")
+        return True
+
+    results = await asyncio.gather(*(warm(pair) for pair in pairs))
+    return sum(results)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Run the warm-up CLI.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Precompute area risk assessments.")
+    parser.add_argument("--top", type=int, default=50, help="Number of top (area, threat) pairs")
+    parser.add_argument("--threat", help="Only warm this threat (e.g. hurricane)")
+    parser.add_argument("--days", type=int, default=365, help="History window in days")
+    parser.add_argument(
+        "--pair",
+        type=parse_pair,
+        action="append",
+        default=[],
+        help='Explicit pair to warm, e.g. "hurricane:Miami,FL" (repeatable)'
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="Claude calls in flight")
+    parser.add_argument("--dry-run", action="store_true", help="List pairs without calling Claude")
+    args = parser.parse_args(argv)
+
+    init_db()
+
+    pairs = args.pair or find_top_pairs(args.top, args.threat, args.days)
+    if not pairs:
+        print("No (area, threat) pairs found to warm.")
+        return 0
+
+    print(f"Warming {len(pairs)} area risk assessment(s):")
+    if args.dry_run:
+        for pair in pairs:
+            print(f"  {area_risk_cache.area_key(pair['threat'], pair['location'])} "
+                  f"({pair['requests']} recent requests)")
+        return 0
+
+    warmed = asyncio.run(warm_pairs(pairs, args.concurrency))
+    print(f"Warmed {warmed}/{len(pairs)} area risk assessment(s).")
+
+    return 0 if warmed == len(pairs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Agent Output: Typed result delta returned by an agent run.
+
+Agents no longer mutate the shared Blackboard. Each run returns an AgentOutput with
+the blackboard fields it produced plus its token usage, cost and errors, and the
+Coordinator merges outputs into the blackboard. Because every field is owned by
+exactly one agent, the merged result does not depend on completion order, and an
+output can be produced anywhere (e.g. in a worker process) and sent back as JSON.
+"""
+
+from datetime import datetime
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+# Blackboard fields each agent is allowed to write
+AGENT_OUTPUT_FIELDS: dict[str, tuple[str, ...]] = {
+    "RiskAssessmentAgent": ("risk_assessment",),
+    "SupplyPlanningAgent": ("supply_plan",),
+    "FinancialAdvisorAgent": ("economic_plan",),
+    "ResourceLocatorAgent": ("resource_locations",),
+    "VideoCuratorAgent": ("video_recommendations",),
+    "DocumentationAgent": ("complete_plan", "pdf_path"),
+}
+
+
+class AgentOutput(BaseModel):
+    """Result of one agent run, merged into the blackboard by the Coordinator."""
+
+    agent_name: str = Field(..., description="Agent class name that produced this output")
+    status: Literal["completed", "partial", "failed", "skipped"] = Field(
+        default="completed",
+        description=(
+            "completed: fields are valid; partial: early subset of fields while the agent "
+            "is still running; failed: agent errored; skipped: agent did not apply"
+        )
+    )
+
+    fields: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Blackboard field name -> value written by this agent"
+    )
+
+    tokens_used: int = Field(default=0, description="Claude tokens consumed by this run")
+    cost: float = Field(default=0.0, description="Estimated cost in USD for this run")
+
+    errors: list[dict[str, Any]] = Field(
+        default_factory=list,
+        description="Errors encountered during the run"
+    )
+
+    @model_validator(mode="after")
+    def check_field_ownership(self) -> "AgentOutput":
+        """Reject writes to blackboard fields the agent does not own."""
+        allowed = AGENT_OUTPUT_FIELDS.get(self.agent_name, ())
+        foreign = [name for name in self.fields if name not in allowed]
+
+        if foreign:
+            raise ValueError(f"{self.agent_name} cannot write blackboard fields: {foreign}")
+
+        return self
+
+    @classmethod
+    def failed(cls, agent_name: str, error_message: str) -> "AgentOutput":
+        """
+        Create output for an agent run that failed.
+
+        Args:
+            agent_name: Name of the agent that failed
+            error_message: Description of the error
+
+        Returns:
+            AgentOutput with status "failed"
+        """
+        return cls(
+            agent_name=agent_name,
+            status="failed",
+            errors=[{
+                "agent_name": agent_name,
+                "error_message": error_message,
+                "timestamp": datetime.utcnow().isoformat()
+            }]
+        )
@@ -5,18 +5,64 @@ The blackboard pattern is used for multi-agent coordination in PrepSmart.
 All agents read from and write to this shared state atomically.
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, Any
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Iterable, Optional, Any
 from datetime import datetime
 
+from .agent_output import AGENT_OUTPUT_FIELDS, AgentOutput
+
+# Agent sections complete_plan references instead of copying (section -> value when absent)
+COMPLETE_PLAN_SECTIONS: dict[str, Any] = {
+    "risk_assessment": None,
+    "supply_plan": None,
+    "economic_plan": None,
+    "resource_locations": [],
+    "video_recommendations": [],
+}
+
+
+def materialize_complete_plan(complete_plan: Optional[dict[str, Any]], source: Any) -> Optional[dict[str, Any]]:
+    """
+    Expand a complete_plan manifest into the full plan document.
+
+    The Documentation Agent stores complete_plan as a manifest: the plan header and
+    status snapshot plus section_refs, the names of the sections it referenced. The
+    sections themselves are read from source, so they are stored (and sent) once.
+    Plans stored before manifests existed already embed their sections and are
+    returned unchanged.
+
+    Args:
+        complete_plan: Stored complete_plan (manifest or embedded plan)
+        source: Blackboard (or view) holding the referenced sections
+
+    Returns:
+        Plan with every section inlined, or None if there is no plan
+    """
+    if complete_plan is None or "section_refs" not in complete_plan:
+        return complete_plan
+
+    plan = {key: value for key, value in complete_plan.items() if key != "section_refs"}
+    for section, absent in COMPLETE_PLAN_SECTIONS.items():
+        value = getattr(source, section) if section in complete_plan["section_refs"] else None
+        plan[section] = value if value is not None else (list(absent) if isinstance(absent, list) else absent)
+
+    return plan
+
 
 class Blackboard(BaseModel):
     """
     Shared state for multi-agent coordination using the blackboard pattern.
 
     The blackboard contains all input data, intermediate agent results, and final output.
-    Agents read from and write to the blackboard atomically.
-    The Coordinator Agent monitors the blackboard to determine agent execution order.
+    Agents read from the blackboard and return their results as AgentOutput deltas.
+    The Coordinator Agent merges those deltas (apply_output) and monitors the blackboard
+    to determine agent execution order.
+
+    The blackboard tracks which fields changed since it was loaded or last saved
+    (dirty_fields), so the service only rewrites those columns. Assignments are
+    tracked directly; lists and dicts are also compared with a shallow copy taken
+    when the blackboard was marked clean, which catches in-place appends (e.g.
+    errors.append) but not edits nested deeper inside an agent output.
     """
 
     # Identifiers
@@ -59,7 +105,7 @@ class Blackboard(BaseModel):
     # Final Output
     complete_plan: Optional[dict[str, Any]] = Field(
         None,
-        description="From Documentation Agent - consolidated plan"
+        description="From Documentation Agent - plan manifest referencing the agent sections"
     )
     pdf_path: Optional[str] = Field(
         None,
@@ -110,6 +156,10 @@ class Blackboard(BaseModel):
         description="List of errors encountered during execution"
     )
 
+    # Change tracking (not part of the model data)
+    _dirty: set[str] = PrivateAttr(default_factory=set)
+    _clean_containers: dict[str, Any] = PrivateAttr(default_factory=dict)
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -130,6 +180,63 @@ class Blackboard(BaseModel):
             }
         }
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute, recording model fields as dirty."""
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._dirty.add(name)
+
+    def dirty_fields(self) -> list[str]:
+        """
+        Get fields changed since the blackboard was last marked clean.
+
+        Returns:
+            Names of changed fields (assigned, or lists/dicts modified in place)
+        """
+        dirty = set(self._dirty)
+        for field_name, clean_value in self._clean_containers.items():
+            if field_name not in dirty and getattr(self, field_name) != clean_value:
+                dirty.add(field_name)
+        return [field_name for field_name in type(self).model_fields if field_name in dirty]
+
+    def mark_clean(self, field_names: Optional[Iterable[str]] = None) -> None:
+        """
+        Record fields as matching the database (after loading or saving).
+
+        Args:
+            field_names: Fields that were saved (None marks every field clean)
+        """
+        names = type(self).model_fields if field_names is None else set(field_names)
+
+        # Replace rather than mutate: model_copy() snapshots share private state
+        self._dirty = self._dirty - set(names)
+        containers = dict(self._clean_containers)
+        for field_name in names:
+            value = getattr(self, field_name)
+            if isinstance(value, list):
+                containers[field_name] = list(value)
+            elif isinstance(value, dict):
+                containers[field_name] = dict(value)
+            else:
+                containers.pop(field_name, None)
+        self._clean_containers = containers
+
+    def snapshot(self) -> "Blackboard":
+        """
+        Copy the blackboard for an agent to read while the original keeps changing.
+
+        The copy is deep, so in-place updates of the original (agents_completed,
+        errors, totals merged by apply_output) never show through, and it starts
+        without change tracking of its own.
+
+        Returns:
+            Independent Blackboard copy
+        """
+        snapshot = self.model_copy(deep=True)
+        snapshot._dirty = set()
+        snapshot._clean_containers = {}
+        return snapshot
+
     def mark_agent_complete(self, agent_name: str, tokens_used: int = 0, cost: float = 0.0) -> None:
         """
         Mark an agent as completed and update tracking metrics.
@@ -146,6 +253,27 @@ class Blackboard(BaseModel):
         self.total_cost_estimate += cost
         self.updated_at = datetime.utcnow()
 
+    def reopen_agent(self, agent_name: str) -> list[str]:
+        """
+        Mark an agent as not yet run, so the coordinator starts it again.
+
+        Its fields stay on the blackboard until the new run replaces them, and the
+        tokens and cost of the earlier run stay counted.
+
+        Args:
+            agent_name: Name of the agent to run again
+
+        Returns:
+            Names of blackboard fields changed
+        """
+        if agent_name not in self.agents_completed and agent_name not in self.agents_failed:
+            return []
+
+        self.agents_completed = [name for name in self.agents_completed if name != agent_name]
+        self.agents_failed = [name for name in self.agents_failed if name != agent_name]
+        self.updated_at = datetime.utcnow()
+        return ["agents_completed", "agents_failed", "updated_at"]
+
     def mark_agent_failed(self, agent_name: str, error_message: str) -> None:
         """
         Mark an agent as failed and log the error.
@@ -164,6 +292,61 @@ class Blackboard(BaseModel):
         })
         self.updated_at = datetime.utcnow()
 
+    def apply_output(self, output: AgentOutput) -> list[str]:
+        """
+        Merge an agent's output delta into the blackboard.
+
+        Each blackboard field is owned by a single agent (see AGENT_OUTPUT_FIELDS),
+        so merging outputs in any order gives the same result. Partial (early)
+        outputs set fields without completing the agent; they are replaced by the
+        final output, or cleared if the agent fails.
+
+        Args:
+            output: Output returned by an agent run
+
+        Returns:
+            Names of blackboard fields changed by the merge
+        """
+        if output.status == "skipped":
+            return []
+
+        if output.status == "failed":
+            # Never leave an early output of a failed run behind
+            cleared = [
+                field_name for field_name in AGENT_OUTPUT_FIELDS.get(output.agent_name, ())
+                if getattr(self, field_name) is not None
+            ]
+            for field_name in cleared:
+                setattr(self, field_name, None)
+
+            if output.agent_name not in self.agents_failed:
+                self.agents_failed.append(output.agent_name)
+            self.errors.extend(output.errors)
+            self.updated_at = datetime.utcnow()
+            return cleared + ["agents_failed", "errors", "updated_at"]
+
+        for field_name, value in output.fields.items():
+            setattr(self, field_name, value)
+
+        changed = list(output.fields)
+        if output.status == "partial":
+            return changed
+        if output.errors:
+            self.errors.extend(output.errors)
+            changed.append("errors")
+
+        self.mark_agent_complete(output.agent_name, output.tokens_used, output.cost)
+        return changed + ["agents_completed", "total_tokens_used", "total_cost_estimate", "updated_at"]
+
+    def materialize_complete_plan(self) -> Optional[dict[str, Any]]:
+        """
+        Get complete_plan with the referenced agent sections inlined.
+
+        Returns:
+            Full plan document, or None if the Documentation Agent has not run
+        """
+        return materialize_complete_plan(self.complete_plan, self)
+
     def calculate_execution_time(self) -> Optional[float]:
         """
         Calculate total execution time if start and end are set.
@@ -0,0 +1,339 @@
+"""
+Area Risk Cache: Reuse natural disaster risk assessments across users in one area.
+
+Exact-prompt caching misses most repeats because prompts include each user's
+coordinates. Hurricane risk is effectively the same for everyone in a metro, so
+assessments are stored per (threat, state, area bucket) and reused within a
+freshness window. The area bucket is the normalized city name, or a coarse geohash
+when bucketing by coordinates. User-specific fields are layered on top by the
+RiskAssessmentAgent. Async callers use get_async()/put_async(), which run SQLite in
+a worker thread. Hit counts are flushed to SQLite at most once per touch interval
+per area, so surge traffic served from the cache does not turn into writes.
+"""
+
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from ..utils.config import settings
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Leading abbreviations expanded so "St. Petersburg" and "Saint Petersburg" share a bucket
+_CITY_ABBREVIATIONS = {"st": "saint", "ste": "sainte", "ft": "fort", "mt": "mount"}
+
+# Fields of a stored assessment that belong to the requesting user, not the area
+USER_SPECIFIC_FIELDS = ("task_id", "generated_at", "location")
+
+
+def normalize_city(city: str) -> str:
+    """
+    Normalize a city name for area bucketing.
+
+    Args:
+        city: City name as entered by the user
+
+    Returns:
+        Lowercase name without punctuation, prefixes or redundant whitespace
+    """
+    words = re.sub(r"[^a-z0-9 ]", " ", city.lower()).split()
+
+    if words[:2] == ["city", "of"]:
+        words = words[2:]
+    if words:
+        words[0] = _CITY_ABBREVIATIONS.get(words[0], words[0])
+
+    return " ".join(words)
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int) -> str:
+    """
+    Encode coordinates as a geohash.
+
+    Args:
+        latitude: Latitude in degrees
+        longitude: Longitude in degrees
+        precision: Number of geohash characters (4 ~ 39km x 20km cells)
+
+    Returns:
+        Geohash string
+    """
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    geohash, bits, bit_count, even = [], 0, 0, True
+
+    while len(geohash) < precision:
+        value, value_range = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (value_range[0] + value_range[1]) / 2
+
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            value_range[0] = mid
+        else:
+            value_range[1] = mid
+
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(_GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+
+    return "".join(geohash)
+
+
+class AreaRiskCache:
+    """Store of recent area-level risk assessments (SQLite, shared by all workers)."""
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        max_age_seconds: Optional[int] = None,
+        bucketing: Optional[str] = None,
+        geohash_precision: Optional[int] = None,
+        touch_interval_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Initialize cache (unset arguments default to settings).
+
+        Args:
+            enabled: Whether assessments are reused at all
+            max_age_seconds: Freshness window for reuse
+            bucketing: "city" (normalized city name) or "geohash" (coarse coordinates)
+            geohash_precision: Geohash length when bucketing by coordinates
+            touch_interval_seconds: Minimum time between hit count writes of an area
+        """
+        self.enabled = settings.area_risk_reuse_enabled if enabled is None else enabled
+        self.max_age_seconds = (
+            settings.area_risk_max_age_seconds if max_age_seconds is None else max_age_seconds
+        )
+        self.bucketing = settings.area_risk_bucketing if bucketing is None else bucketing
+        self.geohash_precision = (
+            settings.area_risk_geohash_precision if geohash_precision is None else geohash_precision
+        )
+        self.touch_interval_seconds = (
+            settings.area_risk_touch_interval_seconds
+            if touch_interval_seconds is None else touch_interval_seconds
+        )
+        self._lock = threading.Lock()
+        # Area key -> (hits not yet written, time of the last hit count write)
+        self._pending_hits: dict[str, tuple[int, float]] = {}
+        self._stats = {"hits": 0, "misses": 0, "stores": 0}
+
+    def area_key(self, threat: str, location: dict[str, Any]) -> Optional[str]:
+        """
+        Build the area key for a threat and location.
+
+        Args:
+            threat: Specific threat (e.g. "hurricane")
+            location: Location dict (city, state, latitude, longitude)
+
+        Returns:
+            Area key, or None if the location is too vague to bucket
+        """
+        state = (location.get("state") or "").strip().upper()
+        latitude, longitude = location.get("latitude"), location.get("longitude")
+        city = normalize_city(location.get("city") or "")
+
+        if self.bucketing == "geohash" and latitude is not None and longitude is not None:
+            bucket = f"geo:{encode_geohash(float(latitude), float(longitude), self.geohash_precision)}"
+        elif city and state:
+            bucket = f"city:{city}"
+        else:
+            return None
+
+        return f"{threat.strip().lower()}|{state}|{bucket}"
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """
+        Get database connection.
+
+        Returns:
+            SQLite connection
+        """
+        from ..api.database import get_db
+
+        return get_db()
+
+    def get(self, threat: str, location: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """
+        Get a fresh area assessment for a threat and location.
+
+        Args:
+            threat: Specific threat
+            location: Location dict
+
+        Returns:
+            Area-level assessment (without user-specific fields) plus an
+            "area_assessment" provenance entry, or None if none is fresh
+        """
+        key = self.area_key(threat, location) if self.enabled else None
+        if key is None:
+            return None
+
+        row = None
+        now = time.time()
+        try:
+            conn = self._get_conn()
+            try:
+                row = conn.execute(
+                    "SELECT assessment_json, assessed_at FROM area_risk_assessments "
+                    "WHERE area_key = ? AND assessed_at > ?",
+                    (key, now - self.max_age_seconds)
+                ).fetchone()
+                hits = self._count_hit(key, now) if row is not None else 0
+                if hits:
+                    conn.execute(
+                        "UPDATE area_risk_assessments SET hit_count = hit_count + ? WHERE area_key = ?",
+                        (hits, key)
+                    )
+                    conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Area risk lookup failed for {key}: {e}")
+
+        with self._lock:
+            self._stats["hits" if row is not None else "misses"] += 1
+
+        if row is None:
+            return None
+
+        assessment = json.loads(row["assessment_json"])
+        assessment["area_assessment"] = {
+            "area_key": key,
+            "assessed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(row["assessed_at"]))
+        }
+        return assessment
+
+    async def get_async(self, threat: str, location: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """
+        Get a fresh area assessment without blocking the event loop on SQLite.
+
+        Args:
+            threat: Specific threat
+            location: Location dict
+
+        Returns:
+            Area-level assessment plus provenance, or None if none is fresh
+        """
+        if not self.enabled or self.area_key(threat, location) is None:
+            return None
+        return await asyncio.to_thread(self.get, threat, location)
+
+    def _count_hit(self, key: str, now: float) -> int:
+        """
+        Record a hit and decide whether the area's hit count is due to be written.
+
+        Args:
+            key: Area key
+            now: Current time
+
+        Returns:
+            Hits to add to the stored count now (0 while within the touch interval)
+        """
+        with self._lock:
+            pending, written_at = self._pending_hits.get(key, (0, 0.0))
+            pending += 1
+            if now - written_at < self.touch_interval_seconds:
+                self._pending_hits[key] = (pending, written_at)
+                return 0
+            self._pending_hits[key] = (0, now)
+            return pending
+
+    def put(
+        self,
+        threat: str,
+        location: dict[str, Any],
+        assessment: dict[str, Any],
+        source_task_id: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Store an assessment as the current one for its area.
+
+        Args:
+            threat: Specific threat
+            location: Location dict the assessment was made for
+            assessment: Risk assessment (user-specific fields are dropped)
+            source_task_id: Task that produced the assessment (for provenance)
+
+        Returns:
+            Area key the assessment was stored under, or None if not stored
+        """
+        key = self.area_key(threat, location)
+        if key is None:
+            return None
+
+        area_assessment = {
+            name: value for name, value in assessment.items()
+            if name not in USER_SPECIFIC_FIELDS and name != "area_assessment"
+        }
+
+        try:
+            conn = self._get_conn()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO area_risk_assessments ("
+                    "area_key, threat, state, assessment_json, assessed_at, source_task_id"
+                    ") VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        threat,
+                        (location.get("state") or "").upper(),
+                        json.dumps(area_assessment),
+                        time.time(),
+                        source_task_id
+                    )
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Area risk store failed for {key}: {e}")
+            return None
+
+        with self._lock:
+            self._stats["stores"] += 1
+
+        return key
+
+    async def put_async(
+        self,
+        threat: str,
+        location: dict[str, Any],
+        assessment: dict[str, Any],
+        source_task_id: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Store an assessment for its area without blocking the event loop on SQLite.
+
+        Args:
+            threat: Specific threat
+            location: Location dict the assessment was made for
+            assessment: Risk assessment (user-specific fields are dropped)
+            source_task_id: Task that produced the assessment (for provenance)
+
+        Returns:
+            Area key the assessment was stored under, or None if not stored
+        """
+        return await asyncio.to_thread(self.put, threat, location, assessment, source_task_id)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get reuse statistics.
+
+        Returns:
+            Dict with hit/miss/store counters
+        """
+        with self._lock:
+            return {"enabled": self.enabled, **self._stats}
+
+
+# Singleton instance
+area_risk_cache = AreaRiskCache()
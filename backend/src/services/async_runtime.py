@@ -0,0 +1,140 @@
+"""
+Async Runtime: Long-lived event loops for running coordinator coroutines.
+
+Flask request handlers and job queue workers are synchronous threads. Instead of
+creating (and leaking) a new event loop per plan, they submit coroutines to a small
+pool of dedicated runtime threads whose loops live for the whole process. Async HTTP
+connection pools bound to those loops therefore survive across tasks.
+"""
+
+import asyncio
+import concurrent.futures
+import itertools
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+from ..utils.config import settings
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncRuntime:
+    """Pool of runtime threads, each owning one persistent asyncio event loop."""
+
+    def __init__(self, num_loops: Optional[int] = None) -> None:
+        """
+        Initialize runtime (loops are started lazily on first submission).
+
+        Args:
+            num_loops: Number of runtime threads/loops (defaults to settings)
+        """
+        self.num_loops = max(1, num_loops or settings.async_runtime_loops)
+        self._lock = threading.Lock()
+        self._loops: list[asyncio.AbstractEventLoop] = []
+        self._threads: list[threading.Thread] = []
+        self._next_loop = itertools.cycle(range(self.num_loops))
+
+    def start(self) -> None:
+        """Start the runtime threads (idempotent)."""
+        with self._lock:
+            if self._loops:
+                return
+
+            for i in range(self.num_loops):
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                thread = threading.Thread(
+                    target=self._run_loop,
+                    args=(loop, ready),
+                    name=f"async-runtime-{i}",
+                    daemon=True
+                )
+                thread.start()
+                ready.wait()
+
+                self._loops.append(loop)
+                self._threads.append(thread)
+
+        logger.info(f"Async runtime started with {self.num_loops} event loop(s)")
+
+    def _run_loop(self, loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        """
+        Run an event loop forever on the current thread.
+
+        Args:
+            loop: Event loop owned by this thread
+            ready: Set once the loop is installed for this thread
+        """
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """
+        Submit a coroutine to a runtime loop (thread-safe).
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            Future resolved with the coroutine's result
+        """
+        self.start()
+
+        with self._lock:
+            loop = self._loops[next(self._next_loop)]
+
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """
+        Run a coroutine on the runtime and block until it completes.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            Exception: Whatever the coroutine raised
+        """
+        future = self.submit(coro)
+
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop all runtime loops and wait for their threads to exit.
+
+        Args:
+            timeout: Maximum seconds to wait for each thread
+        """
+        with self._lock:
+            loops, threads = self._loops, self._threads
+            self._loops, self._threads = [], []
+
+        for loop in loops:
+            loop.call_soon_threadsafe(loop.stop)
+
+        for thread in threads:
+            thread.join(timeout)
+
+
+# Singleton instance
+async_runtime = AsyncRuntime()
@@ -7,16 +7,192 @@ Provides thread-safe operations to create, read, update blackboards in the datab
 import json
 import sqlite3
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Iterable, Mapping, Optional
 from pathlib import Path
 
-from ..models.blackboard import Blackboard
+from pydantic import TypeAdapter
+
+from ..models.blackboard import Blackboard, materialize_complete_plan
 from ..utils.config import settings
 from ..utils.logger import setup_logger
+from .column_codec import column_codec
 
 logger = setup_logger(__name__)
 
 
+def _json_column(column: str, optional: bool = True) -> Callable[[Any], Any]:
+    """
+    Build the serializer of a JSON column (large values are stored compressed).
+
+    Args:
+        column: Database column name
+        optional: Store empty values as NULL (agent outputs)
+
+    Returns:
+        Serializer for BLACKBOARD_COLUMNS
+    """
+    def serialize(value: Any) -> Any:
+        if optional and not value:
+            return None
+        return column_codec.encode(json.dumps(value), column)
+
+    return serialize
+
+
+def _isoformat_or_none(value: Optional[datetime]) -> Optional[str]:
+    """Serialize optional timestamp."""
+    return value.isoformat() if value else None
+
+
+# Blackboard field -> (database column, serializer) for every updatable field
+BLACKBOARD_COLUMNS: dict[str, tuple[str, Callable[[Any], Any]]] = {
+    "updated_at": ("updated_at", _isoformat_or_none),
+    "risk_assessment": ("risk_assessment_json", _json_column("risk_assessment_json")),
+    "supply_plan": ("supply_plan_json", _json_column("supply_plan_json")),
+    "emergency_plan": ("emergency_plan_json", _json_column("emergency_plan_json")),
+    "economic_plan": ("economic_plan_json", _json_column("economic_plan_json")),
+    "resource_locations": ("resource_locations_json", _json_column("resource_locations_json")),
+    "video_recommendations": ("video_recommendations_json", _json_column("video_recommendations_json")),
+    "complete_plan": ("complete_plan_json", _json_column("complete_plan_json")),
+    "pdf_path": ("pdf_path", lambda value: value),
+    "status": ("status", lambda value: value),
+    "agents_completed": ("agents_completed_json", _json_column("agents_completed_json", optional=False)),
+    "agents_failed": ("agents_failed_json", _json_column("agents_failed_json", optional=False)),
+    "execution_start": ("execution_start", _isoformat_or_none),
+    "execution_end": ("execution_end", _isoformat_or_none),
+    "total_execution_seconds": ("total_execution_seconds", lambda value: value),
+    "total_tokens_used": ("total_tokens_used", lambda value: value),
+    "total_cost_estimate": ("total_cost_estimate", lambda value: value),
+    "errors": ("errors_json", _json_column("errors_json", optional=False)),
+}
+
+
+def _json_loads_or_none(value: Any) -> Any:
+    """Deserialize optional JSON column, plain or compressed (NULL and empty values load as None)."""
+    return json.loads(column_codec.decode(value)) if value else None
+
+
+def _json_loads_list(value: Any) -> list:
+    """Deserialize JSON list column, plain or compressed (NULL loads as an empty list)."""
+    return json.loads(column_codec.decode(value)) if value else []
+
+
+def _datetime_or_none(value: Optional[str]) -> Optional[datetime]:
+    """Deserialize optional ISO timestamp column."""
+    return datetime.fromisoformat(value) if value else None
+
+
+# Blackboard field -> (database column, deserializer) for every field
+BLACKBOARD_DECODERS: dict[str, tuple[str, Callable[[Any], Any]]] = {
+    "task_id": ("task_id", lambda value: value),
+    "created_at": ("created_at", _datetime_or_none),
+    "updated_at": ("updated_at", _datetime_or_none),
+    "crisis_profile": ("crisis_profile_json", _json_loads_or_none),
+    "risk_assessment": ("risk_assessment_json", _json_loads_or_none),
+    "supply_plan": ("supply_plan_json", _json_loads_or_none),
+    "emergency_plan": ("emergency_plan_json", _json_loads_or_none),
+    "economic_plan": ("economic_plan_json", _json_loads_or_none),
+    "resource_locations": ("resource_locations_json", _json_loads_or_none),
+    "video_recommendations": ("video_recommendations_json", _json_loads_or_none),
+    "complete_plan": ("complete_plan_json", _json_loads_or_none),
+    "pdf_path": ("pdf_path", lambda value: value),
+    "status": ("status", lambda value: value),
+    "agents_completed": ("agents_completed_json", _json_loads_list),
+    "agents_failed": ("agents_failed_json", _json_loads_list),
+    "execution_start": ("execution_start", _datetime_or_none),
+    "execution_end": ("execution_end", _datetime_or_none),
+    "total_execution_seconds": ("total_execution_seconds", lambda value: value),
+    "total_tokens_used": ("total_tokens_used", lambda value: value),
+    "total_cost_estimate": ("total_cost_estimate", lambda value: value),
+    "errors": ("errors_json", _json_loads_list),
+}
+
+# Per-field validators for views of untrusted rows (built on first use)
+_FIELD_ADAPTERS: dict[str, TypeAdapter] = {}
+
+
+def _validate_field(field_name: str, value: Any) -> Any:
+    """Validate one decoded field against its Blackboard annotation."""
+    adapter = _FIELD_ADAPTERS.get(field_name)
+    if adapter is None:
+        adapter = _FIELD_ADAPTERS[field_name] = TypeAdapter(
+            Blackboard.model_fields[field_name].annotation
+        )
+    return adapter.validate_python(value)
+
+
+def _row_to_blackboard(row: Mapping[str, Any], trusted: bool = True) -> Blackboard:
+    """
+    Build a Blackboard from a full blackboards row.
+
+    Args:
+        row: Database row with every blackboard column
+        trusted: Skip Pydantic validation (rows written by this service)
+
+    Returns:
+        Blackboard marked clean
+    """
+    data = {field_name: decode(row[column]) for field_name, (column, decode) in BLACKBOARD_DECODERS.items()}
+    blackboard = Blackboard.model_construct(**data) if trusted else Blackboard(**data)
+    blackboard.mark_clean()
+    return blackboard
+
+
+class BlackboardView:
+    """
+    Read-only blackboard row that decodes each field the first time it is read.
+
+    Raw column values are kept as loaded; reading a field deserializes (and for
+    untrusted rows validates) just that column. Callers that only need a few
+    fields (status, pdf_path, ...) never pay for parsing the large agent outputs.
+    """
+
+    def __init__(self, row: Mapping[str, Any], trusted: bool = True) -> None:
+        """
+        Initialize view.
+
+        Args:
+            row: Database row with the blackboard columns to expose
+            trusted: Skip validation of decoded fields (rows written by this service)
+        """
+        self._row = dict(row)
+        self._trusted = trusted
+        self._decoded: dict[str, Any] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        """Decode a blackboard field on first access."""
+        if name.startswith("_") or name not in BLACKBOARD_DECODERS:
+            raise AttributeError(f"{type(self).__name__} has no attribute {name!r}")
+
+        if name not in self._decoded:
+            column, decode = BLACKBOARD_DECODERS[name]
+            if column not in self._row:
+                raise AttributeError(f"Blackboard field {name!r} was not loaded into this view")
+
+            value = decode(self._row[column])
+            self._decoded[name] = value if self._trusted else _validate_field(name, value)
+
+        return self._decoded[name]
+
+    def to_blackboard(self) -> Blackboard:
+        """
+        Hydrate a full Blackboard (requires a view of every column).
+
+        Returns:
+            Blackboard marked clean
+        """
+        return _row_to_blackboard(self._row, self._trusted)
+
+    def materialize_complete_plan(self) -> Optional[dict[str, Any]]:
+        """
+        Get complete_plan with the referenced agent sections inlined.
+
+        Returns:
+            Full plan document, or None if the Documentation Agent has not run
+        """
+        return materialize_complete_plan(self.complete_plan, self)
+
+
 class BlackboardService:
     """Service for managing blackboard state in database with atomic operations."""
 
@@ -26,14 +202,14 @@ class BlackboardService:
 
     def _get_conn(self) -> sqlite3.Connection:
         """
-        Get database connection.
+        Get pooled database connection.
 
         Returns:
             SQLite connection
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        from ..api.database import get_db
+
+        return get_db()
 
     def create_blackboard(self, crisis_profile: dict) -> Blackboard:
         """
@@ -94,6 +270,7 @@ class BlackboardService:
             conn.commit()
             logger.info(f"Created blackboard for task_id={task_id}")
 
+            blackboard.mark_clean()
             return blackboard
 
         except sqlite3.IntegrityError as e:
@@ -102,12 +279,14 @@ class BlackboardService:
         finally:
             conn.close()
 
-    def get_blackboard(self, task_id: str) -> Optional[Blackboard]:
+    def get_blackboard(self, task_id: str, trusted: bool = True) -> Optional[Blackboard]:
         """
         Get blackboard by task_id.
 
         Args:
             task_id: Unique task identifier
+            trusted: Skip Pydantic validation of the row (it was written by this
+                service); pass False for rows that may have been edited externally
 
         Returns:
             Blackboard instance if found, None otherwise
@@ -126,103 +305,180 @@ class BlackboardService:
                 logger.warning(f"Blackboard not found for task_id={task_id}")
                 return None
 
-            # Convert row to dictionary
-            data = dict(row)
-
-            # Parse JSON fields
-            blackboard = Blackboard(
-                task_id=data['task_id'],
-                created_at=datetime.fromisoformat(data['created_at']),
-                updated_at=datetime.fromisoformat(data['updated_at']),
-                crisis_profile=json.loads(data['crisis_profile_json']) if data['crisis_profile_json'] else None,
-                risk_assessment=json.loads(data['risk_assessment_json']) if data['risk_assessment_json'] else None,
-                supply_plan=json.loads(data['supply_plan_json']) if data['supply_plan_json'] else None,
-                emergency_plan=json.loads(data['emergency_plan_json']) if data['emergency_plan_json'] else None,
-                economic_plan=json.loads(data['economic_plan_json']) if data['economic_plan_json'] else None,
-                resource_locations=json.loads(data['resource_locations_json']) if data['resource_locations_json'] else None,
-                video_recommendations=json.loads(data['video_recommendations_json']) if data['video_recommendations_json'] else None,
-                complete_plan=json.loads(data['complete_plan_json']) if data['complete_plan_json'] else None,
-                pdf_path=data['pdf_path'],
-                status=data['status'],
-                agents_completed=json.loads(data['agents_completed_json']) if data['agents_completed_json'] else [],
-                agents_failed=json.loads(data['agents_failed_json']) if data['agents_failed_json'] else [],
-                execution_start=datetime.fromisoformat(data['execution_start']) if data['execution_start'] else None,
-                execution_end=datetime.fromisoformat(data['execution_end']) if data['execution_end'] else None,
-                total_execution_seconds=data['total_execution_seconds'],
-                total_tokens_used=data['total_tokens_used'],
-                total_cost_estimate=data['total_cost_estimate'],
-                errors=json.loads(data['errors_json']) if data['errors_json'] else []
+            return _row_to_blackboard(row, trusted)
+
+        finally:
+            conn.close()
+
+    def get_view(
+        self,
+        task_id: str,
+        field_names: Optional[Iterable[str]] = None,
+        trusted: bool = True
+    ) -> Optional[BlackboardView]:
+        """
+        Get a lazily decoded, read-only view of a blackboard.
+
+        Args:
+            task_id: Unique task identifier
+            field_names: Fields to load (None loads every column; fields are
+                still only decoded when read)
+            trusted: Skip validation of decoded fields
+
+        Returns:
+            BlackboardView if found, None otherwise
+
+        Raises:
+            ValueError: If a field name is unknown
+        """
+        if field_names is None:
+            columns = "*"
+        else:
+            unknown = set(field_names) - BLACKBOARD_DECODERS.keys()
+            if unknown:
+                raise ValueError(f"Unknown blackboard fields: {sorted(unknown)}")
+            columns = ", ".join(
+                {BLACKBOARD_DECODERS[name][0]: None for name in ("task_id", *field_names)}
             )
 
-            return blackboard
+        conn = self._get_conn()
+
+        try:
+            row = conn.execute(
+                f"SELECT {columns} FROM blackboards WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        if not row:
+            logger.warning(f"Blackboard not found for task_id={task_id}")
+            return None
+
+        return BlackboardView(row, trusted)
+
+    def get_status(self, task_id: str) -> Optional[dict[str, Any]]:
+        """
+        Get the lightweight status projection of a blackboard for status polling.
+
+        Reads only the coordination columns and the task's agent log rows in a
+        single query, without loading or parsing any agent output.
+
+        Args:
+            task_id: Unique task identifier
+
+        Returns:
+            Dict with status, agents_completed, agents_failed, updated_at and the
+            agent log rows (ordered by start time), or None if not found
+        """
+        conn = self._get_conn()
+
+        try:
+            rows = conn.execute("""
+                SELECT
+                    b.status, b.agents_completed_json, b.agents_failed_json, b.updated_at,
+                    l.agent_name, l.agent_type, l.status AS agent_status,
+                    l.current_task_description, l.progress_percentage,
+                    l.started_at, l.completed_at, l.error_message
+                FROM blackboards AS b
+                LEFT JOIN agent_logs AS l ON l.task_id = b.task_id
+                WHERE b.task_id = ?
+                ORDER BY l.started_at
+            """, (task_id,)).fetchall()
 
         finally:
             conn.close()
 
+        if not rows:
+            return None
+
+        first = rows[0]
+        return {
+            "task_id": task_id,
+            "status": first['status'],
+            "agents_completed": _json_loads_list(first['agents_completed_json']),
+            "agents_failed": _json_loads_list(first['agents_failed_json']),
+            "updated_at": first['updated_at'],
+            "agents": [
+                {
+                    "agent_name": row['agent_name'],
+                    "agent_type": row['agent_type'],
+                    "status": row['agent_status'],
+                    "current_task_description": row['current_task_description'],
+                    "progress_percentage": row['progress_percentage'],
+                    "started_at": row['started_at'],
+                    "completed_at": row['completed_at'],
+                    "error_message": row['error_message']
+                }
+                for row in rows
+                if row['agent_name'] is not None
+            ]
+        }
+
     def update_blackboard(self, blackboard: Blackboard) -> None:
         """
         Update blackboard atomically in database.
 
+        Only fields changed since the blackboard was loaded or last saved are
+        written (see Blackboard.dirty_fields); nothing is written if none changed.
+
         Args:
             blackboard: Blackboard instance with updated state
 
         Raises:
             ValueError: If blackboard doesn't exist
         """
+        fields = [name for name in blackboard.dirty_fields() if name in BLACKBOARD_COLUMNS]
+        if not fields:
+            logger.debug(f"Blackboard for task_id={blackboard.task_id} unchanged, nothing to write")
+            return
+
+        self.update_fields(blackboard, fields)
+
+    def update_fields(self, blackboard: Blackboard, field_names: Iterable[str]) -> None:
+        """
+        Update only the given blackboard fields (plus updated_at) in the database.
+
+        Used to commit one agent's output as soon as it completes without
+        rewriting the (large) outputs of every other agent. The written fields
+        are marked clean; other changes stay pending.
+
+        Args:
+            blackboard: Blackboard instance with updated state
+            field_names: Blackboard fields to write (see BLACKBOARD_COLUMNS)
+
+        Raises:
+            ValueError: If blackboard doesn't exist or a field is not updatable
+        """
         blackboard.updated_at = datetime.utcnow()
 
+        # Keep canonical column order and drop duplicates
+        requested = set(field_names) | {"updated_at"}
+        unknown = requested - BLACKBOARD_COLUMNS.keys()
+        if unknown:
+            raise ValueError(f"Blackboard fields cannot be updated: {sorted(unknown)}")
+
+        fields = [name for name in BLACKBOARD_COLUMNS if name in requested]
+        assignments = ", ".join(f"{BLACKBOARD_COLUMNS[name][0]} = ?" for name in fields)
+        values = [BLACKBOARD_COLUMNS[name][1](getattr(blackboard, name)) for name in fields]
+
         conn = self._get_conn()
         cursor = conn.cursor()
 
         try:
-            cursor.execute("""
-                UPDATE blackboards SET
-                    updated_at = ?,
-                    risk_assessment_json = ?,
-                    supply_plan_json = ?,
-                    emergency_plan_json = ?,
-                    economic_plan_json = ?,
-                    resource_locations_json = ?,
-                    video_recommendations_json = ?,
-                    complete_plan_json = ?,
-                    pdf_path = ?,
-                    status = ?,
-                    agents_completed_json = ?,
-                    agents_failed_json = ?,
-                    execution_start = ?,
-                    execution_end = ?,
-                    total_execution_seconds = ?,
-                    total_tokens_used = ?,
-                    total_cost_estimate = ?,
-                    errors_json = ?
-                WHERE task_id = ?
-            """, (
-                blackboard.updated_at.isoformat(),
-                json.dumps(blackboard.risk_assessment) if blackboard.risk_assessment else None,
-                json.dumps(blackboard.supply_plan) if blackboard.supply_plan else None,
-                json.dumps(blackboard.emergency_plan) if blackboard.emergency_plan else None,
-                json.dumps(blackboard.economic_plan) if blackboard.economic_plan else None,
-                json.dumps(blackboard.resource_locations) if blackboard.resource_locations else None,
-                json.dumps(blackboard.video_recommendations) if blackboard.video_recommendations else None,
-                json.dumps(blackboard.complete_plan) if blackboard.complete_plan else None,
-                blackboard.pdf_path,
-                blackboard.status,
-                json.dumps(blackboard.agents_completed),
-                json.dumps(blackboard.agents_failed),
-                blackboard.execution_start.isoformat() if blackboard.execution_start else None,
-                blackboard.execution_end.isoformat() if blackboard.execution_end else None,
-                blackboard.total_execution_seconds,
-                blackboard.total_tokens_used,
-                blackboard.total_cost_estimate,
-                json.dumps(blackboard.errors),
-                blackboard.task_id
-            ))
+            cursor.execute(
+                f"UPDATE blackboards SET {assignments} WHERE task_id = ?",
+                (*values, blackboard.task_id)
+            )
 
             if cursor.rowcount == 0:
                 raise ValueError(f"Blackboard not found for task_id={blackboard.task_id}")
 
             conn.commit()
-            logger.info(f"Updated blackboard for task_id={blackboard.task_id}, status={blackboard.status}")
+            blackboard.mark_clean(fields)
+            logger.info(
+                f"Updated blackboard for task_id={blackboard.task_id}, status={blackboard.status}, "
+                f"columns={len(fields)}"
+            )
 
         finally:
             conn.close()
@@ -258,16 +514,16 @@ class BlackboardService:
         finally:
             conn.close()
 
-    def list_blackboards(self, status: Optional[str] = None, limit: int = 100) -> list[Blackboard]:
+    def _list_rows(self, status: Optional[str], limit: int) -> list[sqlite3.Row]:
         """
-        List blackboards, optionally filtered by status.
+        Load the most recently updated blackboard rows.
 
         Args:
-            status: Filter by status (initialized, processing, completed, failed)
-            limit: Maximum number of results
+            status: Filter by status (None for every status)
+            limit: Maximum number of rows
 
         Returns:
-            List of Blackboard instances
+            Full blackboards rows, newest first
         """
         conn = self._get_conn()
         cursor = conn.cursor()
@@ -287,41 +543,40 @@ class BlackboardService:
                     LIMIT ?
                 """, (limit,))
 
-            rows = cursor.fetchall()
-
-            blackboards = []
-            for row in rows:
-                data = dict(row)
-                blackboard = Blackboard(
-                    task_id=data['task_id'],
-                    created_at=datetime.fromisoformat(data['created_at']),
-                    updated_at=datetime.fromisoformat(data['updated_at']),
-                    crisis_profile=json.loads(data['crisis_profile_json']) if data['crisis_profile_json'] else None,
-                    risk_assessment=json.loads(data['risk_assessment_json']) if data['risk_assessment_json'] else None,
-                    supply_plan=json.loads(data['supply_plan_json']) if data['supply_plan_json'] else None,
-                    emergency_plan=json.loads(data['emergency_plan_json']) if data['emergency_plan_json'] else None,
-                    economic_plan=json.loads(data['economic_plan_json']) if data['economic_plan_json'] else None,
-                    resource_locations=json.loads(data['resource_locations_json']) if data['resource_locations_json'] else None,
-                    video_recommendations=json.loads(data['video_recommendations_json']) if data['video_recommendations_json'] else None,
-                    complete_plan=json.loads(data['complete_plan_json']) if data['complete_plan_json'] else None,
-                    pdf_path=data['pdf_path'],
-                    status=data['status'],
-                    agents_completed=json.loads(data['agents_completed_json']) if data['agents_completed_json'] else [],
-                    agents_failed=json.loads(data['agents_failed_json']) if data['agents_failed_json'] else [],
-                    execution_start=datetime.fromisoformat(data['execution_start']) if data['execution_start'] else None,
-                    execution_end=datetime.fromisoformat(data['execution_end']) if data['execution_end'] else None,
-                    total_execution_seconds=data['total_execution_seconds'],
-                    total_tokens_used=data['total_tokens_used'],
-                    total_cost_estimate=data['total_cost_estimate'],
-                    errors=json.loads(data['errors_json']) if data['errors_json'] else []
-                )
-                blackboards.append(blackboard)
-
-            return blackboards
+            return cursor.fetchall()
 
         finally:
             conn.close()
 
+    def list_blackboards(self, status: Optional[str] = None, limit: int = 100) -> list[Blackboard]:
+        """
+        List blackboards, optionally filtered by status.
+
+        Args:
+            status: Filter by status (initialized, processing, completed, failed)
+            limit: Maximum number of results
+
+        Returns:
+            List of Blackboard instances
+        """
+        return [_row_to_blackboard(row) for row in self._list_rows(status, limit)]
+
+    def list_views(self, status: Optional[str] = None, limit: int = 100) -> list[BlackboardView]:
+        """
+        List lazily decoded views of blackboards, optionally filtered by status.
+
+        Cheaper than list_blackboards() for listings that read a few fields of
+        each blackboard.
+
+        Args:
+            status: Filter by status (initialized, processing, completed, failed)
+            limit: Maximum number of results
+
+        Returns:
+            List of views (view.to_blackboard() hydrates one fully)
+        """
+        return [BlackboardView(row) for row in self._list_rows(status, limit)]
+
 
 # Singleton instance
 blackboard_service = BlackboardService()
@@ -1,32 +1,81 @@
 """Claude API client for PrepSmart."""
 
 import asyncio
-from typing import Optional
+import concurrent.futures
+import contextlib
+import threading
+import time
+from typing import Any, AsyncIterator, Optional
 
-from anthropic import Anthropic, AsyncAnthropic
+from anthropic import RateLimitError
 
 from ..utils.config import settings
 from ..utils.logger import setup_logger
+from .llm_backends import LLMBackend, create_backend, request_text
+from .output_budget import output_budget
+from .rate_limiter import rate_limiter
+from .request_policy import (
+    RequestPolicy,
+    first_token_tracker,
+    is_retryable,
+    latency_key,
+    latency_tracker,
+    request_metrics
+)
+from .response_cache import response_cache
 
 logger = setup_logger(__name__)
 
+# Latest Sonnet 4.5 (2025) - used for complex reasoning
+DEFAULT_MODEL = "claude-sonnet-4-5-20250929"
+
+# Claude 3.5 Haiku (latest available as of Oct 2024) - used for simple agents
+HAIKU_MODEL = "claude-3-5-haiku-20241022"
+
+
+class _FlightAbandoned(Exception):
+    """Raised to followers when the leader of a coalesced request gave up."""
+
 
 class ClaudeClient:
-    """Client for interacting with Claude API."""
+    """
+    Client for interacting with Claude API.
+
+    Instances are long-lived and safe to share across tasks: the underlying
+    Anthropic clients keep a keep-alive connection pool, so reusing one client
+    per model avoids a new TLS handshake for every plan.
 
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+    Async calls go through a RequestPolicy (retries with backoff, hedging),
+    so the SDK's own retries are disabled for the async clients. Identical
+    concurrent async requests, streamed or not, are coalesced into a single
+    API call. The API
+    calls themselves are made by an LLMBackend (the Anthropic API, or recorded
+    responses for load testing; see LLM_BACKEND).
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        policy: Optional[RequestPolicy] = None,
+        backend: Optional[LLMBackend] = None
+    ):
         """
         Initialize Claude client.
 
         Args:
             api_key: Anthropic API key (defaults to settings)
             model: Claude model to use (defaults to Sonnet 4.5)
+            policy: Retry/hedging policy for async calls (defaults to settings)
+            backend: Backend that sends requests (defaults to the one selected in settings)
         """
         self.api_key = api_key or settings.claude_api_key
-        self.client = Anthropic(api_key=self.api_key)
-        self.async_client = AsyncAnthropic(api_key=self.api_key)
-        self.model = model or "claude-sonnet-4-5-20250929"  # Latest Sonnet 4.5 (2025)
+        self.backend = backend or create_backend(self.api_key)
+        self.model = model or DEFAULT_MODEL
         self.max_tokens = 4096
+        self.policy = policy or RequestPolicy()
+        self._flights: dict[str, concurrent.futures.Future] = {}
+        self._flights_lock = threading.Lock()
 
     def generate(
         self,
@@ -50,33 +99,11 @@ class ClaudeClient:
         try:
             logger.info(f"Generating with Claude: prompt length={len(prompt)}")
 
-            # Build request parameters
-            params = {
-                "model": self.model,
-                "max_tokens": max_tokens or self.max_tokens,
-                "temperature": temperature,
-                "messages": [{"role": "user", "content": prompt}]
-            }
-
-            # Add system prompt if provided
-            if system:
-                params["system"] = system
-
-            response = self.client.messages.create(**params)
+            params = self._build_params(prompt, system, max_tokens, temperature)
+            response = self.backend.create(**params)
 
             text = response.content[0].text
-            tokens = response.usage.input_tokens + response.usage.output_tokens
-
-            # Estimate cost based on model
-            if "haiku" in self.model.lower():
-                # Claude Haiku 4.0 pricing: $0.25/MTok input, $1.25/MTok output
-                input_cost = (response.usage.input_tokens / 1_000_000) * 0.25
-                output_cost = (response.usage.output_tokens / 1_000_000) * 1.25
-            else:
-                # Claude Sonnet 4.5 pricing: $3/MTok input, $15/MTok output
-                input_cost = (response.usage.input_tokens / 1_000_000) * 3
-                output_cost = (response.usage.output_tokens / 1_000_000) * 15
-            cost = input_cost + output_cost
+            tokens, cost = self._account_usage(response.usage)
 
             logger.info(f"Claude response: {len(text)} chars, {tokens} tokens, ${cost:.4f}")
 
@@ -91,68 +118,939 @@ class ClaudeClient:
         prompt: str,
         system: str = "",
         max_tokens: Optional[int] = None,
-        temperature: float = 1.0
+        temperature: float = 1.0,
+        timeout: Optional[float] = None,
+        cache_ttl: int = 0,
+        priority: str = "normal",
+        prompt_prefix: str = "",
+        size_key: Optional[str] = None
     ) -> tuple[str, int, float]:
         """
         Generate text using Claude API (asynchronous).
 
+        Truncated responses (stop_reason "max_tokens") are retried once with a
+        larger budget; usage of both requests is reported.
+
         Args:
-            prompt: User prompt
+            prompt: User prompt (dynamic part)
             system: System prompt
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature (0-1)
+            timeout: Hard limit in seconds for the whole call (None for SDK default)
+            cache_ttl: Seconds to cache the response for (0 disables the response cache)
+            priority: Rate limiter priority class ("high", "normal" or "low")
+            prompt_prefix: Static start of the user prompt, sent before prompt and
+                marked for prompt caching
+            size_key: Call site whose observed output lengths size max_tokens
+                (None always uses max_tokens as given)
+
+        Returns:
+            Tuple of (response_text, tokens_used, cost_estimate); cache hits
+            report zero tokens and zero cost
+
+        Raises:
+            asyncio.TimeoutError: If the call does not finish within timeout
+        """
+        # Normalized request key shared by the response cache and single-flight table
+        request_key = response_cache.make_key(
+            self.model, system, prompt_prefix + prompt, max_tokens or self.max_tokens, temperature
+        )
+
+        cache_key = None
+        if cache_ttl > 0 and response_cache.enabled:
+            cache_key = request_key
+            cached = await response_cache.get_async(cache_key)
+            if cached is not None:
+                logger.info(f"Claude response cache hit: {len(cached)} chars, 0 tokens")
+                return cached, 0, 0.0
+
+        try:
+            logger.info(f"Generating async with Claude: prompt length={len(prompt_prefix) + len(prompt)}")
+
+            params = self._build_params(
+                prompt, system, self.max_tokens_for(max_tokens, size_key), temperature, prompt_prefix
+            )
+
+            if timeout is not None:
+                params["timeout"] = timeout
+                return await asyncio.wait_for(
+                    self._generate_coalesced(params, request_key, cache_key, cache_ttl, priority, size_key),
+                    timeout=timeout
+                )
+
+            return await self._generate_coalesced(
+                params, request_key, cache_key, cache_ttl, priority, size_key
+            )
+
+        except asyncio.TimeoutError:
+            # Without a timeout of our own, the caller's deadline or a joined flight expired
+            if timeout is None:
+                logger.warning("Claude API async call timed out")
+            else:
+                logger.warning(f"Claude API async call timed out after {timeout:.1f}s")
+            raise
+
+        except Exception as e:
+            logger.error(f"Claude API async error: {e}")
+            raise
+
+    async def _generate_coalesced(
+        self,
+        params: dict,
+        request_key: str,
+        cache_key: Optional[str],
+        cache_ttl: int,
+        priority: str = "normal",
+        size_key: Optional[str] = None
+    ) -> tuple[str, int, float]:
+        """
+        Generate a response, sharing one API call among identical concurrent requests.
+
+        The first caller for a request key becomes the leader and makes the call;
+        callers arriving while it is in flight await the leader's result. Followers
+        report zero tokens and zero cost, so usage is attributed to the leader only.
+        The flight table holds concurrent.futures.Future objects, so followers on
+        other runtime event loops can join too. If the leader is cancelled or hits
+        its own deadline, followers retry on their own instead of failing.
+
+        Args:
+            params: Request parameters for messages.create()
+            request_key: Normalized request key
+            cache_key: Response cache key (None if the response is not cached)
+            cache_ttl: Seconds to cache the response for
+            priority: Rate limiter priority class
+            size_key: Call site the output length is recorded for
 
         Returns:
             Tuple of (response_text, tokens_used, cost_estimate)
         """
+        if not settings.claude_single_flight_enabled:
+            return await self._generate_uncoalesced(params, cache_key, cache_ttl, priority, size_key)
+
+        while True:
+            is_leader, flight = self._join_flight(request_key)
+            if is_leader:
+                break
+
+            text = await self._await_flight(flight)
+            if text is not None:
+                return text, 0, 0.0
+
         try:
-            logger.info(f"Generating async with Claude: prompt length={len(prompt)}")
-
-            # Build request parameters
-            params = {
-                "model": self.model,
-                "max_tokens": max_tokens or self.max_tokens,
-                "temperature": temperature,
-                "messages": [{"role": "user", "content": prompt}]
-            }
-
-            # Add system prompt if provided
-            if system:
-                params["system"] = system
+            text, tokens, cost = await self._generate_uncoalesced(
+                params, cache_key, cache_ttl, priority, size_key
+            )
+        except BaseException as e:
+            self._land_flight(request_key, flight, error=e)
+            raise
 
-            response = await self.async_client.messages.create(**params)
+        self._land_flight(request_key, flight, text)
 
-            text = response.content[0].text
-            tokens = response.usage.input_tokens + response.usage.output_tokens
+        return text, tokens, cost
+
+    def _join_flight(self, request_key: str) -> tuple[bool, concurrent.futures.Future]:
+        """
+        Find the in-flight request for a key, or register this caller as its leader.
+
+        Args:
+            request_key: Normalized request key
+
+        Returns:
+            Tuple of (is_leader, flight future)
+        """
+        with self._flights_lock:
+            flight = self._flights.get(request_key)
+            if flight is not None:
+                return False, flight
+
+            flight = concurrent.futures.Future()
+            self._flights[request_key] = flight
+            return True, flight
+
+    async def _await_flight(self, flight: concurrent.futures.Future) -> Optional[str]:
+        """
+        Wait for the leader of an identical request as a follower.
+
+        Args:
+            flight: Flight future of the leader
+
+        Returns:
+            The leader's response text, or None if the leader gave up (the
+            follower should then try again, possibly as the new leader)
+        """
+        request_metrics.record_coalesced(self.model)
+        logger.info("Joining identical in-flight Claude request")
+
+        # Shield so a follower's own timeout never cancels the shared flight
+        try:
+            return await asyncio.shield(asyncio.wrap_future(flight))
+        except _FlightAbandoned:
+            return None
+
+    def _land_flight(
+        self,
+        request_key: str,
+        flight: concurrent.futures.Future,
+        text: Optional[str] = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        """
+        Hand the leader's outcome to its followers and close the flight.
+
+        Args:
+            request_key: Normalized request key
+            flight: Flight future of the leader
+            text: Response text on success
+            error: Exception the leader failed with
+        """
+        with self._flights_lock:
+            if self._flights.get(request_key) is flight:
+                del self._flights[request_key]
+
+        if flight.done():
+            return
 
-            # Estimate cost based on model
-            if "haiku" in self.model.lower():
-                # Claude Haiku 4.0 pricing: $0.25/MTok input, $1.25/MTok output
-                input_cost = (response.usage.input_tokens / 1_000_000) * 0.25
-                output_cost = (response.usage.output_tokens / 1_000_000) * 1.25
+        if error is None:
+            flight.set_result(text)
+        else:
+            # Cancellation or the leader's deadline must not fail the followers
+            abandoned = not isinstance(error, Exception) or isinstance(error, asyncio.TimeoutError)
+            flight.set_exception(_FlightAbandoned() if abandoned else error)
+
+    async def _generate_uncoalesced(
+        self,
+        params: dict,
+        cache_key: Optional[str],
+        cache_ttl: int,
+        priority: str = "normal",
+        size_key: Optional[str] = None
+    ) -> tuple[str, int, float]:
+        """
+        Make the API call for a request and compute its usage and cost.
+
+        Args:
+            params: Request parameters for messages.create()
+            cache_key: Response cache key (None if the response is not cached)
+            cache_ttl: Seconds to cache the response for
+            priority: Rate limiter priority class
+            size_key: Call site the output length is recorded for
+
+        Returns:
+            Tuple of (response_text, tokens_used, cost_estimate)
+        """
+        response = await self._create_with_retries(params, priority, size_key)
+        response, tokens, cost = await self._finish_response(params, response, priority, size_key)
+
+        text = response.content[0].text
+
+        logger.info(f"Claude async response: {len(text)} chars, {tokens} tokens, ${cost:.4f}")
+
+        # Truncated responses are usually unparseable JSON, so never cache them
+        if cache_key is not None and getattr(response, "stop_reason", None) != "max_tokens":
+            await response_cache.set_async(cache_key, self.model, text, cache_ttl)
+
+        return text, tokens, cost
+
+    def max_tokens_for(self, max_tokens: Optional[int], size_key: Optional[str]) -> int:
+        """
+        Get the max_tokens a request will be sent with.
+
+        Args:
+            max_tokens: Hand-set maximum tokens (None for the client default)
+            size_key: Call site whose observed output lengths size the budget
+
+        Returns:
+            Adaptive budget for the call site, or the hand-set value until
+            enough output lengths were observed
+        """
+        return output_budget.max_tokens_for(size_key, max_tokens or self.max_tokens)
+
+    def _record_output(self, response: Any, size_key: Optional[str]) -> bool:
+        """
+        Record a response's output length and whether it was truncated.
+
+        Args:
+            response: Anthropic Message response
+            size_key: Call site the output length is recorded for
+
+        Returns:
+            True if the response stopped at max_tokens
+        """
+        truncated = getattr(response, "stop_reason", None) == "max_tokens"
+        if truncated:
+            request_metrics.record_truncation(self.model)
+        output_budget.record(size_key, response.usage.output_tokens, truncated)
+        return truncated
+
+    async def _finish_response(
+        self,
+        params: dict,
+        response: Any,
+        priority: str = "normal",
+        size_key: Optional[str] = None
+    ) -> tuple[Any, int, float]:
+        """
+        Account a response's usage, retrying it once with a larger budget if truncated.
+
+        Args:
+            params: Request parameters the response was generated with
+            response: Anthropic Message response
+            priority: Rate limiter priority class
+            size_key: Call site the output length is recorded for
+
+        Returns:
+            Tuple of (final response, tokens_used, cost_estimate), with usage
+            summed over the truncated request and its retry
+        """
+        tokens, cost = self._account_usage(response.usage)
+
+        if not self._record_output(response, size_key) or not settings.claude_truncation_retry_enabled:
+            return response, tokens, cost
+
+        retry_max_tokens = output_budget.retry_max_tokens(params["max_tokens"])
+        if retry_max_tokens is None:
+            return response, tokens, cost
+
+        logger.warning(
+            f"Claude response truncated at {params['max_tokens']} tokens, "
+            f"retrying with max_tokens={retry_max_tokens}"
+        )
+        retry = await self._create_with_retries({**params, "max_tokens": retry_max_tokens}, priority, size_key)
+        retry_tokens, retry_cost = self._account_usage(retry.usage)
+        output_budget.record_retry(size_key, self._record_output(retry, size_key))
+
+        return retry, tokens + retry_tokens, cost + retry_cost
+
+    def _build_params(
+        self,
+        prompt: str,
+        system: str,
+        max_tokens: Optional[int],
+        temperature: float,
+        prompt_prefix: str = ""
+    ) -> dict:
+        """
+        Build Messages API request parameters.
+
+        With prompt caching enabled, the static part of the request (system prompt,
+        then prompt_prefix if given) is marked with a cache breakpoint, so repeat
+        calls read it from the provider's prompt cache. Prefixes shorter than the
+        model's minimum cacheable length are simply not cached.
+
+        Args:
+            prompt: User prompt (dynamic part)
+            system: System prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0-1)
+            prompt_prefix: Static start of the user prompt
+
+        Returns:
+            Request parameters for messages.create()/messages.stream()
+        """
+        caching = settings.claude_prompt_caching_enabled
+        cache_control = {"type": "ephemeral"}
+
+        params = {
+            "model": self.model,
+            "max_tokens": max_tokens or self.max_tokens,
+            "temperature": temperature,
+        }
+
+        # Add system prompt if provided (cached on its own when there is no prefix)
+        if system:
+            if caching and not prompt_prefix:
+                params["system"] = [{"type": "text", "text": system, "cache_control": cache_control}]
             else:
-                # Claude Sonnet 4.5 pricing: $3/MTok input, $15/MTok output
-                input_cost = (response.usage.input_tokens / 1_000_000) * 3
-                output_cost = (response.usage.output_tokens / 1_000_000) * 15
-            cost = input_cost + output_cost
+                params["system"] = system
 
-            logger.info(f"Claude async response: {len(text)} chars, {tokens} tokens, ${cost:.4f}")
+        if prompt_prefix:
+            prefix_block = {"type": "text", "text": prompt_prefix}
+            if caching:
+                # One breakpoint covers the system prompt and the prefix
+                prefix_block["cache_control"] = cache_control
+            content = [prefix_block, {"type": "text", "text": prompt}]
+        else:
+            content = prompt
 
-            return text, tokens, cost
+        params["messages"] = [{"role": "user", "content": content}]
+        return params
+
+    def _estimate_request_tokens(self, params: dict) -> int:
+        """
+        Estimate the tokens a request will consume for the rate limiter.
+
+        Args:
+            params: Request parameters
+
+        Returns:
+            Estimated token count
+        """
+        return rate_limiter.estimate_tokens(
+            request_text(params["messages"][0]["content"]),
+            request_text(params.get("system", "")),
+            params["max_tokens"]
+        )
+
+    @staticmethod
+    def _total_tokens(usage: Any) -> int:
+        """Total tokens of a response, including prompt cache reads and writes."""
+        return (
+            usage.input_tokens
+            + usage.output_tokens
+            + (getattr(usage, "cache_creation_input_tokens", None) or 0)
+            + (getattr(usage, "cache_read_input_tokens", None) or 0)
+        )
+
+    def _estimate_cost(self, usage: Any) -> float:
+        """
+        Estimate the cost of a response based on the model.
+
+        Prompt cache writes are billed at 1.25x and cache reads at 0.1x the
+        base input price.
+
+        Args:
+            usage: Anthropic usage object (input, output and cache token counts)
+
+        Returns:
+            Cost estimate in USD
+        """
+        if "haiku" in self.model.lower():
+            # Claude Haiku 4.0 pricing: $0.25/MTok input, $1.25/MTok output
+            input_price, output_price = 0.25, 1.25
+        else:
+            # Claude Sonnet 4.5 pricing: $3/MTok input, $15/MTok output
+            input_price, output_price = 3, 15
+
+        cache_write_tokens = getattr(usage, "cache_creation_input_tokens", None) or 0
+        cache_read_tokens = getattr(usage, "cache_read_input_tokens", None) or 0
+
+        input_cost = (usage.input_tokens / 1_000_000) * input_price
+        cache_cost = (
+            (cache_write_tokens / 1_000_000) * input_price * 1.25
+            + (cache_read_tokens / 1_000_000) * input_price * 0.1
+        )
+        output_cost = (usage.output_tokens / 1_000_000) * output_price
+        return input_cost + cache_cost + output_cost
+
+    def _account_usage(self, usage: Any) -> tuple[int, float]:
+        """
+        Compute a response's tokens and cost, and record its prompt cache usage.
+
+        Args:
+            usage: Anthropic usage object
+
+        Returns:
+            Tuple of (tokens_used, cost_estimate)
+        """
+        request_metrics.record_prompt_cache(
+            self.model,
+            getattr(usage, "cache_read_input_tokens", None) or 0,
+            getattr(usage, "cache_creation_input_tokens", None) or 0
+        )
+        return self._total_tokens(usage), self._estimate_cost(usage)
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        system: str = "",
+        max_tokens: Optional[int] = None,
+        temperature: float = 1.0,
+        cache_ttl: int = 0,
+        priority: str = "normal",
+        prompt_prefix: str = "",
+        size_key: Optional[str] = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Generate text using Claude API, yielding text as it is streamed.
+
+        Yields {"type": "text", "text": delta, "output_tokens": estimate} events
+        while the response streams in, then a single {"type": "final", "text",
+        "tokens_used", "cost", "stop_reason"} event. Output token counts in text
+        events are estimated (~4 chars/token); the final event has the real usage.
+
+        Errors before the first text event are retried like generate_async();
+        once text has been yielded, errors are raised to the caller. Wrap
+        iteration in asyncio.timeout() to bound the whole call.
+
+        Streams share the single-flight table with generate_async(): a stream that
+        joins an identical in-flight request (streamed or not) gets the leader's
+        text as one text event, with zero usage (stop_reason "coalesced"). The
+        wait for the first token is hedged (see _stream_hedged()).
+
+        A truncated stream (stop_reason "max_tokens") is retried once, unstreamed,
+        with a larger budget; the final event then carries the retry's text, which
+        replaces the streamed text.
+
+        Args:
+            prompt: User prompt (dynamic part)
+            system: System prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0-1)
+            cache_ttl: Seconds to cache the response for (0 disables the response cache)
+            priority: Rate limiter priority class ("high", "normal" or "low")
+            prompt_prefix: Static start of the user prompt, marked for prompt caching
+            size_key: Call site whose observed output lengths size max_tokens
+                (None always uses max_tokens as given)
+
+        Yields:
+            Text events followed by one final event
+        """
+        # Normalized request key shared by the response cache and single-flight table
+        request_key = response_cache.make_key(
+            self.model, system, prompt_prefix + prompt, max_tokens or self.max_tokens, temperature
+        )
+
+        cache_key = None
+        if cache_ttl > 0 and response_cache.enabled:
+            cache_key = request_key
+            cached = await response_cache.get_async(cache_key)
+            if cached is not None:
+                logger.info(f"Claude response cache hit: {len(cached)} chars, 0 tokens")
+                yield {"type": "text", "text": cached, "output_tokens": len(cached) // 4}
+                yield {"type": "final", "text": cached, "tokens_used": 0, "cost": 0.0, "stop_reason": "cache"}
+                return
+
+        params = self._build_params(
+            prompt, system, self.max_tokens_for(max_tokens, size_key), temperature, prompt_prefix
+        )
+
+        if not settings.claude_single_flight_enabled:
+            async with contextlib.aclosing(
+                self._stream_uncoalesced(params, cache_key, cache_ttl, priority, size_key)
+            ) as events:
+                async for event in events:
+                    yield event
+            return
+
+        while True:
+            is_leader, flight = self._join_flight(request_key)
+            if is_leader:
+                break
+
+            text = await self._await_flight(flight)
+            if text is not None:
+                yield {"type": "text", "text": text, "output_tokens": len(text) // 4}
+                yield {"type": "final", "text": text, "tokens_used": 0, "cost": 0.0, "stop_reason": "coalesced"}
+                return
+
+        try:
+            async with contextlib.aclosing(
+                self._stream_uncoalesced(params, cache_key, cache_ttl, priority, size_key)
+            ) as events:
+                async for event in events:
+                    # Release followers before the caller sees (and stops at) the final event
+                    if event["type"] == "final":
+                        self._land_flight(request_key, flight, event["text"])
+                    yield event
+        except BaseException as e:
+            self._land_flight(request_key, flight, error=e)
+            raise
+
+    async def _stream_uncoalesced(
+        self,
+        params: dict,
+        cache_key: Optional[str],
+        cache_ttl: int,
+        priority: str = "normal",
+        size_key: Optional[str] = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Stream the API call for a request, retrying failures before the first text.
+
+        Args:
+            params: Request parameters for messages.stream()
+            cache_key: Response cache key (None if the response is not cached)
+            cache_ttl: Seconds to cache the response for
+            priority: Rate limiter priority class
+            size_key: Call site the latencies and output length are recorded for
+
+        Yields:
+            Text events followed by one final event (see generate_stream())
+        """
+        logger.info(f"Streaming with Claude: prompt length={len(request_text(params['messages'][0]['content']))}")
+
+        attempt = 1
+        chunks: list[str] = []
+
+        while True:
+            try:
+                async with contextlib.aclosing(self._stream_hedged(params, attempt, priority, size_key)) as items:
+                    async for item in items:
+                        if isinstance(item, str):
+                            chunks.append(item)
+                            yield {
+                                "type": "text",
+                                "text": item,
+                                "output_tokens": sum(len(chunk) for chunk in chunks) // 4
+                            }
+                        else:
+                            response = item
+                break
+            except Exception as e:
+                # Text already handed to the caller cannot be taken back
+                if chunks or attempt > self.policy.max_retries or not is_retryable(e):
+                    logger.error(f"Claude API stream error: {e}")
+                    raise
+
+                delay = self.policy.backoff_delay(attempt, e)
+                request_metrics.record_retry(self.model)
+                logger.warning(
+                    f"Claude API {type(e).__name__} on stream attempt {attempt}, "
+                    f"retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+        final, tokens, cost = await self._finish_response(params, response, priority, size_key)
+        text = "".join(chunks) if final is response else final.content[0].text
+        stop_reason = getattr(final, "stop_reason", None)
+
+        logger.info(f"Claude stream response: {len(text)} chars, {tokens} tokens, ${cost:.4f}")
+
+        # Truncated responses are usually unparseable JSON, so never cache them
+        if cache_key is not None and stop_reason != "max_tokens":
+            await response_cache.set_async(cache_key, self.model, text, cache_ttl)
+
+        yield {"type": "final", "text": text, "tokens_used": tokens, "cost": cost, "stop_reason": stop_reason}
+
+    async def _stream_hedged(
+        self,
+        params: dict,
+        attempt: int,
+        priority: str = "normal",
+        size_key: Optional[str] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Stream one request attempt, hedging it if its first token is late.
+
+        A streaming caller waits on the first token, so a hedge stream is started
+        when no text arrived within the call site's p95 time to first token. The
+        stream that yields first is kept and the other one is cancelled. If the
+        primary stream fails before a hedge is sent, its error is raised
+        immediately so the retry policy can handle it. Hedges are sent at low
+        priority so they never take rate limit budget from primary traffic.
+
+        Each stream runs in its own task and hands its items over through a queue.
+        Latencies are recorded from the start of the primary stream.
+
+        Args:
+            params: Request parameters for messages.stream()
+            attempt: Retry attempt number (1 = first try)
+            priority: Rate limiter priority class of the primary stream
+            size_key: Call site whose latencies decide when to hedge
+
+        Yields:
+            Text deltas (str), then the final Anthropic Message
+        """
+        key = latency_key(self.model, size_key)
+        hedge_delay = self.policy.hedge_delay(self.model, first_token_tracker, size_key)
+        start_time = time.monotonic()
+
+        # First-item getter -> (stream task, its queue)
+        pending: dict[asyncio.Future, tuple[asyncio.Task, asyncio.Queue]] = {}
+        tasks: list[asyncio.Task] = []
+
+        def launch(hedge: bool, stream_priority: str) -> None:
+            queue: asyncio.Queue = asyncio.Queue()
+            task = asyncio.ensure_future(self._pump_stream(params, attempt, hedge, stream_priority, queue))
+            tasks.append(task)
+            pending[asyncio.ensure_future(queue.get())] = (task, queue)
+
+        launch(False, priority)
+        hedged = hedge_delay is None
+        errors: list[BaseException] = []
+        winner: Optional[tuple[asyncio.Queue, Any]] = None
+
+        try:
+            while winner is None:
+                if not pending:
+                    raise errors[0]
+
+                done, _ = await asyncio.wait(
+                    set(pending),
+                    timeout=None if hedged else hedge_delay,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for getter in done:
+                    _, queue = pending.pop(getter)
+                    item = getter.result()
+                    if isinstance(item, Exception):
+                        errors.append(item)
+                    elif winner is None:
+                        winner = (queue, item)
+
+                if winner is None and not hedged and not done:
+                    logger.info(
+                        f"Claude stream sent no text within {hedge_delay:.2f}s, sending hedge stream"
+                    )
+                    launch(True, "low")
+                hedged = True
 
+            # Only the winning stream keeps running
+            for getter, (task, _) in pending.items():
+                getter.cancel()
+                task.cancel()
+            pending.clear()
+
+            queue, item = winner
+            if isinstance(item, str):
+                first_token_tracker.record(key, time.monotonic() - start_time)
+
+            while isinstance(item, str):
+                yield item
+                item = await queue.get()
+
+            if isinstance(item, Exception):
+                raise item
+
+            latency_tracker.record(key, time.monotonic() - start_time)
+            yield item
+
+        finally:
+            for getter in pending:
+                getter.cancel()
+            for task in tasks:
+                task.cancel()
+
+    async def _pump_stream(
+        self,
+        params: dict,
+        attempt: int,
+        hedge: bool,
+        priority: str,
+        queue: asyncio.Queue
+    ) -> None:
+        """
+        Run one stream attempt, handing its items (or its error) to a queue.
+
+        Args:
+            params: Request parameters for messages.stream()
+            attempt: Retry attempt number (1 = first try)
+            hedge: Whether this is a hedge stream
+            priority: Rate limiter priority class
+            queue: Receives text deltas, then the final Message or the exception
+        """
+        try:
+            async with contextlib.aclosing(self._stream_attempt(params, attempt, hedge, priority)) as items:
+                async for item in items:
+                    queue.put_nowait(item)
         except Exception as e:
-            logger.error(f"Claude API async error: {e}")
+            queue.put_nowait(e)
+
+    async def _stream_attempt(
+        self,
+        params: dict,
+        attempt: int,
+        hedge: bool = False,
+        priority: str = "normal"
+    ) -> AsyncIterator[Any]:
+        """
+        Stream a single Messages API request within the rate limits and record its metrics.
+
+        Args:
+            params: Request parameters for messages.stream()
+            attempt: Retry attempt number (1 = first try)
+            hedge: Whether this is a hedge stream
+            priority: Rate limiter priority class
+
+        Yields:
+            Text deltas (str), then the final Anthropic Message
+        """
+        estimated_tokens = self._estimate_request_tokens(params)
+        await rate_limiter.acquire(self.model, estimated_tokens, priority)
+
+        start_time = time.monotonic()
+        first_token_seconds = None
+
+        try:
+            async with self.backend.stream(**params) as stream:
+                async for text in stream.text_stream:
+                    if first_token_seconds is None:
+                        first_token_seconds = time.monotonic() - start_time
+                    yield text
+                response = await stream.get_final_message()
+        except Exception as e:
+            rate_limiter.settle(self.model, estimated_tokens, 0)
+            if isinstance(e, RateLimitError):
+                rate_limiter.penalize(self.model)
+            request_metrics.record_attempt(
+                self.model, attempt, hedge, "error", time.monotonic() - start_time,
+                type(e).__name__, first_token_seconds
+            )
+            raise
+        except BaseException:
+            # Cancelled, or the caller stopped iterating
+            rate_limiter.settle(self.model, estimated_tokens, 0)
+            request_metrics.record_attempt(
+                self.model, attempt, hedge, "cancelled", time.monotonic() - start_time,
+                first_token_seconds=first_token_seconds
+            )
             raise
 
+        rate_limiter.settle(self.model, estimated_tokens, self._total_tokens(response.usage))
+        request_metrics.record_attempt(
+            self.model, attempt, hedge, "success", time.monotonic() - start_time,
+            first_token_seconds=first_token_seconds
+        )
+        yield response
+
+    async def _create_with_retries(
+        self,
+        params: dict,
+        priority: str = "normal",
+        size_key: Optional[str] = None
+    ) -> Any:
+        """
+        Send a Messages API request, retrying retryable errors with backoff.
+
+        Args:
+            params: Request parameters for messages.create()
+            priority: Rate limiter priority class
+            size_key: Call site whose latencies decide when to hedge
+
+        Returns:
+            Anthropic Message response
+
+        Raises:
+            Exception: The last error if all attempts fail or it is not retryable
+        """
+        attempt = 1
+
+        while True:
+            try:
+                return await self._create_hedged(params, attempt, priority, size_key)
+            except Exception as e:
+                if attempt > self.policy.max_retries or not is_retryable(e):
+                    raise
+
+                delay = self.policy.backoff_delay(attempt, e)
+                request_metrics.record_retry(self.model)
+                logger.warning(
+                    f"Claude API {type(e).__name__} on attempt {attempt}, "
+                    f"retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _create_hedged(
+        self,
+        params: dict,
+        attempt: int,
+        priority: str = "normal",
+        size_key: Optional[str] = None
+    ) -> Any:
+        """
+        Send one request attempt, hedging it if it runs past the call site's p95 latency.
+
+        The first successful response wins and any request still in flight is
+        cancelled. If the primary request fails before a hedge is sent, its error
+        is raised immediately so the retry policy can handle it. Hedges are sent
+        at low priority so they never take rate limit budget from primary traffic.
+
+        The latency recorded for the call site runs from the start of the primary
+        request, whichever request wins, so it measures what the caller waited
+        (a hedge's own, shorter latency would bias the p95 low).
+
+        Args:
+            params: Request parameters for messages.create()
+            attempt: Retry attempt number (1 = first try)
+            priority: Rate limiter priority class of the primary request
+            size_key: Call site whose latencies decide when to hedge
+
+        Returns:
+            Anthropic Message response
+
+        Raises:
+            Exception: The first error if every request in this attempt failed
+        """
+        hedge_delay = self.policy.hedge_delay(self.model, latency_tracker, size_key)
+        start_time = time.monotonic()
+        pending = {asyncio.ensure_future(self._timed_create(params, attempt, False, priority))}
+        hedged = hedge_delay is None
+        errors: list[BaseException] = []
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=None if hedged else hedge_delay,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    if task.exception() is None:
+                        latency_tracker.record(latency_key(self.model, size_key), time.monotonic() - start_time)
+                        return task.result()
+                    errors.append(task.exception())
+
+                if not hedged and not done:
+                    logger.info(
+                        f"Claude request exceeded {hedge_delay:.2f}s, sending hedge request"
+                    )
+                    pending.add(asyncio.ensure_future(self._timed_create(params, attempt, True, "low")))
+                hedged = True
+
+            raise errors[0]
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _timed_create(
+        self,
+        params: dict,
+        attempt: int,
+        hedge: bool,
+        priority: str = "normal"
+    ) -> Any:
+        """
+        Send a single Messages API request within the rate limits and record its metrics.
+
+        Args:
+            params: Request parameters for messages.create()
+            attempt: Retry attempt number (1 = first try)
+            hedge: Whether this is a hedge request
+            priority: Rate limiter priority class
+
+        Returns:
+            Anthropic Message response
+        """
+        estimated_tokens = self._estimate_request_tokens(params)
+        await rate_limiter.acquire(self.model, estimated_tokens, priority)
+
+        start_time = time.monotonic()
+
+        try:
+            response = await self.backend.create_async(**params)
+        except asyncio.CancelledError:
+            rate_limiter.settle(self.model, estimated_tokens, 0)
+            request_metrics.record_attempt(
+                self.model, attempt, hedge, "cancelled", time.monotonic() - start_time
+            )
+            raise
+        except Exception as e:
+            rate_limiter.settle(self.model, estimated_tokens, 0)
+            if isinstance(e, RateLimitError):
+                rate_limiter.penalize(self.model)
+            request_metrics.record_attempt(
+                self.model, attempt, hedge, "error", time.monotonic() - start_time, type(e).__name__
+            )
+            raise
+
+        rate_limiter.settle(self.model, estimated_tokens, self._total_tokens(response.usage))
+        request_metrics.record_attempt(self.model, attempt, hedge, "success", time.monotonic() - start_time)
+        return response
+
     def test_connection(self) -> bool:
         """
-        Test Claude API connection.
+        Test Claude API connection with a minimal request.
 
         Returns:
             True if connection successful
         """
         try:
-            response, _, _ = self.generate("Hello, Claude!", max_tokens=50)
+            response, _, _ = self.generate("Hello, Claude!", max_tokens=1)
             return len(response) > 0
         except Exception as e:
             logger.error(f"Claude connection test failed: {e}")
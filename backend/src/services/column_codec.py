@@ -0,0 +1,198 @@
+"""
+Column Codec: Transparent compression of large JSON columns.
+
+Agent outputs (supply plans, economic plans with full hardship letters, and the
+complete plan that repeats every section) are stored as JSON text and make up most
+of the database file. Values of at least min_bytes are stored zlib-compressed as a
+BLOB that starts with a format marker. Everything else, including rows written before
+compression was enabled, stays plain JSON text, so both formats are read back
+transparently.
+"""
+
+import threading
+import time
+import zlib
+from typing import Any, Optional, Union
+
+from ..utils.config import settings
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Format marker of compressed values (a NUL byte never starts JSON text)
+COMPRESSED_MARKER = b"\x00zlib1:"
+
+
+class ColumnCodec:
+    """Compresses large column values on write and decompresses them on read."""
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        min_bytes: Optional[int] = None,
+        level: Optional[int] = None
+    ) -> None:
+        """
+        Initialize codec (unset arguments default to settings).
+
+        Args:
+            enabled: Whether new values are compressed (reads always handle both formats)
+            min_bytes: Smallest encoded value worth compressing
+            level: zlib compression level (1 = fastest, 9 = smallest)
+        """
+        self.enabled = settings.blackboard_compression_enabled if enabled is None else enabled
+        self.min_bytes = settings.blackboard_compression_min_bytes if min_bytes is None else min_bytes
+        self.level = settings.blackboard_compression_level if level is None else level
+
+        self._lock = threading.Lock()
+        self._columns: dict[str, dict[str, int]] = {}
+        self._timing = {
+            "encode_seconds": 0.0,
+            "decode_seconds": 0.0,
+            "decompressed": 0
+        }
+
+    @staticmethod
+    def is_compressed(value: Any) -> bool:
+        """
+        Check whether a stored column value is compressed.
+
+        Args:
+            value: Value as read from the database
+
+        Returns:
+            True for BLOBs carrying the format marker
+        """
+        return isinstance(value, bytes) and value.startswith(COMPRESSED_MARKER)
+
+    def compress(self, text: str, force: bool = False) -> Union[str, bytes]:
+        """
+        Compress text if it is large enough (no statistics are recorded).
+
+        Args:
+            text: Encoded column value (JSON text)
+            force: Compress regardless of whether compression is enabled
+
+        Returns:
+            Compressed BLOB, or the text itself if it is too small or would not shrink
+        """
+        if not (self.enabled or force):
+            return text
+
+        raw = text.encode("utf-8")
+        if len(raw) < self.min_bytes:
+            return text
+
+        compressed = COMPRESSED_MARKER + zlib.compress(raw, self.level)
+        return compressed if len(compressed) < len(raw) else text
+
+    def decompress(self, value: Union[str, bytes]) -> str:
+        """
+        Turn a stored value back into text (no statistics are recorded).
+
+        Args:
+            value: Value as read from the database
+
+        Returns:
+            Column text
+        """
+        if self.is_compressed(value):
+            return zlib.decompress(value[len(COMPRESSED_MARKER):]).decode("utf-8")
+        if isinstance(value, bytes):
+            return value.decode("utf-8")
+        return value
+
+    def encode(self, text: Optional[str], column: str) -> Optional[Union[str, bytes]]:
+        """
+        Encode a column value for storage, recording size and time statistics.
+
+        Args:
+            text: Column text (None for NULL)
+            column: Database column name (statistics are kept per column)
+
+        Returns:
+            Value to store
+        """
+        if text is None:
+            return None
+
+        start_time = time.perf_counter()
+        value = self.compress(text)
+        elapsed = time.perf_counter() - start_time
+
+        raw_bytes = len(text.encode("utf-8"))
+        stored_bytes = len(value) if self.is_compressed(value) else raw_bytes
+        with self._lock:
+            stats = self._columns.setdefault(
+                column, {"writes": 0, "compressed": 0, "raw_bytes": 0, "stored_bytes": 0}
+            )
+            stats["writes"] += 1
+            stats["raw_bytes"] += raw_bytes
+            stats["stored_bytes"] += stored_bytes
+            if self.is_compressed(value):
+                stats["compressed"] += 1
+            self._timing["encode_seconds"] += elapsed
+
+        return value
+
+    def decode(self, value: Optional[Union[str, bytes]]) -> Optional[str]:
+        """
+        Decode a stored column value, recording time statistics.
+
+        Args:
+            value: Value as read from the database (None for NULL)
+
+        Returns:
+            Column text, or None
+        """
+        if value is None:
+            return None
+
+        if not self.is_compressed(value):
+            return self.decompress(value)
+
+        start_time = time.perf_counter()
+        text = self.decompress(value)
+        elapsed = time.perf_counter() - start_time
+
+        with self._lock:
+            self._timing["decompressed"] += 1
+            self._timing["decode_seconds"] += elapsed
+
+        return text
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get compression statistics for values written and read by this process.
+
+        Returns:
+            Dict with per-column sizes and savings, and encode/decode time
+        """
+        with self._lock:
+            columns = {column: dict(stats) for column, stats in self._columns.items()}
+            timing = dict(self._timing)
+
+        for stats in columns.values():
+            stats["saved_percent"] = (
+                round(100 * (1 - stats["stored_bytes"] / stats["raw_bytes"]), 1)
+                if stats["raw_bytes"] else 0.0
+            )
+
+        writes = sum(stats["writes"] for stats in columns.values())
+        return {
+            "enabled": self.enabled,
+            "min_bytes": self.min_bytes,
+            "columns": columns,
+            "raw_bytes": sum(stats["raw_bytes"] for stats in columns.values()),
+            "stored_bytes": sum(stats["stored_bytes"] for stats in columns.values()),
+            "avg_encode_ms": round(1000 * timing["encode_seconds"] / writes, 3) if writes else 0.0,
+            "decompressed": timing["decompressed"],
+            "avg_decompress_ms": (
+                round(1000 * timing["decode_seconds"] / timing["decompressed"], 3)
+                if timing["decompressed"] else 0.0
+            )
+        }
+
+
+# Singleton instance
+column_codec = ColumnCodec()
@@ -0,0 +1,260 @@
+"""
+Health Monitor: Background prober behind the liveness and readiness endpoints.
+
+Load balancer and container health checks hit the API every few seconds. Instead of
+probing dependencies on each request (a live Claude call per probe used to be one of
+the steadiest sources of token spend), a daemon thread refreshes a snapshot on a slow
+interval and the endpoints only read it.
+
+Claude health is derived from the outcomes of real requests in a recent window. A
+live Claude call is only made when there has been no Claude traffic for a long time,
+so an idle instance still notices an expired key or an outage. Readiness only
+depends on local dependencies (the database): a Claude outage is reported in the
+snapshot but never takes instances out of rotation, since status, result and PDF
+requests only need SQLite.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+from ..utils.config import settings
+from ..utils.logger import setup_logger
+from .job_queue import job_queue
+from .request_policy import request_metrics
+
+logger = setup_logger(__name__)
+
+# Share of failed attempts in the error window above which Claude counts as degraded
+DEGRADED_ERROR_RATE = 0.5
+
+# Failed attempts (with no successes) in the error window before Claude counts as down
+MIN_DOWN_ATTEMPTS = 5
+
+
+class HealthMonitor:
+    """Periodically probes dependencies and caches the result for health endpoints."""
+
+    def __init__(
+        self,
+        probe_interval: Optional[float] = None,
+        claude_probe_interval: Optional[float] = None,
+        error_window: Optional[float] = None
+    ) -> None:
+        """
+        Initialize monitor (unset arguments default to settings).
+
+        Args:
+            probe_interval: Seconds between snapshot refreshes
+            claude_probe_interval: Idle seconds before a live Claude call is made (0 disables)
+            error_window: Seconds of request history used for Claude error rates
+        """
+        self.probe_interval = (
+            settings.health_probe_interval_seconds if probe_interval is None else probe_interval
+        )
+        self.claude_probe_interval = (
+            settings.health_claude_probe_interval_seconds
+            if claude_probe_interval is None else claude_probe_interval
+        )
+        self.error_window = (
+            settings.health_error_window_seconds if error_window is None else error_window
+        )
+
+        self._claude_client: Any = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._snapshot: Optional[dict[str, Any]] = None
+        self._last_live_probe: Optional[tuple[float, bool]] = None  # (time, success)
+        self.started_at = time.time()
+
+    def start(self, claude_client: Any) -> None:
+        """
+        Take an initial snapshot and start the background prober (idempotent).
+
+        Args:
+            claude_client: ClaudeClient used for the occasional live probe
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._claude_client = claude_client
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._probe_loop, name="health-monitor", daemon=True
+            )
+
+        # The first snapshot never makes a live Claude call, so startup stays fast
+        self.refresh(allow_live_probe=False)
+        self._thread.start()
+
+        logger.info(f"Health monitor started: probing every {self.probe_interval:.0f}s")
+
+    def stop(self) -> None:
+        """Stop the background prober."""
+        self._stopped.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def _probe_loop(self) -> None:
+        """Refresh the snapshot until stopped."""
+        while not self._stopped.wait(timeout=self.probe_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Health probe failed: {e}", exc_info=True)
+
+    def _probe_database(self) -> dict[str, Any]:
+        """
+        Check the database with a trivial query.
+
+        Returns:
+            Dict with status and latency_ms
+        """
+        from ..api.database import get_db
+
+        start_time = time.monotonic()
+        try:
+            conn = get_db()
+            try:
+                conn.execute("SELECT 1")
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Database health probe failed: {e}")
+            return {"status": "down", "error": str(e)}
+
+        return {"status": "up", "latency_ms": round((time.monotonic() - start_time) * 1000, 2)}
+
+    def _probe_queue(self) -> dict[str, Any]:
+        """
+        Read plan job queue depth.
+
+        Returns:
+            Dict with queued/running counts
+        """
+        try:
+            counts = job_queue.get_stats()
+        except Exception as e:
+            logger.error(f"Job queue health probe failed: {e}")
+            return {"status": "unknown", "error": str(e)}
+
+        return {
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "max_queued": job_queue.max_queued,
+            "max_concurrent": job_queue.max_concurrent
+        }
+
+    def _probe_claude(self, allow_live_probe: bool) -> dict[str, Any]:
+        """
+        Assess Claude availability from recent request outcomes.
+
+        Args:
+            allow_live_probe: Whether an idle instance may make a live Claude call
+
+        Returns:
+            Dict with status, source and per-model recent error rates
+        """
+        recent = request_metrics.recent_error_rates(self.error_window)
+        attempts = sum(stats["attempts"] for stats in recent.values())
+
+        if attempts:
+            errors = sum(stats["errors"] for stats in recent.values())
+            error_rate = errors / attempts
+            if errors == attempts and attempts >= MIN_DOWN_ATTEMPTS:
+                status = "down"
+            elif error_rate >= DEGRADED_ERROR_RATE:
+                status = "degraded"
+            else:
+                status = "up"
+            return {
+                "status": status,
+                "source": "recent_requests",
+                "error_rate": round(error_rate, 3),
+                "models": recent
+            }
+
+        if allow_live_probe and self._claude_client is not None and self.claude_probe_interval > 0:
+            idle = not request_metrics.recent_error_rates(self.claude_probe_interval)
+            due = (
+                self._last_live_probe is None
+                or time.time() - self._last_live_probe[0] >= self.claude_probe_interval
+            )
+            if idle and due:
+                logger.info("No recent Claude traffic, making a live health probe")
+                self._last_live_probe = (time.time(), self._claude_client.test_connection())
+
+        if self._last_live_probe is None:
+            return {"status": "unknown", "source": "none", "models": {}}
+
+        probed_at, success = self._last_live_probe
+        return {
+            "status": "up" if success else "down",
+            "source": "live_probe",
+            "probe_age_seconds": round(time.time() - probed_at, 1),
+            "models": {}
+        }
+
+    def refresh(self, allow_live_probe: bool = True) -> dict[str, Any]:
+        """
+        Probe all dependencies and replace the cached snapshot.
+
+        Args:
+            allow_live_probe: Whether an idle instance may make a live Claude call
+
+        Returns:
+            New snapshot
+        """
+        database = self._probe_database()
+        claude = self._probe_claude(allow_live_probe)
+
+        snapshot = {
+            # Claude health is informational: the API keeps serving what only needs SQLite
+            "ready": database["status"] == "up",
+            "checked_at": datetime.utcnow().isoformat() + "Z",
+            "checked_at_epoch": time.time(),
+            "dependencies": {
+                "database": database,
+                "claude_api": claude,
+                "job_queue": self._probe_queue()
+            }
+        }
+
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def get_snapshot(self) -> dict[str, Any]:
+        """
+        Get the most recent snapshot (taken synchronously if none exists yet).
+
+        Returns:
+            Dict with ready flag, check time, snapshot age and dependency details
+        """
+        with self._lock:
+            snapshot = self._snapshot
+
+        if snapshot is None:
+            snapshot = self.refresh(allow_live_probe=False)
+
+        return {
+            **{key: value for key, value in snapshot.items() if key != "checked_at_epoch"},
+            "age_seconds": round(time.time() - snapshot["checked_at_epoch"], 1)
+        }
+
+    def uptime_seconds(self) -> float:
+        """
+        Get seconds since this process created the monitor.
+
+        Returns:
+            Process uptime in seconds
+        """
+        return time.time() - self.started_at
+
+
+# Singleton instance
+health_monitor = HealthMonitor()
@@ -0,0 +1,449 @@
+"""
+Job Queue: Bounded, SQLite-backed queue for crisis plan generation.
+
+Plan requests are persisted in the plan_jobs table and executed by a fixed pool of
+worker threads. Claiming a job and checking the number of running jobs happen in a
+single write transaction, so max_concurrent_tasks is enforced across every process
+sharing the database (e.g. all gunicorn workers), not just within one process.
+
+Running jobs hold a lease that their process renews while the job is alive. If a
+worker process dies (e.g. a gunicorn restart during a deploy), the lease expires and
+the job is claimed again and resumed from its persisted blackboard state.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from ..utils.config import settings
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has reached max_queued_tasks."""
+
+    def __init__(self, queued: int, limit: int):
+        """
+        Initialize error.
+
+        Args:
+            queued: Number of jobs currently waiting
+            limit: Configured maximum number of waiting jobs
+        """
+        super().__init__(f"Job queue is full ({queued}/{limit} plans waiting)")
+        self.queued = queued
+        self.limit = limit
+
+
+class JobQueue:
+    """Persistent job queue with admission control and a bounded worker pool."""
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        max_queued: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[int] = None,
+        max_attempts: Optional[int] = None
+    ) -> None:
+        """
+        Initialize job queue.
+
+        Args:
+            max_concurrent: Maximum running jobs across all processes (defaults to settings)
+            max_queued: Maximum waiting jobs before enqueue is rejected (defaults to settings)
+            poll_interval: Seconds between checks for jobs enqueued by other processes
+            lease_seconds: Seconds a running job stays claimed without a heartbeat
+            max_attempts: Maximum times a job is started before it is abandoned
+        """
+        self.max_concurrent = max_concurrent or settings.max_concurrent_tasks
+        self.max_queued = max_queued or settings.max_queued_tasks
+        self.poll_interval = poll_interval or settings.job_poll_interval_seconds
+        self.lease_seconds = lease_seconds or settings.job_lease_seconds
+        self.max_attempts = max_attempts or settings.max_job_attempts
+        self.worker_prefix = uuid.uuid4().hex[:8]
+
+        self._handler: Optional[Callable[[dict[str, Any], int], None]] = None
+        self._workers: list[threading.Thread] = []
+        self._active: set[str] = set()
+        self._wakeup = threading.Condition()
+        self._stopped = threading.Event()
+        self._stopping = False
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """
+        Get database connection in autocommit mode for explicit transactions.
+
+        Returns:
+            SQLite connection
+        """
+        from ..api.database import get_db
+
+        conn = get_db()
+        conn.isolation_level = None
+        return conn
+
+    def start(self, handler: Callable[[dict[str, Any], int], None]) -> None:
+        """
+        Start the worker pool and lease heartbeat (idempotent).
+
+        Args:
+            handler: Blocking callable that generates a plan from a job payload;
+                also receives the attempt number (> 1 when resuming an orphaned job)
+        """
+        with self._wakeup:
+            if self._workers:
+                return
+
+            self._handler = handler
+            self._stopping = False
+            self._stopped.clear()
+
+            for i in range(self.max_concurrent):
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    args=(f"{self.worker_prefix}-{i}",),
+                    name=f"plan-worker-{i}",
+                    daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+
+            heartbeat = threading.Thread(
+                target=self._heartbeat_loop,
+                name="plan-lease-heartbeat",
+                daemon=True
+            )
+            heartbeat.start()
+            self._workers.append(heartbeat)
+
+        logger.info(
+            f"Job queue started: {self.max_concurrent} workers, "
+            f"max {self.max_queued} queued plans"
+        )
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the worker pool after running jobs finish.
+
+        Args:
+            timeout: Maximum seconds to wait for each worker
+        """
+        with self._wakeup:
+            self._stopping = True
+            self._stopped.set()
+            self._wakeup.notify_all()
+
+        for worker in self._workers:
+            worker.join(timeout)
+
+        self._workers = []
+
+    def enqueue(self, task_id: str, payload: dict[str, Any]) -> int:
+        """
+        Add a plan generation job to the queue.
+
+        Args:
+            task_id: Crisis plan task ID
+            payload: JSON-serializable job payload (crisis profile)
+
+        Returns:
+            1-based position of the job in the queue
+
+        Raises:
+            QueueFullError: If max_queued_tasks jobs are already waiting
+        """
+        conn = self._get_conn()
+
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+
+            queued = conn.execute(
+                "SELECT COUNT(*) FROM plan_jobs WHERE status = 'queued'"
+            ).fetchone()[0]
+
+            if queued >= self.max_queued:
+                conn.execute("ROLLBACK")
+                raise QueueFullError(queued, self.max_queued)
+
+            conn.execute("""
+                INSERT INTO plan_jobs (task_id, status, payload_json, enqueued_at)
+                VALUES (?, 'queued', ?, ?)
+            """, (task_id, json.dumps(payload, default=str), datetime.utcnow().isoformat()))
+
+            conn.execute("COMMIT")
+
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        with self._wakeup:
+            self._wakeup.notify()
+
+        logger.info(f"Enqueued plan job task_id={task_id} (queue depth={queued + 1})")
+
+        return queued + 1
+
+    def get_position(self, task_id: str) -> Optional[int]:
+        """
+        Get the queue position of a waiting job.
+
+        Args:
+            task_id: Crisis plan task ID
+
+        Returns:
+            1-based position if the job is still waiting, None otherwise
+        """
+        conn = self._get_conn()
+
+        try:
+            row = conn.execute("""
+                SELECT COUNT(*) FROM plan_jobs AS other, plan_jobs AS job
+                WHERE job.task_id = ? AND job.status = 'queued'
+                  AND other.status = 'queued'
+                  AND (other.enqueued_at < job.enqueued_at
+                       OR (other.enqueued_at = job.enqueued_at AND other.rowid <= job.rowid))
+            """, (task_id,)).fetchone()
+
+            return row[0] or None
+
+        finally:
+            conn.close()
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Get job counts by status.
+
+        Returns:
+            Dict of status -> job count
+        """
+        conn = self._get_conn()
+
+        try:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) FROM plan_jobs GROUP BY status"
+            ).fetchall()
+            return {row[0]: row[1] for row in rows}
+
+        finally:
+            conn.close()
+
+    def _claim_next(self, worker_id: str) -> Optional[tuple[str, dict[str, Any], int]]:
+        """
+        Atomically claim the oldest runnable job if a concurrency slot is free.
+
+        Runnable jobs are queued jobs and running jobs whose lease has expired
+        (orphaned by a dead worker process). Orphaned jobs that already used all
+        their attempts are abandoned instead.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+
+        Returns:
+            Tuple of (task_id, payload, attempt) or None if nothing can be claimed
+        """
+        conn = self._get_conn()
+        abandoned: list[str] = []
+        now = time.time()
+
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+
+            abandoned = [row[0] for row in conn.execute("""
+                SELECT task_id FROM plan_jobs
+                WHERE status = 'running' AND COALESCE(lease_expires_at, 0) < ?
+                  AND attempts >= ?
+            """, (now, self.max_attempts))]
+
+            if abandoned:
+                conn.executemany("""
+                    UPDATE plan_jobs SET
+                        status = 'failed',
+                        finished_at = ?,
+                        error_message = ?
+                    WHERE task_id = ?
+                """, [
+                    (datetime.utcnow().isoformat(),
+                     f"Abandoned after {self.max_attempts} attempts", task_id)
+                    for task_id in abandoned
+                ])
+
+            running = conn.execute("""
+                SELECT COUNT(*) FROM plan_jobs
+                WHERE status = 'running' AND lease_expires_at >= ?
+            """, (now,)).fetchone()[0]
+
+            row = None
+            if running < self.max_concurrent:
+                row = conn.execute("""
+                    SELECT task_id, payload_json, status, attempts FROM plan_jobs
+                    WHERE status = 'queued'
+                       OR (status = 'running' AND COALESCE(lease_expires_at, 0) < ?)
+                    ORDER BY enqueued_at, rowid
+                    LIMIT 1
+                """, (now,)).fetchone()
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute("""
+                UPDATE plan_jobs SET
+                    status = 'running',
+                    started_at = ?,
+                    worker_id = ?,
+                    lease_expires_at = ?,
+                    attempts = attempts + 1
+                WHERE task_id = ?
+            """, (datetime.utcnow().isoformat(), worker_id, now + self.lease_seconds, row[0]))
+
+            conn.execute("COMMIT")
+
+            if row[2] == 'running':
+                logger.warning(
+                    f"Reclaimed orphaned plan job task_id={row[0]} "
+                    f"(attempt {row[3] + 1}/{self.max_attempts})"
+                )
+
+            with self._wakeup:
+                self._active.add(row[0])
+
+            return row[0], json.loads(row[1]), row[3] + 1
+
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.error(f"Failed to claim plan job: {e}")
+            # Rolled back, so those jobs were not abandoned after all
+            abandoned = []
+            return None
+        finally:
+            conn.close()
+            for task_id in abandoned:
+                self._fail_abandoned_plan(task_id)
+
+    def _fail_abandoned_plan(self, task_id: str) -> None:
+        """
+        Mark the blackboard of an abandoned job as failed so /status stops polling.
+
+        Args:
+            task_id: Crisis plan task ID
+        """
+        from .blackboard_service import blackboard_service
+
+        logger.error(f"Abandoning plan job task_id={task_id} after {self.max_attempts} attempts")
+
+        try:
+            blackboard = blackboard_service.get_blackboard(task_id)
+            if blackboard and blackboard.status not in ("completed", "failed"):
+                blackboard.status = "failed"
+                blackboard.errors.append({
+                    "message": f"Plan generation abandoned after {self.max_attempts} attempts",
+                    "timestamp": datetime.utcnow().isoformat()
+                })
+                blackboard_service.update_blackboard(blackboard)
+        except Exception as e:
+            logger.error(f"Failed to mark abandoned plan as failed for task_id={task_id}: {e}")
+
+    def _renew_leases(self) -> None:
+        """Extend the lease of every job this process is currently running."""
+        with self._wakeup:
+            active = list(self._active)
+
+        if not active:
+            return
+
+        conn = self._get_conn()
+
+        try:
+            conn.executemany("""
+                UPDATE plan_jobs SET lease_expires_at = ?
+                WHERE task_id = ? AND status = 'running' AND worker_id LIKE ?
+            """, [
+                (time.time() + self.lease_seconds, task_id, f"{self.worker_prefix}-%")
+                for task_id in active
+            ])
+        except sqlite3.Error as e:
+            logger.error(f"Failed to renew plan job leases: {e}")
+        finally:
+            conn.close()
+
+    def _heartbeat_loop(self) -> None:
+        """Renew leases of running jobs until the queue is stopped."""
+        while not self._stopped.wait(timeout=self.lease_seconds / 3):
+            self._renew_leases()
+
+    def _finish(self, task_id: str, status: str, error_message: Optional[str] = None) -> None:
+        """
+        Record the final status of a job.
+
+        Args:
+            task_id: Crisis plan task ID
+            status: Final job status (done/failed)
+            error_message: Error description for failed jobs
+        """
+        try:
+            conn = self._get_conn()
+            try:
+                conn.execute("""
+                    UPDATE plan_jobs SET
+                        status = ?,
+                        finished_at = ?,
+                        error_message = ?
+                    WHERE task_id = ?
+                """, (status, datetime.utcnow().isoformat(), error_message, task_id))
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            # The lease is no longer renewed, so the job is reclaimed once it expires
+            logger.error(f"Failed to record {status} status of plan job task_id={task_id}: {e}")
+        finally:
+            # A slot was freed: let an idle worker claim the next job
+            with self._wakeup:
+                self._active.discard(task_id)
+                self._wakeup.notify()
+
+    def _worker_loop(self, worker_id: str) -> None:
+        """
+        Claim and run jobs until the queue is stopped.
+
+        Args:
+            worker_id: Identifier of this worker
+        """
+        while not self._stopping:
+            try:
+                job = self._claim_next(worker_id)
+            except Exception as e:
+                # Never let one bad claim end the worker thread
+                logger.error(f"Worker {worker_id} failed to claim a plan job: {e}", exc_info=True)
+                job = None
+
+            if job is None:
+                with self._wakeup:
+                    if not self._stopping:
+                        self._wakeup.wait(timeout=self.poll_interval)
+                continue
+
+            task_id, payload, attempt = job
+            logger.info(f"Worker {worker_id} running plan job task_id={task_id} (attempt {attempt})")
+
+            try:
+                self._handler(payload, attempt)
+            except Exception as e:
+                logger.error(f"Plan job failed for task_id={task_id}: {e}", exc_info=True)
+                self._finish(task_id, "failed", str(e))
+            else:
+                self._finish(task_id, "done")
+
+
+# Singleton instance
+job_queue = JobQueue()
@@ -0,0 +1,542 @@
+"""
+LLM Backends: Where ClaudeClient sends its Messages API requests.
+
+ClaudeClient keeps the request policy (retries, hedging, rate limits, caching) and
+hands each API call to a backend:
+
+- AnthropicBackend: the real Anthropic API.
+- ReplayBackend: serves recorded responses locally with injected latency and
+  errors, so the coordinator, database and PDF paths can be load tested without
+  network access or API spend.
+- RecordingBackend: wraps another backend and appends every response to a
+  recordings file for later replay.
+
+Recordings are JSON lines keyed by prompt fingerprints. A replayed request uses the
+recording for the exact (system, prompt) pair when there is one, otherwise any
+recording with the same system prompt (each agent call type has its own system
+prompt), so one recorded plan per agent is enough to replay plans for any input.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+import weakref
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+from anthropic import Anthropic, APIStatusError, AsyncAnthropic, InternalServerError, RateLimitError
+from anthropic.types import Message, TextBlock, Usage
+
+from ..utils.config import settings
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def request_text(value: Any) -> str:
+    """Get the plain text of a system prompt or message content (str or text blocks)."""
+    if isinstance(value, str):
+        return value
+    return "".join(block.get("text", "") for block in value)
+
+
+def fingerprint(text: str) -> str:
+    """
+    Fingerprint prompt text (whitespace-normalized).
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        Short hex digest
+    """
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()[:16]
+
+
+def request_fingerprints(params: dict) -> tuple[str, str]:
+    """
+    Fingerprint a Messages API request.
+
+    Args:
+        params: Request parameters
+
+    Returns:
+        Tuple of (system fingerprint, prompt fingerprint)
+    """
+    system = request_text(params.get("system", ""))
+    prompt = request_text(params["messages"][0]["content"])
+    return fingerprint(system), fingerprint(system + "\n" + prompt)
+
+
+class LLMBackend(ABC):
+    """Interface for sending Messages API requests."""
+
+    name = "base"
+
+    @abstractmethod
+    def create(self, **params: Any) -> Message:
+        """
+        Send a request and wait for the complete response (synchronous).
+
+        Args:
+            **params: Messages API request parameters
+
+        Returns:
+            Message response
+        """
+
+    @abstractmethod
+    async def create_async(self, **params: Any) -> Message:
+        """
+        Send a request and wait for the complete response.
+
+        Args:
+            **params: Messages API request parameters
+
+        Returns:
+            Message response
+        """
+
+    @abstractmethod
+    def stream(self, **params: Any) -> Any:
+        """
+        Send a streaming request.
+
+        Args:
+            **params: Messages API request parameters
+
+        Returns:
+            Async context manager yielding a stream with an async `text_stream`
+            iterator and an async `get_final_message()` method
+        """
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get backend statistics.
+
+        Returns:
+            Dict with the backend name
+        """
+        return {"backend": self.name}
+
+
+class AnthropicBackend(LLMBackend):
+    """Backend that calls the Anthropic API."""
+
+    name = "anthropic"
+
+    def __init__(self, api_key: str) -> None:
+        """
+        Initialize backend.
+
+        Async calls go through the caller's retry policy, so the SDK's own
+        retries are disabled for the async clients.
+
+        Args:
+            api_key: Anthropic API key
+        """
+        self.api_key = api_key
+        self.client = Anthropic(api_key=api_key)
+        self._async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._async_lock = threading.Lock()
+
+    @property
+    def async_client(self) -> AsyncAnthropic:
+        """
+        Get the async Anthropic client bound to the running event loop.
+
+        Async HTTP connections cannot be shared between event loops, so one client
+        is kept per loop. On the long-lived runtime loops this means connections
+        are reused across tasks.
+
+        Returns:
+            AsyncAnthropic client for the current event loop
+        """
+        loop = asyncio.get_running_loop()
+
+        with self._async_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = AsyncAnthropic(api_key=self.api_key, max_retries=0)
+                self._async_clients[loop] = client
+            return client
+
+    def create(self, **params: Any) -> Message:
+        """Send a request to the Anthropic API (synchronous)."""
+        return self.client.messages.create(**params)
+
+    async def create_async(self, **params: Any) -> Message:
+        """Send a request to the Anthropic API."""
+        return await self.async_client.messages.create(**params)
+
+    def stream(self, **params: Any) -> Any:
+        """Send a streaming request to the Anthropic API."""
+        return self.async_client.messages.stream(**params)
+
+
+class LatencyModel:
+    """Latency distribution for replayed responses."""
+
+    def __init__(self, spec: str) -> None:
+        """
+        Initialize from a spec string.
+
+        Args:
+            spec: "recorded" (latency of the recording), "fixed:SECONDS",
+                "uniform:MIN:MAX" or "lognormal:MEDIAN:SIGMA"
+        """
+        kind, *values = spec.strip().lower().split(":")
+        try:
+            self.values = [float(value) for value in values]
+        except ValueError:
+            raise ValueError(f"Invalid replay latency spec: {spec!r}")
+
+        expected = {"recorded": 0, "fixed": 1, "uniform": 2, "lognormal": 2}
+        if kind not in expected or len(self.values) != expected[kind]:
+            raise ValueError(f"Invalid replay latency spec: {spec!r}")
+        self.kind = kind
+
+    def sample(self, recorded: Optional[float] = None) -> float:
+        """
+        Draw a response latency.
+
+        Args:
+            recorded: Latency stored with the recording, if any
+
+        Returns:
+            Latency in seconds
+        """
+        if self.kind == "fixed":
+            return self.values[0]
+        if self.kind == "uniform":
+            return random.uniform(*self.values)
+        if self.kind == "lognormal":
+            median, sigma = self.values
+            return median * random.lognormvariate(0.0, sigma)
+        return recorded if recorded is not None else 1.0
+
+
+class _ReplayStream:
+    """Stream over a replayed response, pacing text chunks over its latency."""
+
+    def __init__(self, backend: "ReplayBackend", params: dict) -> None:
+        self._backend = backend
+        self._params = params
+        self._message: Optional[Message] = None
+
+    async def __aenter__(self) -> "_ReplayStream":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> bool:
+        return False
+
+    @property
+    def text_stream(self) -> AsyncIterator[str]:
+        """Async iterator over text deltas."""
+        return self._iter_text()
+
+    async def _iter_text(self) -> AsyncIterator[str]:
+        recording, latency = self._backend._prepare(self._params)
+
+        # First token after a fifth of the latency, the rest spread evenly
+        await asyncio.sleep(latency * 0.2)
+        self._backend._maybe_fail()
+
+        message = self._backend._build_message(self._params, recording)
+        text = message.content[0].text
+        chunk_count = max(1, min(self._backend.stream_chunks, len(text)))
+        chunk_size = -(-len(text) // chunk_count)
+        for start in range(0, len(text), chunk_size):
+            yield text[start:start + chunk_size]
+            await asyncio.sleep(latency * 0.8 / chunk_count)
+
+        self._message = message
+
+    async def get_final_message(self) -> Message:
+        """Get the complete message once the text stream is exhausted."""
+        if self._message is None:
+            async for _ in self.text_stream:
+                pass
+        return self._message
+
+
+class ReplayBackend(LLMBackend):
+    """Backend that serves recorded responses with injected latency and errors."""
+
+    name = "replay"
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        latency: Optional[str] = None,
+        error_rate: Optional[float] = None,
+        error_statuses: Optional[str] = None,
+        stream_chunks: int = 20
+    ) -> None:
+        """
+        Initialize backend (unset arguments default to settings).
+
+        Args:
+            path: JSON lines file of recordings
+            latency: Latency model spec (see LatencyModel)
+            error_rate: Fraction of requests that fail (0-1)
+            error_statuses: Comma-separated HTTP statuses of injected errors
+            stream_chunks: Number of text deltas per streamed response
+        """
+        self.path = settings.llm_replay_path if path is None else path
+        self.latency = LatencyModel(settings.llm_replay_latency if latency is None else latency)
+        self.error_rate = settings.llm_replay_error_rate if error_rate is None else error_rate
+        self.error_statuses = [
+            int(status) for status in
+            (settings.llm_replay_error_statuses if error_statuses is None else error_statuses).split(",")
+            if status.strip()
+        ]
+        self.stream_chunks = stream_chunks
+
+        self._by_prompt: dict[str, dict[str, Any]] = {}
+        self._by_system: dict[str, list[dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"exact": 0, "system": 0, "default": 0, "errors": 0}
+        self._load()
+
+    def _load(self) -> None:
+        """Load recordings from the JSON lines file."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        recording = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping invalid recording at {self.path}:{line_number}")
+                        continue
+                    self._by_prompt[recording["prompt_fingerprint"]] = recording
+                    self._by_system.setdefault(recording["system_fingerprint"], []).append(recording)
+        except FileNotFoundError:
+            logger.warning(f"No LLM recordings at {self.path}; replaying empty JSON responses")
+
+        logger.info(f"Loaded {len(self._by_prompt)} LLM recordings from {self.path}")
+
+    def _find(self, params: dict) -> dict[str, Any]:
+        """Find the recording for a request (exact prompt, then same system prompt, then default)."""
+        system_fp, prompt_fp = request_fingerprints(params)
+
+        recording = self._by_prompt.get(prompt_fp)
+        match = "exact"
+        if recording is None and self._by_system.get(system_fp):
+            recording = random.choice(self._by_system[system_fp])
+            match = "system"
+        if recording is None:
+            recording = {"text": "{}"}
+            match = "default"
+
+        with self._lock:
+            self._stats[match] += 1
+        return recording
+
+    def _prepare(self, params: dict) -> tuple[dict[str, Any], float]:
+        """Pick the recording and latency for a request."""
+        recording = self._find(params)
+        return recording, self.latency.sample(recording.get("latency_seconds"))
+
+    def _maybe_fail(self) -> None:
+        """Raise an injected API error at the configured rate."""
+        if not self.error_statuses or random.random() >= self.error_rate:
+            return
+
+        with self._lock:
+            self._stats["errors"] += 1
+
+        status = random.choice(self.error_statuses)
+        response = httpx.Response(
+            status, request=httpx.Request("POST", "https://replay.invalid/v1/messages")
+        )
+        error_class = {429: RateLimitError}.get(status, InternalServerError if status >= 500 else APIStatusError)
+        raise error_class(f"Injected replay error (HTTP {status})", response=response, body=None)
+
+    def _build_message(self, params: dict, recording: dict[str, Any]) -> Message:
+        """
+        Build a Message with the recording's text and usage (estimated if not recorded).
+
+        Recordings longer than the request's max_tokens are cut off proportionally
+        and reported as truncated, like the API would.
+        """
+        usage = recording.get("usage") or {}
+        prompt_chars = len(request_text(params.get("system", ""))) + len(request_text(params["messages"][0]["content"]))
+        text = recording["text"]
+        output_tokens = usage.get("output_tokens", len(text) // 4)
+
+        if output_tokens > params["max_tokens"]:
+            text = text[:len(text) * params["max_tokens"] // output_tokens]
+            output_tokens = params["max_tokens"]
+
+        return Message(
+            id=f"msg_replay_{uuid.uuid4().hex[:16]}",
+            type="message",
+            role="assistant",
+            model=params["model"],
+            content=[TextBlock(type="text", text=text)],
+            stop_reason="max_tokens" if output_tokens >= params["max_tokens"] else "end_turn",
+            stop_sequence=None,
+            usage=Usage(
+                input_tokens=usage.get("input_tokens", prompt_chars // 4),
+                output_tokens=output_tokens,
+                cache_creation_input_tokens=usage.get("cache_creation_input_tokens", 0),
+                cache_read_input_tokens=usage.get("cache_read_input_tokens", 0)
+            )
+        )
+
+    def create(self, **params: Any) -> Message:
+        """Replay a response (synchronous)."""
+        recording, latency = self._prepare(params)
+        time.sleep(latency)
+        self._maybe_fail()
+        return self._build_message(params, recording)
+
+    async def create_async(self, **params: Any) -> Message:
+        """Replay a response."""
+        recording, latency = self._prepare(params)
+        await asyncio.sleep(latency)
+        self._maybe_fail()
+        return self._build_message(params, recording)
+
+    def stream(self, **params: Any) -> Any:
+        """Replay a response as a stream."""
+        return _ReplayStream(self, params)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get replay statistics.
+
+        Returns:
+            Dict with recording count, per match-type counters and injected errors
+        """
+        with self._lock:
+            return {"backend": self.name, "recordings": len(self._by_prompt), **self._stats}
+
+
+class RecordingBackend(LLMBackend):
+    """Backend wrapper that appends every successful response to a recordings file."""
+
+    def __init__(self, inner: LLMBackend, path: str) -> None:
+        """
+        Initialize wrapper.
+
+        Args:
+            inner: Backend that serves the requests
+            path: JSON lines file to append recordings to
+        """
+        self.inner = inner
+        self.path = path
+        self.name = f"{inner.name}+recording"
+        self._lock = threading.Lock()
+
+    def _record(self, params: dict, message: Message, latency_seconds: float) -> None:
+        """Append a response to the recordings file."""
+        system_fp, prompt_fp = request_fingerprints(params)
+        recording = {
+            "system_fingerprint": system_fp,
+            "prompt_fingerprint": prompt_fp,
+            "model": params["model"],
+            "text": message.content[0].text,
+            "usage": {
+                "input_tokens": message.usage.input_tokens,
+                "output_tokens": message.usage.output_tokens,
+                "cache_creation_input_tokens": message.usage.cache_creation_input_tokens or 0,
+                "cache_read_input_tokens": message.usage.cache_read_input_tokens or 0
+            },
+            "latency_seconds": round(latency_seconds, 3),
+            "recorded_at": time.time()
+        }
+
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(recording) + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to write LLM recording to {self.path}: {e}")
+
+    def create(self, **params: Any) -> Message:
+        """Send a request through the inner backend and record the response."""
+        start_time = time.monotonic()
+        message = self.inner.create(**params)
+        self._record(params, message, time.monotonic() - start_time)
+        return message
+
+    async def create_async(self, **params: Any) -> Message:
+        """Send a request through the inner backend and record the response."""
+        start_time = time.monotonic()
+        message = await self.inner.create_async(**params)
+        self._record(params, message, time.monotonic() - start_time)
+        return message
+
+    def stream(self, **params: Any) -> Any:
+        """Send a streaming request through the inner backend and record the response."""
+        return _RecordingStream(self, params)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get backend statistics.
+
+        Returns:
+            Inner backend statistics plus the recordings path
+        """
+        return {**self.inner.get_stats(), "backend": self.name, "record_path": self.path}
+
+
+class _RecordingStream:
+    """Stream wrapper that records the final message."""
+
+    def __init__(self, backend: RecordingBackend, params: dict) -> None:
+        self._backend = backend
+        self._params = params
+        self._manager = backend.inner.stream(**params)
+        self._stream: Any = None
+        self._start_time = 0.0
+
+    async def __aenter__(self) -> "_RecordingStream":
+        self._start_time = time.monotonic()
+        self._stream = await self._manager.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> Any:
+        return await self._manager.__aexit__(*exc_info)
+
+    @property
+    def text_stream(self) -> AsyncIterator[str]:
+        """Async iterator over text deltas."""
+        return self._stream.text_stream
+
+    async def get_final_message(self) -> Message:
+        """Get the complete message and record it."""
+        message = await self._stream.get_final_message()
+        self._backend._record(self._params, message, time.monotonic() - self._start_time)
+        return message
+
+
+def create_backend(api_key: Optional[str] = None) -> LLMBackend:
+    """
+    Create the backend selected in settings.
+
+    Args:
+        api_key: Anthropic API key (defaults to settings)
+
+    Returns:
+        Backend instance (wrapped for recording if LLM_RECORD_PATH is set)
+    """
+    if settings.llm_backend == "replay":
+        backend: LLMBackend = ReplayBackend()
+    elif settings.llm_backend == "anthropic":
+        backend = AnthropicBackend(api_key or settings.claude_api_key)
+    else:
+        raise ValueError(f"Unknown LLM backend: {settings.llm_backend!r}")
+
+    if settings.llm_record_path:
+        backend = RecordingBackend(backend, settings.llm_record_path)
+
+    return backend
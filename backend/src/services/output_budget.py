@@ -0,0 +1,185 @@
+"""
+Output Budget: Adaptive max_tokens sizing from observed output lengths.
+
+Hand-set max_tokens values are either too small (truncated JSON falls back to
+templates) or much too large (every request reserves rate limit budget it never
+uses). The budget keeps a rolling window of output token counts per call site
+(agent and prompt) and sizes max_tokens from a high percentile plus headroom.
+Hand-set values are only used until enough samples exist.
+
+Responses that still hit the limit (stop_reason "max_tokens") are counted, and
+ClaudeClient retries them once with a larger budget.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Optional
+
+from ..utils.config import settings
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class OutputBudget:
+    """Per call site output token histograms and the max_tokens derived from them."""
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        percentile: Optional[float] = None,
+        headroom: Optional[float] = None,
+        min_samples: Optional[int] = None,
+        floor: Optional[int] = None,
+        ceiling: Optional[int] = None,
+        window_size: int = 200
+    ) -> None:
+        """
+        Initialize budget (unset arguments default to settings).
+
+        Args:
+            enabled: Whether max_tokens is derived from observed outputs at all
+            percentile: Output length percentile the budget must cover (e.g. 0.99)
+            headroom: Extra fraction added on top of the percentile
+            min_samples: Samples required before the hand-set value is replaced
+            floor: Smallest max_tokens ever used
+            ceiling: Largest max_tokens ever used, including truncation retries
+            window_size: Number of recent samples kept per call site
+        """
+        self.enabled = settings.claude_adaptive_max_tokens_enabled if enabled is None else enabled
+        self.percentile = settings.claude_max_tokens_percentile if percentile is None else percentile
+        self.headroom = settings.claude_max_tokens_headroom if headroom is None else headroom
+        self.min_samples = settings.claude_max_tokens_min_samples if min_samples is None else min_samples
+        self.floor = settings.claude_max_tokens_floor if floor is None else floor
+        self.ceiling = settings.claude_max_output_tokens if ceiling is None else ceiling
+        self.window_size = window_size
+
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque] = {}
+        self._counters: dict[str, dict[str, int]] = {}
+
+    def _increment(self, key: str, counter: str) -> None:
+        """Increment a per call site counter (caller must hold the lock)."""
+        counters = self._counters.setdefault(key, {})
+        counters[counter] = counters.get(counter, 0) + 1
+
+    def _percentile(self, key: str, percentile: float) -> Optional[int]:
+        """
+        Get an output length percentile for a call site.
+
+        Args:
+            key: Call site key
+            percentile: Percentile as a fraction (e.g. 0.99)
+
+        Returns:
+            Output tokens, or None if there are no samples
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+
+        if not samples:
+            return None
+
+        return samples[min(len(samples) - 1, int(percentile * len(samples)))]
+
+    def max_tokens_for(self, key: Optional[str], default: int) -> int:
+        """
+        Get the max_tokens to request for a call site.
+
+        Args:
+            key: Call site key (None disables sizing for this call)
+            default: Hand-set max_tokens, used until enough samples exist
+
+        Returns:
+            max_tokens for the next request
+        """
+        if not self.enabled or key is None:
+            return default
+
+        with self._lock:
+            count = len(self._samples.get(key, ()))
+        if count < max(1, self.min_samples):
+            return default
+
+        observed = self._percentile(key, self.percentile)
+        budget = int(observed * (1 + self.headroom)) + 1
+        return max(self.floor, min(self.ceiling, budget))
+
+    def retry_max_tokens(self, max_tokens: int) -> Optional[int]:
+        """
+        Get the larger budget for retrying a truncated response.
+
+        Args:
+            max_tokens: Budget the truncated request used
+
+        Returns:
+            Doubled max_tokens (capped at the ceiling), or None if the budget
+            cannot grow any further
+        """
+        budget = min(self.ceiling, max_tokens * 2)
+        return budget if budget > max_tokens else None
+
+    def record(self, key: Optional[str], output_tokens: int, truncated: bool = False) -> None:
+        """
+        Record the output length of a response.
+
+        Truncated responses are recorded at their (lower bound) length too, so
+        a call site that keeps hitting the limit grows its budget.
+
+        Args:
+            key: Call site key (None records nothing)
+            output_tokens: Output tokens the response used
+            truncated: Whether the response stopped at max_tokens
+        """
+        if key is None:
+            return
+
+        with self._lock:
+            samples = self._samples.setdefault(key, deque(maxlen=self.window_size))
+            samples.append(output_tokens)
+            self._increment(key, "responses")
+            if truncated:
+                self._increment(key, "truncations")
+
+    def record_retry(self, key: Optional[str], truncated_again: bool) -> None:
+        """
+        Record the outcome of a truncation retry.
+
+        Args:
+            key: Call site key
+            truncated_again: Whether the retry was truncated as well
+        """
+        if key is None:
+            return
+
+        with self._lock:
+            self._increment(key, "truncation_retries")
+            if truncated_again:
+                self._increment(key, "truncation_retries_failed")
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get output length statistics.
+
+        Returns:
+            Dict of call site -> counters, output token percentiles and samples
+        """
+        with self._lock:
+            keys = list(self._samples)
+            counters = {key: dict(self._counters.get(key, {})) for key in keys}
+            counts = {key: len(self._samples[key]) for key in keys}
+
+        return {
+            key: {
+                **counters[key],
+                "samples": counts[key],
+                "p50": self._percentile(key, 0.5),
+                "p95": self._percentile(key, 0.95),
+                "p99": self._percentile(key, 0.99)
+            }
+            for key in keys
+        }
+
+
+# Singleton instance
+output_budget = OutputBudget()
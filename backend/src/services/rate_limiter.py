@@ -0,0 +1,619 @@
+"""
+Rate Limiter: Model-aware token buckets for Claude API calls.
+
+Each model family (matched by name fragment, e.g. "haiku", "sonnet") gets two token
+buckets: requests per minute and tokens per minute. Bucket levels live in SQLite, so
+the limits hold across all gunicorn workers. Callers that exceed the budget wait in
+line instead of triggering API 429s, which turns overload into predictable queueing.
+
+Priority classes reserve headroom: "low" requests (hedges, warm-up jobs) can only
+use a bucket while it is well above empty, "normal" plan traffic keeps a small
+reserve, and "high" requests may drain it completely. Within a priority class,
+waiting requests are served first come, first served.
+
+Each worker takes a share of the shared buckets (a few percent of capacity) and
+serves requests from it in memory; SQLite is only touched when the share runs out
+or is older than the sync interval. Usage corrections stay in the share until the
+next sync. A sync first reads the buckets and only opens a write transaction when
+it can take budget or has unused budget to return. SQLite work never runs on the
+event loop.
+"""
+
+import asyncio
+import concurrent.futures
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+from ..utils.config import settings
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Fraction of each bucket's capacity a priority class must leave untouched
+PRIORITY_RESERVES: dict[str, float] = {
+    "high": 0.0,
+    "normal": 0.1,
+    "low": 0.3,
+}
+
+
+def _grant_turn(turn: asyncio.Future) -> None:
+    """Tell a waiting request it is at the head of its line (runs on its own loop)."""
+    if not turn.done():
+        turn.set_result(None)
+
+
+class RateLimiter:
+    """Cross-worker requests/tokens per minute limiter with priority classes."""
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        limits: Optional[str] = None,
+        max_poll_seconds: float = 1.0,
+        sync_seconds: Optional[float] = None,
+        share_fraction: Optional[float] = None
+    ) -> None:
+        """
+        Initialize limiter (unset arguments default to settings).
+
+        Args:
+            enabled: Whether calls are rate limited at all
+            limits: Per-model limits as "fragment=RPM:TPM,..." (e.g. "haiku=1000:400000")
+            max_poll_seconds: Longest single sleep while waiting for budget
+            sync_seconds: Longest time this process serves requests from its share
+                before syncing with the shared buckets
+            share_fraction: Budget taken per sync beyond the request that triggered
+                it, as a fraction of bucket capacity
+        """
+        self.enabled = settings.claude_rate_limit_enabled if enabled is None else enabled
+        self.limits = self._parse_limits(settings.claude_rate_limits if limits is None else limits)
+        self.max_poll_seconds = max_poll_seconds
+        self.sync_seconds = settings.claude_rate_limit_sync_seconds if sync_seconds is None else sync_seconds
+        self.share_fraction = (
+            settings.claude_rate_limit_share_fraction if share_fraction is None else share_fraction
+        )
+
+        self._lock = threading.Lock()
+        # Family -> {"allowance": unspent budget taken by this process,
+        # "shared": shared levels seen at the last sync, "synced_at": time}
+        self._shares: dict[str, dict[str, Any]] = {}
+        # One sync per family at a time
+        self._sync_locks: dict[str, threading.Lock] = {}
+        # (family, priority) -> waiting requests as (event loop, turn future), oldest first
+        self._lines: dict[tuple[str, str], deque] = {}
+        # One writer thread keeps bucket writes in order and off the event loop
+        self._writer = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="rate-limiter")
+        self._waiting: dict[str, dict[str, int]] = {}
+        self._stats: dict[str, dict[str, float]] = {}
+
+    @staticmethod
+    def _parse_limits(spec: str) -> dict[str, tuple[int, int]]:
+        """
+        Parse per-model limits.
+
+        Args:
+            spec: Limits as "fragment=RPM:TPM,..."
+
+        Returns:
+            Dict of model name fragment -> (requests per minute, tokens per minute)
+        """
+        limits = {}
+        for item in spec.split(","):
+            fragment, _, values = item.partition("=")
+            rpm, _, tpm = values.partition(":")
+            try:
+                limits[fragment.strip().lower()] = (int(rpm), int(tpm))
+            except ValueError:
+                if item.strip():
+                    logger.warning(f"Ignoring invalid rate limit: {item!r}")
+        return limits
+
+    def _limits_for(self, model: str) -> Optional[tuple[str, int, int]]:
+        """
+        Find the limits that apply to a model.
+
+        Args:
+            model: Claude model name
+
+        Returns:
+            Tuple of (bucket family, RPM, TPM), or None if the model is unlimited
+        """
+        if not self.enabled:
+            return None
+
+        for fragment, (rpm, tpm) in self.limits.items():
+            if fragment in model.lower():
+                return fragment, rpm, tpm
+        return None
+
+    @staticmethod
+    def estimate_tokens(prompt: str, system: str, max_tokens: int) -> int:
+        """
+        Estimate the tokens a request will consume (input ~4 chars/token + max output).
+
+        Args:
+            prompt: User prompt
+            system: System prompt
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Estimated token count
+        """
+        return (len(prompt) + len(system)) // 4 + max_tokens
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """
+        Get database connection in autocommit mode for explicit transactions.
+
+        Returns:
+            SQLite connection
+        """
+        from ..api.database import get_db
+
+        conn = get_db()
+        conn.isolation_level = None
+        return conn
+
+    def _refilled_levels(
+        self,
+        conn: sqlite3.Connection,
+        family: str,
+        rpm: int,
+        tpm: int,
+        now: float
+    ) -> dict[str, tuple[float, int]]:
+        """
+        Read bucket levels refilled up to now.
+
+        Returns:
+            Dict of bucket key -> (current level, capacity)
+        """
+        levels = {}
+        for kind, capacity in (("rpm", rpm), ("tpm", tpm)):
+            key = f"{family}:{kind}"
+            row = conn.execute(
+                "SELECT level, updated_at FROM rate_limit_buckets WHERE bucket_key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                level = float(capacity)
+            else:
+                level = min(capacity, row["level"] + (now - row["updated_at"]) * capacity / 60.0)
+            levels[key] = (level, capacity)
+        return levels
+
+    def _write_levels(self, conn: sqlite3.Connection, levels: dict[str, float], now: float) -> None:
+        """Persist bucket levels (caller holds a write transaction)."""
+        for key, level in levels.items():
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_buckets (bucket_key, level, updated_at) VALUES (?, ?, ?)",
+                (key, level, now)
+            )
+
+    def _take_local(
+        self,
+        family: str,
+        capacities: dict[str, int],
+        needs: dict[str, int],
+        reserve: float,
+        now: float
+    ) -> Optional[float]:
+        """
+        Take a request's budget from this process's share, without touching SQLite.
+
+        Args:
+            family: Bucket family
+            capacities: Bucket key -> capacity
+            needs: Bucket key -> budget the request needs
+            reserve: Fraction of capacity the priority class must leave untouched
+            now: Current time
+
+        Returns:
+            0 if the budget was taken, seconds until it should be available if the
+            buckets are too low for this priority, or None if the share is stale
+            or too small and must be synced
+        """
+        with self._lock:
+            share = self._shares.get(family)
+            if share is None or now - share["synced_at"] >= self.sync_seconds:
+                return None
+            if any(share["allowance"][key] < need for key, need in needs.items()):
+                return None
+
+            wait = 0.0
+            for key, need in needs.items():
+                capacity = capacities[key]
+                # Budget left overall: the shared level (refilled since the sync) plus our unspent share
+                shared = min(capacity, share["shared"][key] + (now - share["synced_at"]) * capacity / 60.0)
+                shortfall = need + reserve * capacity - (shared + share["allowance"][key])
+                if shortfall > 0:
+                    wait = max(wait, shortfall * 60.0 / capacity)
+
+            if wait > 0:
+                return wait
+
+            for key, need in needs.items():
+                share["allowance"][key] -= need
+            return 0.0
+
+    def _sync_take(
+        self,
+        family: str,
+        capacities: dict[str, int],
+        needs: dict[str, int],
+        reserve: float
+    ) -> float:
+        """
+        Sync this process's share with the shared buckets and take a request's budget.
+
+        Unused budget of the old share goes back to the shared buckets; if the request
+        fits, a new share (the request plus share_fraction of capacity, as far as the
+        priority's reserve allows) is taken.
+
+        Args:
+            family: Bucket family
+            capacities: Bucket key -> capacity
+            needs: Bucket key -> budget the request needs
+            reserve: Fraction of capacity the priority class must leave untouched
+
+        Returns:
+            0 if the budget was taken, otherwise seconds until it should be available
+        """
+        with self._lock:
+            sync_lock = self._sync_locks.setdefault(family, threading.Lock())
+
+        with sync_lock:
+            # Another thread may have synced while this one waited
+            wait = self._take_local(family, capacities, needs, reserve, time.time())
+            if wait is not None:
+                return wait
+
+            with self._lock:
+                share = self._shares.pop(family, None)
+            returned = share["allowance"] if share is not None else dict.fromkeys(capacities, 0.0)
+
+            try:
+                return self._sync_share(family, capacities, needs, reserve, returned)
+            except Exception:
+                # Keep the unspent share rather than losing it
+                if share is not None:
+                    with self._lock:
+                        self._shares[family] = share
+                raise
+
+    def _sync_share(
+        self,
+        family: str,
+        capacities: dict[str, int],
+        needs: dict[str, int],
+        reserve: float,
+        returned: dict[str, float]
+    ) -> float:
+        """Return unspent budget and take a new share in SQLite (caller holds the sync lock)."""
+        rpm, tpm = capacities[f"{family}:rpm"], capacities[f"{family}:tpm"]
+
+        def shortfall_wait(levels: dict[str, tuple[float, int]]) -> float:
+            wait = 0.0
+            for key, need in needs.items():
+                level, capacity = levels[key]
+                shortfall = need + reserve * capacity - min(capacity, level + returned[key])
+                if shortfall > 0:
+                    wait = max(wait, shortfall * 60.0 / capacity)
+            return wait
+
+        conn = self._get_conn()
+        try:
+            # Waiters with nothing to return only read, never taking the write lock
+            now = time.time()
+            levels = self._refilled_levels(conn, family, rpm, tpm, now)
+            wait = shortfall_wait(levels)
+            if wait > 0 and not any(returned.values()):
+                return wait
+
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            levels = self._refilled_levels(conn, family, rpm, tpm, now)
+            totals = {key: min(capacity, level + returned[key]) for key, (level, capacity) in levels.items()}
+
+            wait = shortfall_wait(levels)
+            taken = dict.fromkeys(capacities, 0.0)
+            if wait == 0:
+                for key, need in needs.items():
+                    capacity = capacities[key]
+                    spare = max(0.0, totals[key] - need - reserve * capacity)
+                    taken[key] = need + min(self.share_fraction * capacity, spare)
+
+            self._write_levels(conn, {key: totals[key] - taken[key] for key in totals}, now)
+            conn.execute("COMMIT")
+
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        if wait > 0:
+            return wait
+
+        with self._lock:
+            self._shares[family] = {
+                "allowance": {key: taken[key] - needs[key] for key in taken},
+                "shared": {key: totals[key] - taken[key] for key in totals},
+                "synced_at": now
+            }
+        return 0.0
+
+    def _adjust_tokens(self, model: str, delta: int) -> None:
+        """
+        Return (positive delta) or charge (negative delta) tokens to a model's shared bucket.
+
+        Args:
+            model: Claude model name
+            delta: Tokens to add back to the bucket
+        """
+        limits = self._limits_for(model)
+        if limits is None or delta == 0:
+            return
+
+        family, rpm, tpm = limits
+        now = time.time()
+        conn = self._get_conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            levels = self._refilled_levels(conn, family, rpm, tpm, now)
+            key = f"{family}:tpm"
+            self._write_levels(conn, {key: min(levels[key][1], levels[key][0] + delta)}, now)
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.warning(f"Failed to adjust token bucket for {model}: {e}")
+        finally:
+            conn.close()
+
+    async def acquire(self, model: str, tokens: int, priority: str = "normal") -> float:
+        """
+        Wait until the model's budget allows one more request of the given size.
+
+        Requests of one priority class get their budget in arrival order: only the
+        oldest waiting request polls the buckets, the others wait for their turn.
+
+        Args:
+            model: Claude model name
+            tokens: Estimated tokens for the request
+            priority: "high", "normal" or "low"
+
+        Returns:
+            Seconds spent waiting in line
+        """
+        limits = self._limits_for(model)
+        if limits is None:
+            return 0.0
+
+        family, rpm, tpm = limits
+        capacities = {f"{family}:rpm": rpm, f"{family}:tpm": tpm}
+        # A single request can never need more than a full bucket
+        needs = {f"{family}:rpm": 1, f"{family}:tpm": min(tokens, tpm)}
+        reserve = PRIORITY_RESERVES.get(priority, PRIORITY_RESERVES["normal"])
+
+        start_time = time.monotonic()
+        loop = asyncio.get_running_loop()
+        entry = (loop, loop.create_future())
+        self._update_waiting(model, tokens, +1)
+
+        with self._lock:
+            line = self._lines.setdefault((family, priority), deque())
+            line.append(entry)
+            if line[0] is entry:
+                entry[1].set_result(None)
+        queued = not entry[1].done()
+
+        try:
+            await entry[1]
+
+            while True:
+                wait = self._take_local(family, capacities, needs, reserve, time.time())
+                if wait is None:
+                    wait = await asyncio.to_thread(self._sync_take, family, capacities, needs, reserve)
+                if wait == 0:
+                    break
+                queued = True
+                await asyncio.sleep(min(wait, self.max_poll_seconds))
+        finally:
+            self._update_waiting(model, tokens, -1)
+            self._leave_line(family, priority, entry)
+
+        waited = time.monotonic() - start_time
+        self._record_wait(model, priority, waited if queued else 0.0, queued)
+
+        if waited > self.max_poll_seconds:
+            logger.info(f"Rate limiter queued {priority} request for {model} for {waited:.2f}s")
+
+        return waited
+
+    def _leave_line(self, family: str, priority: str, entry: tuple) -> None:
+        """Remove a request from its line and hand the turn to the next one."""
+        with self._lock:
+            line = self._lines[(family, priority)]
+            was_head = line[0] is entry
+            line.remove(entry)
+
+            while was_head and line:
+                next_loop, next_turn = line[0]
+                try:
+                    next_loop.call_soon_threadsafe(_grant_turn, next_turn)
+                    break
+                except RuntimeError:
+                    # Its event loop is gone, so it can never take its turn
+                    line.popleft()
+
+    def settle(self, model: str, estimated_tokens: int, actual_tokens: int) -> None:
+        """
+        Correct a model's token bucket once a request's real usage is known.
+
+        The correction goes into this process's share and reaches SQLite with the
+        next sync. Only a share grown well beyond its normal size is written back
+        right away (on the limiter's writer thread), so idle workers do not sit on
+        returned budget.
+
+        Args:
+            model: Claude model name
+            estimated_tokens: Tokens taken by acquire()
+            actual_tokens: Tokens the request actually used (0 if it failed)
+        """
+        limits = self._limits_for(model)
+        delta = estimated_tokens - actual_tokens
+        if limits is None or delta == 0:
+            return
+
+        family, _, tpm = limits
+        key = f"{family}:tpm"
+        excess = delta
+
+        with self._lock:
+            share = self._shares.get(family)
+            if share is not None:
+                allowance = share["allowance"][key] + delta
+                excess = max(0.0, allowance - self.share_fraction * tpm)
+                share["allowance"][key] = allowance - excess
+
+        if excess:
+            self._writer.submit(self._adjust_tokens, model, int(excess))
+
+    def penalize(self, model: str) -> None:
+        """
+        Drain a model's request bucket after an API 429 so every worker backs off.
+
+        The write happens on the limiter's writer thread; this returns immediately.
+
+        Args:
+            model: Claude model name
+        """
+        limits = self._limits_for(model)
+        if limits is None:
+            return
+
+        family = limits[0]
+        with self._lock:
+            share = self._shares.get(family)
+            if share is not None:
+                share["allowance"][f"{family}:rpm"] = 0.0
+                share["shared"][f"{family}:rpm"] = 0.0
+
+        self._writer.submit(self._drain_requests, model, family)
+
+    def _drain_requests(self, model: str, family: str) -> None:
+        """Empty a model family's request bucket (runs on the writer thread)."""
+        conn = self._get_conn()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_buckets (bucket_key, level, updated_at) VALUES (?, 0, ?)",
+                (f"{family}:rpm", time.time())
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to drain request bucket for {model}: {e}")
+        finally:
+            conn.close()
+
+    def expected_wait(self, model: str, tokens: int, priority: str = "normal") -> float:
+        """
+        Estimate how long a new request would wait for budget.
+
+        Accounts for the current bucket levels and the requests already waiting
+        in this process.
+
+        Args:
+            model: Claude model name
+            tokens: Estimated tokens for the request
+            priority: "high", "normal" or "low"
+
+        Returns:
+            Expected wait in seconds (0 if the request could go immediately)
+        """
+        limits = self._limits_for(model)
+        if limits is None:
+            return 0.0
+
+        family, rpm, tpm = limits
+        reserve = PRIORITY_RESERVES.get(priority, PRIORITY_RESERVES["normal"])
+
+        with self._lock:
+            waiting = dict(self._waiting.get(family, {"requests": 0, "tokens": 0}))
+
+        conn = self._get_conn()
+        try:
+            levels = self._refilled_levels(conn, family, rpm, tpm, time.time())
+        finally:
+            conn.close()
+
+        # Budget this process has taken but not spent yet is still available
+        with self._lock:
+            share = self._shares.get(family)
+            if share is not None:
+                levels = {
+                    key: (min(capacity, level + share["allowance"][key]), capacity)
+                    for key, (level, capacity) in levels.items()
+                }
+
+        needs = {
+            f"{family}:rpm": 1 + waiting["requests"],
+            f"{family}:tpm": min(tokens, tpm) + waiting["tokens"],
+        }
+
+        wait = 0.0
+        for key, need in needs.items():
+            level, capacity = levels[key]
+            shortfall = need + reserve * capacity - level
+            if shortfall > 0:
+                wait = max(wait, shortfall * 60.0 / capacity)
+        return wait
+
+    def _update_waiting(self, model: str, tokens: int, direction: int) -> None:
+        """Track requests currently waiting in this process."""
+        family = self._limits_for(model)[0]
+        with self._lock:
+            waiting = self._waiting.setdefault(family, {"requests": 0, "tokens": 0})
+            waiting["requests"] += direction
+            waiting["tokens"] += direction * tokens
+
+    def _record_wait(self, model: str, priority: str, waited: float, queued: bool) -> None:
+        """Record queue-wait metrics for an acquired request."""
+        with self._lock:
+            stats = self._stats.setdefault(
+                f"{self._limits_for(model)[0]}:{priority}",
+                {"acquired": 0, "queued": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+            )
+            stats["acquired"] += 1
+            if queued:
+                stats["queued"] += 1
+            stats["total_wait_seconds"] += waited
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get limiter statistics.
+
+        Returns:
+            Dict with per family/priority queue-wait metrics and current waiters
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "waiting": {family: dict(counts) for family, counts in self._waiting.items()},
+                "queue_wait": {
+                    key: {
+                        **{name: round(value, 3) for name, value in stats.items()},
+                        "avg_wait_seconds": round(stats["total_wait_seconds"] / stats["acquired"], 3)
+                    }
+                    for key, stats in self._stats.items()
+                }
+            }
+
+
+# Singleton instance
+rate_limiter = RateLimiter()
@@ -0,0 +1,398 @@
+"""
+Request Policy: Retries, hedging and per-attempt metrics for Claude API calls.
+
+A handful of slow or failed Claude responses dominate tail plan latency. The policy
+retries retryable errors with exponential backoff (full jitter) and, for selected
+models, sends a duplicate "hedge" request when the first one runs longer than the
+recent p95 latency of its call site (model and agent prompt). The first successful
+response wins; the other request is cancelled.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+from anthropic import APIConnectionError, APIStatusError, InternalServerError, RateLimitError
+
+from ..utils.config import settings
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# HTTP statuses worth retrying (timeouts, conflicts, rate limits, overloaded/5xx)
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Check whether a Claude API error is transient and worth retrying.
+
+    Args:
+        error: Exception raised by the Anthropic SDK
+
+    Returns:
+        True for rate limits, connection errors/timeouts and server errors
+    """
+    if isinstance(error, (RateLimitError, APIConnectionError, InternalServerError)):
+        return True
+
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+
+    return False
+
+
+def latency_key(model: str, size_key: Optional[str] = None) -> str:
+    """
+    Get the latency tracker key of a call site.
+
+    Calls to one model that produce 300 or 3000 output tokens have very different
+    latencies, so hedging tracks each call site (ClaudeClient size_key) on its own.
+
+    Args:
+        model: Claude model name
+        size_key: Call site (None for calls without one)
+
+    Returns:
+        Tracker key
+    """
+    return model if size_key is None else f"{model}:{size_key}"
+
+
+class LatencyTracker:
+    """Rolling window of successful request latencies per key (model or call site)."""
+
+    def __init__(self, window_size: int = 200) -> None:
+        """
+        Initialize tracker.
+
+        Args:
+            window_size: Number of recent samples kept per key
+        """
+        self.window_size = window_size
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque] = {}
+
+    def record(self, key: str, seconds: float) -> None:
+        """
+        Record a successful request latency.
+
+        Args:
+            key: Claude model name, or latency_key() of a call site
+            seconds: Request latency in seconds
+        """
+        with self._lock:
+            samples = self._samples.setdefault(key, deque(maxlen=self.window_size))
+            samples.append(seconds)
+
+    def percentile(self, key: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Get a latency percentile for a key.
+
+        Args:
+            key: Claude model name, or latency_key() of a call site
+            percentile: Percentile as a fraction (e.g. 0.95)
+            min_samples: Minimum samples required for a meaningful estimate
+
+        Returns:
+            Latency in seconds, or None if there are too few samples
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+
+        if len(samples) < max(1, min_samples):
+            return None
+
+        index = min(len(samples) - 1, int(percentile * len(samples)))
+        return samples[index]
+
+    def keys(self) -> list[str]:
+        """
+        Get the keys that have latency samples.
+
+        Returns:
+            List of keys
+        """
+        with self._lock:
+            return list(self._samples)
+
+
+class RequestMetrics:
+    """Thread-safe counters and recent history of individual Claude request attempts."""
+
+    def __init__(self, history_size: int = 100) -> None:
+        """
+        Initialize metrics.
+
+        Args:
+            history_size: Number of recent attempts kept for inspection
+        """
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[str, int]] = {}
+        self._recent: deque = deque(maxlen=history_size)
+        self._first_token = LatencyTracker()
+
+    def _increment(self, model: str, counter: str, amount: int = 1) -> None:
+        """Increment a per-model counter (caller must hold the lock)."""
+        counters = self._counters.setdefault(model, {})
+        counters[counter] = counters.get(counter, 0) + amount
+
+    def record_attempt(
+        self,
+        model: str,
+        attempt: int,
+        hedge: bool,
+        outcome: str,
+        latency_seconds: float,
+        error_type: Optional[str] = None,
+        first_token_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Record the outcome of one request attempt.
+
+        Args:
+            model: Claude model name
+            attempt: Retry attempt number (1 = first try)
+            hedge: Whether this was a hedge request
+            outcome: "success", "error" or "cancelled"
+            latency_seconds: Time from send to outcome
+            error_type: Exception class name for failed attempts
+            first_token_seconds: Time from send to the first streamed text (streams only)
+        """
+        if first_token_seconds is not None:
+            self._first_token.record(model, first_token_seconds)
+
+        with self._lock:
+            self._increment(model, "attempts")
+            self._increment(model, outcome)
+            if hedge:
+                self._increment(model, "hedges_launched")
+                if outcome == "success":
+                    self._increment(model, "hedges_won")
+
+            self._recent.append({
+                "model": model,
+                "attempt": attempt,
+                "hedge": hedge,
+                "outcome": outcome,
+                "latency_seconds": round(latency_seconds, 3),
+                "first_token_seconds": (
+                    round(first_token_seconds, 3) if first_token_seconds is not None else None
+                ),
+                "error_type": error_type,
+                "timestamp": time.time()
+            })
+
+    def record_retry(self, model: str) -> None:
+        """
+        Record that a request is being retried after a retryable error.
+
+        Args:
+            model: Claude model name
+        """
+        with self._lock:
+            self._increment(model, "retries")
+
+    def record_coalesced(self, model: str) -> None:
+        """
+        Record that a request joined an identical in-flight request instead of calling the API.
+
+        Args:
+            model: Claude model name
+        """
+        with self._lock:
+            self._increment(model, "coalesced")
+
+    def record_truncation(self, model: str) -> None:
+        """
+        Record a response that stopped at max_tokens.
+
+        Args:
+            model: Claude model name
+        """
+        with self._lock:
+            self._increment(model, "truncations")
+
+    def record_prompt_cache(self, model: str, read_tokens: int, write_tokens: int) -> None:
+        """
+        Record prompt cache usage of a response.
+
+        Args:
+            model: Claude model name
+            read_tokens: Input tokens read from the prompt cache
+            write_tokens: Input tokens written to the prompt cache
+        """
+        if not read_tokens and not write_tokens:
+            return
+
+        with self._lock:
+            self._increment(model, "cache_read_input_tokens", read_tokens)
+            self._increment(model, "cache_creation_input_tokens", write_tokens)
+
+    def recent_error_rates(self, window_seconds: float) -> dict[str, dict[str, Any]]:
+        """
+        Summarize attempt outcomes per model over a recent time window.
+
+        Args:
+            window_seconds: How far back to look
+
+        Returns:
+            Dict of model -> attempts, errors, error_rate and seconds since the
+            last success (None if no attempt in the window succeeded)
+        """
+        now = time.time()
+        with self._lock:
+            recent = [entry for entry in self._recent if now - entry["timestamp"] <= window_seconds]
+
+        summary: dict[str, dict[str, Any]] = {}
+        for entry in recent:
+            if entry["outcome"] == "cancelled":
+                continue
+            stats = summary.setdefault(
+                entry["model"], {"attempts": 0, "errors": 0, "last_success_age_seconds": None}
+            )
+            stats["attempts"] += 1
+            if entry["outcome"] == "error":
+                stats["errors"] += 1
+            else:
+                stats["last_success_age_seconds"] = round(now - entry["timestamp"], 1)
+
+        for stats in summary.values():
+            stats["error_rate"] = round(stats["errors"] / stats["attempts"], 3)
+        return summary
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get request statistics.
+
+        Returns:
+            Dict with per-model counters, streamed time-to-first-token
+            percentiles and the most recent attempts
+        """
+        first_token = {
+            model: {
+                "p50": round(self._first_token.percentile(model, 0.5), 3),
+                "p95": round(self._first_token.percentile(model, 0.95), 3)
+            }
+            for model in self._first_token.keys()
+        }
+
+        with self._lock:
+            return {
+                "models": {model: dict(counters) for model, counters in self._counters.items()},
+                "first_token_seconds": first_token,
+                "recent_attempts": list(self._recent)
+            }
+
+
+class RequestPolicy:
+    """Retry and hedging policy for Claude API requests (configured via settings)."""
+
+    def __init__(
+        self,
+        max_retries: Optional[int] = None,
+        base_delay_seconds: Optional[float] = None,
+        max_delay_seconds: Optional[float] = None,
+        hedge_enabled: Optional[bool] = None,
+        hedge_models: Optional[str] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_delay_seconds: Optional[float] = None,
+        hedge_min_samples: Optional[int] = None
+    ) -> None:
+        """
+        Initialize policy (unset arguments default to settings).
+
+        Args:
+            max_retries: Retries after the first attempt for retryable errors
+            base_delay_seconds: Backoff delay before the first retry
+            max_delay_seconds: Upper bound for a single backoff delay
+            hedge_enabled: Whether hedge requests may be sent at all
+            hedge_models: Comma-separated model name fragments eligible for hedging
+            hedge_percentile: Latency percentile that triggers a hedge (e.g. 0.95)
+            hedge_min_delay_seconds: Never hedge earlier than this
+            hedge_min_samples: Latency samples required before hedging a model
+        """
+        self.max_retries = settings.claude_max_retries if max_retries is None else max_retries
+        self.base_delay_seconds = (
+            settings.claude_retry_base_delay_seconds if base_delay_seconds is None else base_delay_seconds
+        )
+        self.max_delay_seconds = (
+            settings.claude_retry_max_delay_seconds if max_delay_seconds is None else max_delay_seconds
+        )
+        self.hedge_enabled = settings.claude_hedge_enabled if hedge_enabled is None else hedge_enabled
+        self.hedge_models = [
+            fragment.strip().lower()
+            for fragment in (settings.claude_hedge_models if hedge_models is None else hedge_models).split(",")
+            if fragment.strip()
+        ]
+        self.hedge_percentile = (
+            settings.claude_hedge_percentile if hedge_percentile is None else hedge_percentile
+        )
+        self.hedge_min_delay_seconds = (
+            settings.claude_hedge_min_delay_seconds if hedge_min_delay_seconds is None else hedge_min_delay_seconds
+        )
+        self.hedge_min_samples = (
+            settings.claude_hedge_min_samples if hedge_min_samples is None else hedge_min_samples
+        )
+
+    def backoff_delay(self, retry: int, error: Optional[BaseException] = None) -> float:
+        """
+        Get the delay before a retry.
+
+        Honors a Retry-After header when the API sends one, otherwise uses
+        exponential backoff with full jitter.
+
+        Args:
+            retry: Retry number (1 = first retry)
+            error: Error that triggered the retry
+
+        Returns:
+            Delay in seconds
+        """
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_delay_seconds)
+            except ValueError:
+                pass
+
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * (2 ** (retry - 1)))
+        return random.uniform(0, ceiling)
+
+    def hedge_delay(
+        self,
+        model: str,
+        tracker: LatencyTracker,
+        size_key: Optional[str] = None
+    ) -> Optional[float]:
+        """
+        Get how long to wait before sending a hedge request.
+
+        Args:
+            model: Claude model name
+            tracker: Latency tracker with recent samples
+            size_key: Call site whose latencies set the delay
+
+        Returns:
+            Delay in seconds, or None if this request should not be hedged
+        """
+        if not self.hedge_enabled:
+            return None
+
+        if not any(fragment in model.lower() for fragment in self.hedge_models):
+            return None
+
+        latency = tracker.percentile(latency_key(model, size_key), self.hedge_percentile, self.hedge_min_samples)
+        if latency is None:
+            return None
+
+        return max(self.hedge_min_delay_seconds, latency)
+
+
+# Singleton instances
+latency_tracker = LatencyTracker()
+first_token_tracker = LatencyTracker()  # streams: time to first text, hedges the first-token wait
+request_metrics = RequestMetrics()
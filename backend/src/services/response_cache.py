@@ -0,0 +1,368 @@
+"""
+Response Cache: Two-tier (memory + SQLite) cache for Claude responses.
+
+During regional surges the same prompts (e.g. hurricane risk for Miami, FL) repeat
+thousands of times. When enabled, responses are cached under a normalized key of
+(model, system, prompt, max_tokens, temperature) with a per-agent TTL. The memory
+tier is a byte-bounded LRU local to the process; the SQLite tier is shared by all
+gunicorn workers and bounded by entry count. Cache hits cost zero tokens. Async
+callers use get_async()/set_async(), which run the SQLite tier in a worker thread.
+
+To keep cache traffic from turning into SQLite writes, a disk hit only refreshes an
+entry's access time when it is older than the touch interval (LRU order only needs
+to be roughly right), and expired/excess entries are evicted at most once per
+eviction interval rather than on every store.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from ..utils.config import settings
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class ResponseCache:
+    """Thread-safe two-tier cache of Claude response texts."""
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        memory_max_bytes: Optional[int] = None,
+        disk_max_entries: Optional[int] = None,
+        touch_interval_seconds: Optional[float] = None,
+        eviction_interval_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Initialize cache (unset arguments default to settings).
+
+        Args:
+            enabled: Whether responses are cached at all
+            memory_max_bytes: Size bound of the in-memory tier
+            disk_max_entries: Entry bound of the SQLite tier
+            touch_interval_seconds: Minimum age of an entry's access time before
+                a disk hit refreshes it
+            eviction_interval_seconds: Minimum time between disk tier evictions
+        """
+        self.enabled = settings.response_cache_enabled if enabled is None else enabled
+        self.memory_max_bytes = (
+            settings.response_cache_memory_max_bytes if memory_max_bytes is None else memory_max_bytes
+        )
+        self.disk_max_entries = (
+            settings.response_cache_disk_max_entries if disk_max_entries is None else disk_max_entries
+        )
+        self.touch_interval_seconds = (
+            settings.response_cache_touch_interval_seconds
+            if touch_interval_seconds is None else touch_interval_seconds
+        )
+        self.eviction_interval_seconds = (
+            settings.response_cache_eviction_interval_seconds
+            if eviction_interval_seconds is None else eviction_interval_seconds
+        )
+        self.agent_ttls = self._parse_ttls(settings.response_cache_ttls)
+        self._last_eviction = 0.0
+
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, tuple[str, float, int]] = OrderedDict()
+        self._memory_bytes = 0
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "bytes_served": 0,
+            "bytes_stored": 0,
+        }
+
+    @staticmethod
+    def _parse_ttls(spec: str) -> dict[str, int]:
+        """
+        Parse per-agent TTLs from "AgentName=seconds,..." format.
+
+        Args:
+            spec: TTL specification string
+
+        Returns:
+            Dict of agent name -> TTL in seconds
+        """
+        ttls = {}
+        for item in spec.split(","):
+            name, _, seconds = item.partition("=")
+            if name.strip() and seconds.strip():
+                try:
+                    ttls[name.strip()] = int(seconds)
+                except ValueError:
+                    logger.warning(f"Ignoring invalid response cache TTL: {item!r}")
+        return ttls
+
+    def ttl_for(self, agent_name: str) -> int:
+        """
+        Get the cache TTL for an agent's Claude calls.
+
+        Args:
+            agent_name: Agent class name
+
+        Returns:
+            TTL in seconds (0 means the agent's responses are not cached)
+        """
+        if not self.enabled:
+            return 0
+        return self.agent_ttls.get(agent_name, settings.response_cache_default_ttl_seconds)
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Collapse whitespace so indentation-only prompt differences share a key."""
+        return " ".join(text.split())
+
+    def make_key(
+        self,
+        model: str,
+        system: str,
+        prompt: str,
+        max_tokens: int,
+        temperature: float
+    ) -> str:
+        """
+        Build a cache key for a Claude request.
+
+        Args:
+            model: Claude model name
+            system: System prompt
+            prompt: User prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps(
+            [model, self._normalize(system), self._normalize(prompt), max_tokens, temperature]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """
+        Get database connection.
+
+        Returns:
+            SQLite connection
+        """
+        from ..api.database import get_db
+
+        return get_db()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response (memory first, then SQLite).
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response text, or None on miss/expiry
+        """
+        now = time.time()
+        text = self._get_memory(key, now)
+        if text is not None:
+            return text
+        return self._get_disk(key, now)
+
+    async def get_async(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response without blocking the event loop on SQLite.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response text, or None on miss/expiry
+        """
+        now = time.time()
+        text = self._get_memory(key, now)
+        if text is not None:
+            return text
+        return await asyncio.to_thread(self._get_disk, key, now)
+
+    def _get_memory(self, key: str, now: float) -> Optional[str]:
+        """Look up the memory tier (None on miss/expiry)."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                text, expires_at, size = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    self._stats["bytes_served"] += size
+                    return text
+                self._drop_memory(key)
+        return None
+
+    def _get_disk(self, key: str, now: float) -> Optional[str]:
+        """Look up the SQLite tier and promote a hit to memory (None on miss/expiry)."""
+        row = None
+        try:
+            conn = self._get_conn()
+            try:
+                row = conn.execute(
+                    "SELECT response_text, expires_at, size_bytes, last_accessed_at FROM claude_response_cache "
+                    "WHERE cache_key = ? AND expires_at > ?",
+                    (key, now)
+                ).fetchone()
+                # hit_count counts the hits that refreshed the access time
+                if row is not None and now - row["last_accessed_at"] >= self.touch_interval_seconds:
+                    conn.execute(
+                        "UPDATE claude_response_cache SET last_accessed_at = ?, hit_count = hit_count + 1 "
+                        "WHERE cache_key = ?",
+                        (now, key)
+                    )
+                    conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache disk lookup failed: {e}")
+
+        with self._lock:
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            self._stats["disk_hits"] += 1
+            self._stats["bytes_served"] += row["size_bytes"]
+            self._put_memory(key, row["response_text"], row["expires_at"], row["size_bytes"])
+
+        return row["response_text"]
+
+    def set(self, key: str, model: str, text: str, ttl: int) -> None:
+        """
+        Store a response in both tiers.
+
+        Args:
+            key: Cache key from make_key()
+            model: Claude model name (kept for inspection)
+            text: Response text
+            ttl: Time to live in seconds
+        """
+        if ttl <= 0:
+            return
+
+        now = time.time()
+        self._set_memory(key, text, now + ttl)
+        self._set_disk(key, model, text, now, now + ttl)
+
+    async def set_async(self, key: str, model: str, text: str, ttl: int) -> None:
+        """
+        Store a response in both tiers without blocking the event loop on SQLite.
+
+        Args:
+            key: Cache key from make_key()
+            model: Claude model name (kept for inspection)
+            text: Response text
+            ttl: Time to live in seconds
+        """
+        if ttl <= 0:
+            return
+
+        now = time.time()
+        self._set_memory(key, text, now + ttl)
+        await asyncio.to_thread(self._set_disk, key, model, text, now, now + ttl)
+
+    def _set_memory(self, key: str, text: str, expires_at: float) -> None:
+        """Store a response in the memory tier."""
+        size = len(text.encode("utf-8"))
+
+        with self._lock:
+            self._put_memory(key, text, expires_at, size)
+            self._stats["stores"] += 1
+            self._stats["bytes_stored"] += size
+
+    def _set_disk(self, key: str, model: str, text: str, now: float, expires_at: float) -> None:
+        """Store a response in the SQLite tier, evicting to its entry bound when due."""
+        size = len(text.encode("utf-8"))
+
+        try:
+            conn = self._get_conn()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO claude_response_cache ("
+                    "cache_key, model, response_text, size_bytes, created_at, expires_at, last_accessed_at"
+                    ") VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, model, text, size, now, expires_at, now)
+                )
+
+                evicted = 0
+                with self._lock:
+                    evict = now - self._last_eviction >= self.eviction_interval_seconds
+                    if evict:
+                        self._last_eviction = now
+
+                if evict:
+                    # Drop expired entries, then the least recently used beyond the bound
+                    evicted = conn.execute(
+                        "DELETE FROM claude_response_cache WHERE expires_at <= ?", (now,)
+                    ).rowcount
+                    evicted += conn.execute(
+                        "DELETE FROM claude_response_cache WHERE cache_key IN ("
+                        "SELECT cache_key FROM claude_response_cache "
+                        "ORDER BY last_accessed_at DESC LIMIT -1 OFFSET ?)",
+                        (self.disk_max_entries,)
+                    ).rowcount
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache disk store failed: {e}")
+            return
+
+        if evicted:
+            with self._lock:
+                self._stats["evictions"] += evicted
+
+    def _put_memory(self, key: str, text: str, expires_at: float, size: int) -> None:
+        """Insert into the memory LRU and evict to its size bound (caller holds the lock)."""
+        if size > self.memory_max_bytes:
+            return
+
+        self._drop_memory(key)
+        self._memory[key] = (text, expires_at, size)
+        self._memory_bytes += size
+
+        while self._memory_bytes > self.memory_max_bytes:
+            _, (_, _, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self._stats["evictions"] += 1
+
+    def _drop_memory(self, key: str) -> None:
+        """Remove a key from the memory tier (caller holds the lock)."""
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry[2]
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with hit/miss counters, bytes served/stored and memory usage
+        """
+        with self._lock:
+            lookups = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            return {
+                "enabled": self.enabled,
+                **self._stats,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes
+            }
+
+
+# Singleton instance
+response_cache = ResponseCache()
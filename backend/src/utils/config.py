@@ -23,11 +23,96 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///prepsmart.db"
+    database_journal_mode: str = "WAL"
+    database_synchronous: str = "NORMAL"
+    database_busy_timeout_ms: int = 5000
+    database_cache_size_kib: int = 8192
+    database_mmap_size_mb: int = 0  # 0 disables memory-mapped I/O
+    database_pool_size: int = 4  # idle connections kept per thread
+    blackboard_compression_enabled: bool = True
+    blackboard_compression_min_bytes: int = 2048  # smaller JSON values stay plain text
+    blackboard_compression_level: int = 6  # zlib level, 1 (fastest) to 9 (smallest)
 
     # Agent Configuration
     agent_timeout: int = 30
     max_concurrent_tasks: int = 10
 
+    # Plan Deadline (end-to-end SLO shared by all agents and Claude calls)
+    plan_deadline_seconds: float = 45.0
+    min_claude_budget_seconds: float = 5.0
+
+    # Claude Request Policy (retries with backoff, hedging of slow requests)
+    claude_max_retries: int = 2
+    claude_retry_base_delay_seconds: float = 0.5
+    claude_retry_max_delay_seconds: float = 8.0
+    claude_hedge_enabled: bool = True
+    claude_hedge_models: str = "haiku"
+    claude_hedge_percentile: float = 0.95
+    claude_hedge_min_delay_seconds: float = 1.0
+    claude_hedge_min_samples: int = 20
+
+    # Claude Request Sharing (single-flight of identical requests, provider-side prompt caching)
+    claude_single_flight_enabled: bool = True
+    claude_prompt_caching_enabled: bool = True
+
+    # Claude Streaming (live agent progress from streamed output tokens)
+    claude_streaming_enabled: bool = True
+    progress_update_interval_seconds: float = 1.0
+
+    # Claude Output Budgets (max_tokens sized from observed output lengths per agent)
+    claude_adaptive_max_tokens_enabled: bool = True
+    claude_max_tokens_percentile: float = 0.99
+    claude_max_tokens_headroom: float = 0.25
+    claude_max_tokens_min_samples: int = 20
+    claude_max_tokens_floor: int = 256
+    claude_max_output_tokens: int = 8192
+    claude_truncation_retry_enabled: bool = True
+
+    # Claude Rate Limits (per model family "fragment=RPM:TPM", shared by all workers)
+    claude_rate_limit_enabled: bool = True
+    claude_rate_limits: str = "haiku=1000:400000,sonnet=1000:160000"
+    claude_rate_limit_sync_seconds: float = 1.0  # longest a worker serves from its share unsynced
+    claude_rate_limit_share_fraction: float = 0.05  # budget taken per sync, fraction of capacity
+
+    # LLM Backend ("anthropic", or "replay" of recorded responses for load testing)
+    llm_backend: str = "anthropic"
+    llm_record_path: Optional[str] = None
+    llm_replay_path: str = "llm_recordings.jsonl"
+    llm_replay_latency: str = "recorded"  # recorded, fixed:S, uniform:MIN:MAX, lognormal:MEDIAN:SIGMA
+    llm_replay_error_rate: float = 0.0
+    llm_replay_error_statuses: str = "429,529"
+
+    # Claude Response Cache (opt-in; TTLs as "AgentName=seconds,...", 0 disables)
+    response_cache_enabled: bool = False
+    response_cache_ttls: str = "RiskAssessmentAgent=21600,SupplyPlanningAgent=86400"
+    response_cache_default_ttl_seconds: int = 0
+    response_cache_memory_max_bytes: int = 32 * 1024 * 1024
+    response_cache_disk_max_entries: int = 10000
+    response_cache_touch_interval_seconds: float = 300.0  # disk hits refresh older access times only
+    response_cache_eviction_interval_seconds: float = 60.0
+
+    # Area Risk Reuse (share natural disaster risk assessments within an area)
+    area_risk_reuse_enabled: bool = False
+    area_risk_max_age_seconds: int = 21600
+    area_risk_bucketing: str = "city"  # "city" or "geohash"
+    area_risk_geohash_precision: int = 4
+    area_risk_touch_interval_seconds: float = 300.0  # hit counts are written at most this often per area
+
+    # Plan Job Queue
+    max_queued_tasks: int = 100
+    job_poll_interval_seconds: float = 1.0
+    job_lease_seconds: int = 60
+    max_job_attempts: int = 3
+
+    # Async Runtime (persistent event loops that run coordinator coroutines)
+    async_runtime_loops: int = 2
+
+    # Health Monitor (background prober behind /api/health/ready)
+    health_probe_interval_seconds: float = 30.0
+    health_claude_probe_interval_seconds: float = 900.0  # live call only when idle; 0 disables
+    health_error_window_seconds: float = 300.0
+    internal_stats_token: Optional[str] = None  # unset disables /api/internal/stats
+
     # Logging
     log_level: str = "INFO"
 
@@ -0,0 +1,58 @@
+"""Deadline tracking for bounded-time plan generation."""
+
+import time
+from typing import Optional
+
+
+class Deadline:
+    """
+    Absolute deadline shared by every agent and Claude call of one task.
+
+    Uses a monotonic clock, so it is unaffected by wall-clock adjustments.
+    """
+
+    def __init__(self, seconds: float):
+        """
+        Initialize deadline.
+
+        Args:
+            seconds: Time budget from now, in seconds
+        """
+        self.budget_seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """
+        Get remaining time budget.
+
+        Returns:
+            Seconds until the deadline (0 if already expired)
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """
+        Check whether the deadline has passed.
+
+        Returns:
+            True if no time budget remains
+        """
+        return self.remaining() <= 0
+
+    def timeout(self, cap: Optional[float] = None, grace: float = 0.0) -> float:
+        """
+        Get a timeout for an operation that must finish within the deadline.
+
+        Args:
+            cap: Upper bound for the timeout (e.g. a per-agent limit)
+            grace: Extra seconds allowed past the deadline (e.g. to build a fallback)
+
+        Returns:
+            Timeout in seconds
+        """
+        timeout = self.remaining() + grace
+        return min(timeout, cap) if cap is not None else timeout
+
+    def __repr__(self) -> str:
+        """Readable representation for logs."""
+        return f"Deadline(remaining={self.remaining():.1f}s of {self.budget_seconds:.1f}s)"
@@ -0,0 +1,90 @@
+"""Incremental extraction of top-level JSON fields from a streamed response."""
+
+import json
+from typing import Any
+
+_WHITESPACE = " \t\r\n"
+
+
+class JsonFieldScanner:
+    """
+    Pull completed top-level fields out of a JSON object while it is still streaming.
+
+    Claude responses are a single JSON object, possibly wrapped in a markdown code
+    block. Feed text deltas as they arrive; each call returns the key/value pairs
+    that became complete. Scalars are complete once the character after them has
+    arrived (so "8" is not mistaken for "85"), arrays and objects once they close.
+    """
+
+    def __init__(self) -> None:
+        """Initialize scanner."""
+        self.fields: dict[str, Any] = {}
+        self._buffer = ""
+        self._pos: int = -1  # position after the last complete pair (-1: object not started)
+        self._done = False
+        self._decoder = json.JSONDecoder()
+
+    @property
+    def done(self) -> bool:
+        """Whether the top-level object has closed (later text is ignored)."""
+        return self._done
+
+    def _skip(self, pos: int, chars: str) -> int:
+        """Advance past any of the given characters."""
+        while pos < len(self._buffer) and self._buffer[pos] in chars:
+            pos += 1
+        return pos
+
+    def feed(self, text: str) -> dict[str, Any]:
+        """
+        Add streamed text and extract newly completed fields.
+
+        Args:
+            text: Next text delta of the response
+
+        Returns:
+            Fields completed by this delta (also accumulated in self.fields)
+        """
+        if self._done:
+            return {}
+        self._buffer += text
+
+        if self._pos < 0:
+            start = self._buffer.find("{")
+            if start < 0:
+                return {}
+            self._pos = start + 1
+
+        completed = {}
+        while True:
+            pos = self._skip(self._pos, _WHITESPACE + ",")
+            if pos >= len(self._buffer):
+                break
+            if self._buffer[pos] == "}":
+                self._done = True
+                break
+
+            try:
+                key, pos = self._decoder.raw_decode(self._buffer, pos)
+            except ValueError:
+                break
+
+            pos = self._skip(pos, _WHITESPACE)
+            if pos >= len(self._buffer) or self._buffer[pos] != ":":
+                break
+            pos = self._skip(pos + 1, _WHITESPACE)
+
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, pos)
+            except ValueError:
+                break
+
+            # A number or literal at the very end of the buffer may still continue
+            if end >= len(self._buffer) and not isinstance(value, (str, list, dict)):
+                break
+
+            completed[key] = value
+            self._pos = end
+
+        self.fields.update(completed)
+        return completed
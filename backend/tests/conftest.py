@@ -0,0 +1,22 @@
+"""Shared pytest setup: test settings and a throwaway SQLite database."""
+
+import os
+import tempfile
+
+# Settings are read at import time, so configure them before anything imports src
+_db_dir = tempfile.mkdtemp(prefix="prepsmart-tests-")
+os.environ.setdefault("CLAUDE_API_KEY", "sk-test")
+os.environ.setdefault("FLASK_SECRET_KEY", "test-secret")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+
+import pytest  # noqa: E402
+
+from src.api.database import init_db  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create the schema once for the whole test session."""
+    init_db()
+    yield
@@ -0,0 +1,95 @@
+"""Scripted stand-ins for the plan agents, for coordinator tests."""
+
+import asyncio
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, Union
+
+from src.agents.agent_registry import AgentRegistry
+from src.agents.base_agent import BaseAgent
+from src.models.agent_output import AGENT_OUTPUT_FIELDS, AgentOutput
+from src.models.blackboard import Blackboard
+from src.services.blackboard_service import blackboard_service
+
+
+@dataclass
+class Step:
+    """Scripted run of one agent."""
+
+    delay: float = 0.0
+    # Output fields, or a callable building them from the agent's blackboard snapshot
+    fields: Optional[Union[dict[str, Any], Callable[[Blackboard], dict[str, Any]]]] = None
+    error: Optional[str] = None
+    early: Optional[dict[str, Any]] = None
+    early_delay: float = 0.0
+    on_start: Optional[Callable[[Blackboard], None]] = None
+    tokens_used: int = 10
+
+
+@dataclass
+class Trace:
+    """What the scripted agents did, in order."""
+
+    events: list[tuple[str, str]] = field(default_factory=list)
+    snapshots: dict[str, list[Blackboard]] = field(default_factory=dict)
+
+    def index(self, event: str, agent_name: str) -> int:
+        """Position of the first (event, agent_name) entry."""
+        return self.events.index((event, agent_name))
+
+    def count(self, event: str, agent_name: str) -> int:
+        """Number of (event, agent_name) entries."""
+        return self.events.count((event, agent_name))
+
+
+class ScriptedAgent(BaseAgent):
+    """Agent that follows its Step instead of calling Claude."""
+
+    steps: dict[str, Step] = {}
+    trace: Trace = Trace()
+
+    async def process(self, blackboard: Blackboard) -> AgentOutput:
+        name = self.agent_class_name
+        step = self.steps.get(name, Step())
+        self.trace.events.append(("start", name))
+        self.trace.snapshots.setdefault(name, []).append(blackboard)
+        if step.on_start is not None:
+            step.on_start(blackboard)
+
+        if step.early is not None:
+            await asyncio.sleep(step.early_delay)
+            self.publish_early_output(**step.early)
+
+        await asyncio.sleep(step.delay)
+        self.trace.events.append(("finish", name))
+        if step.error is not None:
+            raise RuntimeError(step.error)
+
+        fields = step.fields(blackboard) if callable(step.fields) else step.fields
+        if fields is None:
+            fields = {AGENT_OUTPUT_FIELDS[name][0]: {"by": name}}
+        return AgentOutput(agent_name=name, fields=fields, tokens_used=step.tokens_used)
+
+
+class ScriptedRegistry(AgentRegistry):
+    """Registry whose agents are ScriptedAgent subclasses named like the real agents."""
+
+    def __init__(self, steps: dict[str, Step], trace: Trace) -> None:
+        self.AGENT_CLASSES = {
+            name: type(name, (ScriptedAgent,), {"steps": steps, "trace": trace})
+            for name in AgentRegistry.AGENT_CLASSES
+        }
+        super().__init__()
+
+
+def create_plan_blackboard(crisis_mode: str = "natural_disaster") -> Blackboard:
+    """Create and persist a blackboard for a new plan."""
+    return blackboard_service.create_blackboard({
+        "task_id": f"test-{uuid.uuid4().hex[:12]}",
+        "crisis_mode": crisis_mode,
+        "specific_threat": "hurricane" if crisis_mode == "natural_disaster" else "job_loss",
+        "location": {"city": "Miami", "state": "FL", "zip_code": "33101"},
+        "household": {"adults": 2, "children": 1, "pets": 0},
+        "housing_type": "house",
+        "budget_tier": 100
+    })
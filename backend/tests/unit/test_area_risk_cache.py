@@ -0,0 +1,154 @@
+"""Unit tests for area-level risk assessment reuse."""
+
+import asyncio
+import uuid
+
+import pytest
+
+from src.agents.risk_assessment_agent import RiskAssessmentAgent
+from src.api.database import get_db
+from src.services.area_risk_cache import AreaRiskCache, area_risk_cache
+from src.services.claude_client import ClaudeClient
+
+ASSESSMENT = {
+    "overall_risk_level": "HIGH",
+    "severity_score": 80,
+    "task_id": "task-first",
+    "generated_at": "2026-10-17T00:00:00Z",
+    "location": "Miami, FL"
+}
+
+
+def _location(**fields) -> dict:
+    """Location in a city no other test uses."""
+    return {"city": f"Testville {uuid.uuid4().hex[:8]}", "state": "FL", **fields}
+
+
+def _stored(key: str) -> dict:
+    """Read an area_risk_assessments row."""
+    conn = get_db()
+    try:
+        return dict(conn.execute("SELECT * FROM area_risk_assessments WHERE area_key = ?", (key,)).fetchone())
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+def test_area_key_normalizes_city_names():
+    cache = AreaRiskCache(enabled=True, bucketing="city")
+
+    key = cache.area_key("Hurricane ", {"city": "St. Petersburg", "state": "fl"})
+
+    assert key == "hurricane|FL|city:saint petersburg"
+    assert cache.area_key("hurricane", {"city": "Saint  Petersburg", "state": "FL"}) == key
+    assert cache.area_key("hurricane", {"city": "City of Miami", "state": "FL"}) == "hurricane|FL|city:miami"
+    assert cache.area_key("hurricane", {"city": "Miami", "state": ""}) is None
+
+
+@pytest.mark.unit
+def test_area_key_buckets_nearby_coordinates_by_geohash():
+    cache = AreaRiskCache(enabled=True, bucketing="geohash", geohash_precision=4)
+
+    downtown = cache.area_key("flood", {"city": "Miami", "state": "FL", "latitude": 25.77, "longitude": -80.19})
+    nearby = cache.area_key("flood", {"city": "Coral Way", "state": "FL", "latitude": 25.75, "longitude": -80.25})
+    elsewhere = cache.area_key("flood", {"city": "Tampa", "state": "FL", "latitude": 27.95, "longitude": -82.46})
+
+    assert downtown == nearby == "flood|FL|geo:dhwf"
+    assert elsewhere != downtown
+    # Without coordinates the city is used
+    assert cache.area_key("flood", {"city": "Miami", "state": "FL"}) == "flood|FL|city:miami"
+
+
+@pytest.mark.unit
+def test_stored_assessments_drop_user_fields_and_expire():
+    cache = AreaRiskCache(enabled=True, max_age_seconds=60, bucketing="city")
+    location = _location()
+
+    key = cache.put("hurricane", location, ASSESSMENT, "task-first")
+    reused = cache.get("hurricane", location)
+
+    assert reused["overall_risk_level"] == "HIGH"
+    assert not {"task_id", "generated_at", "location"} & set(reused)
+    assert reused["area_assessment"]["area_key"] == key
+    assert _stored(key)["source_task_id"] == "task-first"
+
+    conn = get_db()
+    conn.execute("UPDATE area_risk_assessments SET assessed_at = assessed_at - 61 WHERE area_key = ?", (key,))
+    conn.commit()
+    conn.close()
+
+    assert cache.get("hurricane", location) is None
+    assert cache.get_stats() == {"enabled": True, "hits": 1, "misses": 1, "stores": 1}
+
+
+@pytest.mark.unit
+def test_disabled_cache_is_never_read():
+    location = _location()
+    AreaRiskCache(enabled=True).put("hurricane", location, ASSESSMENT)
+
+    assert AreaRiskCache(enabled=False).get("hurricane", location) is None
+    assert asyncio.run(AreaRiskCache(enabled=False).get_async("hurricane", location)) is None
+
+
+@pytest.mark.unit
+def test_hit_counts_are_written_at_most_once_per_touch_interval():
+    cache = AreaRiskCache(enabled=True, bucketing="city", touch_interval_seconds=300)
+    location = _location()
+    key = asyncio.run(cache.put_async("hurricane", location, ASSESSMENT))
+
+    for _ in range(5):
+        assert asyncio.run(cache.get_async("hurricane", location)) is not None
+
+    assert _stored(key)["hit_count"] == 1
+
+    # Once the interval has passed, the hits counted meanwhile are written together
+    cache.touch_interval_seconds = 0
+    cache.get("hurricane", location)
+    assert _stored(key)["hit_count"] == 6
+
+
+def _agent(monkeypatch, assessments: list[tuple[dict, bool]]):
+    """Risk agent whose Claude assessments are scripted (records each call)."""
+    agent = RiskAssessmentAgent(ClaudeClient())
+    calls = []
+
+    async def assess(location, threat, task_id):
+        calls.append(task_id)
+        assessment, reusable = assessments[len(calls) - 1]
+        return dict(assessment), reusable
+
+    monkeypatch.setattr(agent, "_assess_natural_disaster", assess)
+    monkeypatch.setattr(area_risk_cache, "enabled", True)
+    return agent, calls
+
+
+@pytest.mark.unit
+def test_reused_assessments_are_personalized_for_each_user(monkeypatch):
+    agent, calls = _agent(monkeypatch, [(ASSESSMENT, True)])
+    location = _location(task_id="task-second")
+    profile = {"location": location, "specific_threat": "hurricane"}
+
+    asyncio.run(agent._process_natural_disaster(profile, "task-first"))
+    reused = asyncio.run(agent._process_natural_disaster(profile, "task-second"))
+
+    assert calls == ["task-first"]
+    assert reused["overall_risk_level"] == "HIGH"
+    assert reused["task_id"] == "task-second"
+    assert reused["location"] == f"{location['city']}, FL"
+    assert reused["generated_at"] != ASSESSMENT["generated_at"]
+    assert reused["crisis_mode"] == "natural_disaster"
+    assert "area_assessment" in reused
+
+
+@pytest.mark.unit
+def test_fallback_assessments_are_not_reused(monkeypatch):
+    fallback = {"overall_risk_level": "MODERATE", "fallback": True}
+    agent, calls = _agent(monkeypatch, [(fallback, False), (ASSESSMENT, True)])
+    profile = {"location": _location(), "specific_threat": "hurricane"}
+
+    first = asyncio.run(agent._process_natural_disaster(profile, "task-first"))
+    second = asyncio.run(agent._process_natural_disaster(profile, "task-second"))
+
+    assert first["overall_risk_level"] == "MODERATE"
+    assert second["overall_risk_level"] == "HIGH"
+    assert calls == ["task-first", "task-second"]
@@ -0,0 +1,215 @@
+"""Unit tests for blackboard persistence."""
+
+import asyncio
+
+import pytest
+
+from src.agents.coordinator_agent import CoordinatorAgent
+from src.api.database import get_db
+from src.services.blackboard_service import blackboard_service
+from src.services.claude_client import ClaudeClient
+
+from .agent_fakes import ScriptedRegistry, Step, Trace, create_plan_blackboard
+
+
+def _row(task_id: str) -> dict:
+    """Read a raw blackboards row."""
+    conn = get_db()
+    try:
+        return dict(conn.execute("SELECT * FROM blackboards WHERE task_id = ?", (task_id,)).fetchone())
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+def test_each_agent_output_is_committed_when_it_completes():
+    seen = {}
+
+    def read_database(snapshot):
+        seen["stored"] = blackboard_service.get_blackboard(snapshot.task_id)
+
+    steps = {
+        "RiskAssessmentAgent": Step(fields={"risk_assessment": {"overall_risk_level": "HIGH"}}),
+        "DocumentationAgent": Step(on_start=read_database),
+    }
+    coordinator = CoordinatorAgent(ClaudeClient(), registry=ScriptedRegistry(steps, Trace()))
+    asyncio.run(coordinator.run_agents(create_plan_blackboard()))
+
+    # Before the last agent finishes, everything that came before is readable
+    stored = seen["stored"]
+    assert stored.risk_assessment == {"overall_risk_level": "HIGH"}
+    assert stored.supply_plan == {"by": "SupplyPlanningAgent"}
+    assert stored.resource_locations == {"by": "ResourceLocatorAgent"}
+    assert sorted(stored.agents_completed) == [
+        "ResourceLocatorAgent", "RiskAssessmentAgent", "SupplyPlanningAgent", "VideoCuratorAgent"
+    ]
+    assert stored.total_tokens_used == 40
+    assert stored.complete_plan is None
+
+
+@pytest.mark.unit
+def test_update_fields_writes_only_the_given_columns():
+    blackboard = create_plan_blackboard()
+    blackboard.risk_assessment = {"overall_risk_level": "LOW"}
+    blackboard.supply_plan = {"items": ["water"]}
+    created = _row(blackboard.task_id)["updated_at"]
+
+    blackboard_service.update_fields(blackboard, ["risk_assessment"])
+
+    row = _row(blackboard.task_id)
+    assert row["risk_assessment_json"] == '{"overall_risk_level": "LOW"}'
+    assert row["supply_plan_json"] is None
+    assert row["updated_at"] > created
+    # The unwritten change stays pending
+    assert blackboard.dirty_fields() == ["supply_plan"]
+
+
+@pytest.mark.unit
+def test_update_fields_rejects_fields_without_a_column():
+    blackboard = create_plan_blackboard()
+
+    with pytest.raises(ValueError, match="task_id"):
+        blackboard_service.update_fields(blackboard, ["task_id"])
+
+
+@pytest.mark.unit
+def test_loaded_blackboard_starts_clean_and_tracks_in_place_changes():
+    task_id = create_plan_blackboard().task_id
+    blackboard = blackboard_service.get_blackboard(task_id)
+    assert blackboard.dirty_fields() == []
+
+    blackboard.agents_completed.append("VideoCuratorAgent")
+    blackboard.errors.append({"agent": "VideoCuratorAgent"})
+    blackboard.status = "processing"
+
+    assert blackboard.dirty_fields() == ["status", "agents_completed", "errors"]
+
+    blackboard.mark_clean(["status"])
+    assert blackboard.dirty_fields() == ["agents_completed", "errors"]
+
+
+@pytest.mark.unit
+def test_update_blackboard_writes_only_dirty_columns():
+    task_id = create_plan_blackboard().task_id
+    blackboard = blackboard_service.get_blackboard(task_id)
+
+    # Written by someone else after this copy was loaded
+    conn = get_db()
+    conn.execute("UPDATE blackboards SET pdf_path = 'other.pdf' WHERE task_id = ?", (task_id,))
+    conn.commit()
+    conn.close()
+
+    blackboard.status = "processing"
+    blackboard_service.update_blackboard(blackboard)
+
+    row = _row(task_id)
+    assert row["status"] == "processing"
+    assert row["pdf_path"] == "other.pdf"
+    assert blackboard.dirty_fields() == []
+
+
+@pytest.mark.unit
+def test_update_blackboard_skips_the_write_when_nothing_changed():
+    blackboard = create_plan_blackboard()
+    before = _row(blackboard.task_id)
+
+    blackboard_service.update_blackboard(blackboard)
+
+    assert _row(blackboard.task_id) == before
+
+
+@pytest.mark.unit
+def test_snapshot_changes_do_not_dirty_the_original():
+    blackboard = create_plan_blackboard()
+
+    snapshot = blackboard.snapshot()
+    snapshot.agents_completed.append("Intruder")
+    snapshot.status = "failed"
+
+    assert blackboard.dirty_fields() == []
+    assert blackboard.agents_completed == []
+
+
+def _corrupt(task_id: str, column: str, value) -> None:
+    """Overwrite a raw column value."""
+    conn = get_db()
+    conn.execute(f"UPDATE blackboards SET {column} = ? WHERE task_id = ?", (value, task_id))
+    conn.commit()
+    conn.close()
+
+
+@pytest.mark.unit
+def test_view_decodes_only_the_fields_that_are_read():
+    blackboard = create_plan_blackboard()
+    blackboard.supply_plan = {"items": ["water"]}
+    blackboard.status = "processing"
+    blackboard_service.update_blackboard(blackboard)
+    _corrupt(blackboard.task_id, "risk_assessment_json", "{not json")
+
+    view = blackboard_service.get_view(blackboard.task_id)
+
+    # The unreadable column is never parsed unless it is read
+    assert view.status == "processing"
+    assert view.supply_plan == {"items": ["water"]}
+    assert view.supply_plan is view.supply_plan
+    with pytest.raises(ValueError):
+        view.risk_assessment
+
+
+@pytest.mark.unit
+def test_view_of_selected_fields_loads_only_their_columns():
+    blackboard = create_plan_blackboard()
+
+    view = blackboard_service.get_view(blackboard.task_id, ["status", "pdf_path"])
+
+    assert view.task_id == blackboard.task_id
+    assert view.status == "initialized"
+    assert view.pdf_path is None
+    with pytest.raises(AttributeError, match="not loaded"):
+        view.supply_plan
+    with pytest.raises(ValueError):
+        blackboard_service.get_view(blackboard.task_id, ["no_such_field"])
+    assert blackboard_service.get_view("missing-task") is None
+
+
+@pytest.mark.unit
+def test_view_hydrates_the_same_blackboard_as_a_full_load():
+    blackboard = create_plan_blackboard()
+    blackboard.risk_assessment = {"overall_risk_level": "HIGH"}
+    blackboard.agents_completed.append("RiskAssessmentAgent")
+    blackboard_service.update_blackboard(blackboard)
+
+    hydrated = blackboard_service.get_view(blackboard.task_id).to_blackboard()
+
+    assert hydrated.to_dict() == blackboard_service.get_blackboard(blackboard.task_id).to_dict()
+    assert hydrated.dirty_fields() == []
+
+
+@pytest.mark.unit
+def test_untrusted_reads_validate_rows_that_trusted_reads_accept():
+    blackboard = create_plan_blackboard()
+    _corrupt(blackboard.task_id, "total_tokens_used", "lots")
+
+    assert blackboard_service.get_blackboard(blackboard.task_id).total_tokens_used == "lots"
+    assert blackboard_service.get_view(blackboard.task_id).total_tokens_used == "lots"
+
+    with pytest.raises(ValueError):
+        blackboard_service.get_blackboard(blackboard.task_id, trusted=False)
+    with pytest.raises(ValueError):
+        blackboard_service.get_view(blackboard.task_id, trusted=False).total_tokens_used
+    assert blackboard_service.get_view(blackboard.task_id, trusted=False).status == "initialized"
+
+
+@pytest.mark.unit
+def test_list_views_and_blackboards_filter_by_status():
+    blackboard = create_plan_blackboard()
+    blackboard.status = "completed"
+    blackboard_service.update_blackboard(blackboard)
+
+    views = blackboard_service.list_views(status="completed", limit=1000)
+    listed = blackboard_service.list_blackboards(status="completed", limit=1000)
+
+    assert blackboard.task_id in [view.task_id for view in views]
+    assert blackboard.task_id in [item.task_id for item in listed]
+    assert {view.status for view in views} == {"completed"}
+    assert all(item.dirty_fields() == [] for item in listed)
@@ -0,0 +1,155 @@
+"""Unit tests for streamed Claude calls: hedging of the first token and single-flight."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.claude_client import ClaudeClient
+from src.services.request_policy import RequestPolicy, first_token_tracker, latency_key
+
+MODEL = "claude-3-5-haiku-test"
+
+
+def _message(text: str) -> SimpleNamespace:
+    """Build a minimal Anthropic Message."""
+    return SimpleNamespace(
+        content=[SimpleNamespace(text=text)],
+        usage=SimpleNamespace(input_tokens=10, output_tokens=5),
+        stop_reason="end_turn"
+    )
+
+
+class _FakeStream:
+    """Stream that waits before its first chunk, like a slow time to first token."""
+
+    def __init__(self, text: str, delay: float) -> None:
+        self.text = text
+        self.delay = delay
+
+    async def __aenter__(self) -> "_FakeStream":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+    @property
+    def text_stream(self):
+        async def chunks():
+            await asyncio.sleep(self.delay)
+            for word in self.text.split(" "):
+                yield word + " "
+        return chunks()
+
+    async def get_final_message(self) -> SimpleNamespace:
+        return _message(self.text)
+
+
+class FakeBackend:
+    """Backend that replays scripted (text, delay) responses and counts calls."""
+
+    name = "fake"
+
+    def __init__(self, script: list[tuple[str, float]]) -> None:
+        self.script = list(script)
+        self.stream_calls = 0
+        self.create_calls = 0
+
+    def stream(self, **params) -> _FakeStream:
+        self.stream_calls += 1
+        text, delay = self.script.pop(0)
+        return _FakeStream(text, delay)
+
+    async def create_async(self, **params) -> SimpleNamespace:
+        self.create_calls += 1
+        text, delay = self.script.pop(0)
+        await asyncio.sleep(delay)
+        return _message(text)
+
+    def get_stats(self) -> dict:
+        return {}
+
+
+async def _final_event(client: ClaudeClient, prompt: str, **kwargs) -> dict:
+    """Consume a stream and return its final event."""
+    async for event in client.generate_stream(prompt, **kwargs):
+        if event["type"] == "final":
+            return event
+    raise AssertionError("stream ended without a final event")
+
+
+@pytest.mark.unit
+def test_stream_with_late_first_token_is_hedged():
+    backend = FakeBackend([("slow primary", 2.0), ("fast hedge", 0.01)])
+    policy = RequestPolicy(
+        hedge_enabled=True, hedge_models="haiku", hedge_min_samples=1, hedge_min_delay_seconds=0.05
+    )
+    client = ClaudeClient(model=MODEL, policy=policy, backend=backend)
+
+    size_key = "test-hedged-stream"
+    first_token_tracker.record(latency_key(MODEL, size_key), 0.01)
+
+    start = time.monotonic()
+    final = asyncio.run(_final_event(client, "hedge me", size_key=size_key))
+    elapsed = time.monotonic() - start
+
+    assert backend.stream_calls == 2
+    assert final["text"].strip() == "fast hedge"
+    assert final["tokens_used"] > 0
+    assert elapsed < 1.0
+
+
+@pytest.mark.unit
+def test_stream_without_latency_history_is_not_hedged():
+    backend = FakeBackend([("only stream", 0.1)])
+    policy = RequestPolicy(
+        hedge_enabled=True, hedge_models="haiku", hedge_min_samples=1, hedge_min_delay_seconds=0.05
+    )
+    client = ClaudeClient(model=MODEL, policy=policy, backend=backend)
+
+    final = asyncio.run(_final_event(client, "no history", size_key="test-unseen-stream"))
+
+    assert backend.stream_calls == 1
+    assert final["text"].strip() == "only stream"
+
+
+@pytest.mark.unit
+def test_identical_streams_and_calls_share_one_request():
+    backend = FakeBackend([("shared answer", 0.2)])
+    client = ClaudeClient(model=MODEL, policy=RequestPolicy(hedge_enabled=False), backend=backend)
+
+    async def run():
+        leader = asyncio.ensure_future(_final_event(client, "same prompt", system="sys"))
+        await asyncio.sleep(0.05)
+        return await asyncio.gather(
+            leader,
+            _final_event(client, "same prompt", system="sys"),
+            client.generate_async("same prompt", system="sys")
+        )
+
+    leader, stream_follower, (call_text, call_tokens, call_cost) = asyncio.run(run())
+
+    assert backend.stream_calls == 1
+    assert backend.create_calls == 0
+    assert leader["tokens_used"] > 0
+    assert stream_follower["text"] == leader["text"]
+    assert stream_follower["tokens_used"] == 0
+    assert stream_follower["stop_reason"] == "coalesced"
+    assert call_text == leader["text"]
+    assert (call_tokens, call_cost) == (0, 0.0)
+
+
+@pytest.mark.unit
+def test_timeout_without_own_deadline_surfaces_as_timeout():
+    class ExpiringBackend(FakeBackend):
+        async def create_async(self, **params) -> SimpleNamespace:
+            self.create_calls += 1
+            raise asyncio.TimeoutError()
+
+    backend = ExpiringBackend([])
+    client = ClaudeClient(model=MODEL, policy=RequestPolicy(max_retries=0, hedge_enabled=False), backend=backend)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(client.generate_async("expires upstream", system="sys"))
+    assert backend.create_calls == 1
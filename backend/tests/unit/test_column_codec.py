@@ -0,0 +1,139 @@
+"""Unit tests for compressed blackboard column storage."""
+
+import json
+
+import pytest
+
+from src.api.database import get_db
+from src.cli.compress_blackboards import migrate
+from src.services.blackboard_service import blackboard_service
+from src.services.column_codec import COMPRESSED_MARKER, ColumnCodec
+
+from .agent_fakes import create_plan_blackboard
+
+LARGE_PLAN = {"items": [{"name": f"item {i}", "quantity": i, "notes": "keep dry"} for i in range(200)]}
+
+
+def _column(task_id: str, column: str):
+    """Read a raw column value."""
+    conn = get_db()
+    try:
+        return conn.execute(f"SELECT {column} FROM blackboards WHERE task_id = ?", (task_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.unit
+def test_large_values_round_trip_compressed():
+    codec = ColumnCodec(enabled=True, min_bytes=100, level=6)
+    text = json.dumps(LARGE_PLAN)
+
+    stored = codec.encode(text, "supply_plan_json")
+
+    assert isinstance(stored, bytes) and stored.startswith(COMPRESSED_MARKER)
+    assert len(stored) < len(text)
+    assert codec.decode(stored) == text
+
+    stats = codec.get_stats()
+    assert stats["columns"]["supply_plan_json"]["compressed"] == 1
+    assert stats["columns"]["supply_plan_json"]["saved_percent"] > 50
+    assert stats["decompressed"] == 1
+
+
+@pytest.mark.unit
+def test_small_and_incompressible_values_stay_plain_text():
+    codec = ColumnCodec(enabled=True, min_bytes=100, level=6)
+    small = json.dumps({"level": "LOW"})
+    # Tiny values grow once the marker and zlib framing are added
+    tiny = ColumnCodec(enabled=True, min_bytes=1, level=6)
+
+    assert codec.encode(small, "risk_assessment_json") == small
+    assert tiny.compress(small) == small
+    assert codec.encode(None, "risk_assessment_json") is None
+
+
+@pytest.mark.unit
+def test_legacy_and_disabled_values_read_back_in_both_formats():
+    compressing = ColumnCodec(enabled=True, min_bytes=10, level=6)
+    plain = ColumnCodec(enabled=False, min_bytes=10, level=6)
+    text = json.dumps(LARGE_PLAN)
+
+    # Plain text written before compression existed, also when read back as bytes
+    assert compressing.decode(text) == text
+    assert compressing.decode(text.encode("utf-8")) == text
+    # A disabled codec writes plain text but still reads compressed values
+    assert plain.encode(text, "supply_plan_json") == text
+    assert plain.decode(compressing.compress(text)) == text
+    assert isinstance(plain.compress(text, force=True), bytes)
+
+
+@pytest.mark.unit
+def test_blackboard_columns_are_stored_compressed_and_load_transparently():
+    blackboard = create_plan_blackboard()
+    blackboard.supply_plan = LARGE_PLAN
+    blackboard.risk_assessment = {"overall_risk_level": "LOW"}
+    blackboard_service.update_blackboard(blackboard)
+
+    assert ColumnCodec.is_compressed(_column(blackboard.task_id, "supply_plan_json"))
+    assert not ColumnCodec.is_compressed(_column(blackboard.task_id, "risk_assessment_json"))
+
+    stored = blackboard_service.get_blackboard(blackboard.task_id)
+    assert stored.supply_plan == LARGE_PLAN
+    assert stored.risk_assessment == {"overall_risk_level": "LOW"}
+    assert blackboard_service.get_view(blackboard.task_id).supply_plan == LARGE_PLAN
+
+
+@pytest.mark.unit
+def test_migration_compresses_legacy_rows_and_rolls_back():
+    task_id = create_plan_blackboard().task_id
+    legacy = json.dumps(LARGE_PLAN)
+    conn = get_db()
+    conn.execute("UPDATE blackboards SET supply_plan_json = ? WHERE task_id = ?", (legacy, task_id))
+    conn.commit()
+    conn.close()
+
+    report = migrate(batch_size=2, dry_run=True)
+    assert report["rewritten"] >= 1
+    assert _column(task_id, "supply_plan_json") == legacy
+
+    migrate(batch_size=2)
+    assert ColumnCodec.is_compressed(_column(task_id, "supply_plan_json"))
+    assert blackboard_service.get_blackboard(task_id).supply_plan == LARGE_PLAN
+    # Rerunning finds nothing left to rewrite
+    assert migrate(batch_size=2)["rewritten"] == 0
+
+    migrate(batch_size=2, decompress=True)
+    assert _column(task_id, "supply_plan_json") == legacy
+
+
+@pytest.mark.unit
+def test_migration_skips_rows_written_while_it_runs(monkeypatch):
+    blackboard = create_plan_blackboard()
+    conn = get_db()
+    conn.execute(
+        "UPDATE blackboards SET supply_plan_json = ? WHERE task_id = ?", (json.dumps(LARGE_PLAN), blackboard.task_id)
+    )
+    conn.commit()
+    conn.close()
+    live_plan = {"items": ["written by a running plan"]}
+
+    class RacingConnection:
+        """Lets a plan write the row between the migration's read and its write."""
+
+        def __init__(self, conn):
+            self._conn = conn
+
+        def __getattr__(self, name):
+            return getattr(self._conn, name)
+
+        def execute(self, sql, *args):
+            if sql.startswith("UPDATE blackboards") and blackboard.supply_plan != live_plan:
+                blackboard.supply_plan = live_plan
+                blackboard_service.update_blackboard(blackboard)
+            return self._conn.execute(sql, *args)
+
+    monkeypatch.setattr("src.cli.compress_blackboards.get_db", lambda: RacingConnection(get_db()))
+    report = migrate(batch_size=1000)
+
+    assert report["skipped"] >= 1
+    assert blackboard_service.get_blackboard(blackboard.task_id).supply_plan == live_plan
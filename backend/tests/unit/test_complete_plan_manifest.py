@@ -0,0 +1,88 @@
+"""Unit tests for the complete_plan manifest and its materialization."""
+
+import pytest
+
+from src.agents.documentation_agent import DocumentationAgent
+from src.models.blackboard import materialize_complete_plan
+from src.services.blackboard_service import blackboard_service
+from src.services.claude_client import ClaudeClient
+
+from .agent_fakes import create_plan_blackboard
+
+RISK = {"overall_risk_level": "HIGH", "severity_score": 80}
+SUPPLY = {"items": [{"name": "water", "quantity": 12}]}
+ECONOMIC = {"hardship_letters": ["Dear landlord"]}
+
+
+def _assemble(blackboard):
+    """Build the manifest the Documentation Agent would store."""
+    return DocumentationAgent(ClaudeClient())._assemble_complete_plan(blackboard)
+
+
+@pytest.mark.unit
+def test_manifest_references_sections_instead_of_copying_them():
+    blackboard = create_plan_blackboard()
+    blackboard.risk_assessment = RISK
+    blackboard.supply_plan = SUPPLY
+    blackboard.economic_plan = ECONOMIC
+
+    manifest = _assemble(blackboard)
+
+    # Economic plans are only part of economic crisis plans
+    assert manifest["section_refs"] == ["risk_assessment", "supply_plan"]
+    assert "risk_assessment" not in manifest and "supply_plan" not in manifest
+    assert manifest["crisis_type"] == "hurricane"
+    assert manifest["task_id"] == blackboard.task_id
+
+
+@pytest.mark.unit
+def test_materialize_inlines_referenced_sections_and_defaults_the_rest():
+    blackboard = create_plan_blackboard("economic_crisis")
+    blackboard.risk_assessment = RISK
+    blackboard.economic_plan = ECONOMIC
+    blackboard.complete_plan = _assemble(blackboard)
+
+    plan = blackboard.materialize_complete_plan()
+
+    assert "section_refs" not in plan
+    assert plan["risk_assessment"] == RISK
+    assert plan["economic_plan"] == ECONOMIC
+    assert plan["supply_plan"] is None
+    assert plan["resource_locations"] == []
+    assert plan["video_recommendations"] == []
+    assert plan["crisis_mode"] == "economic_crisis"
+    # The stored manifest is left as it was
+    assert blackboard.complete_plan["section_refs"] == ["risk_assessment", "economic_plan"]
+
+
+@pytest.mark.unit
+def test_materialize_ignores_sections_the_manifest_does_not_reference():
+    blackboard = create_plan_blackboard()
+    blackboard.complete_plan = _assemble(blackboard)
+    # Written after the plan was assembled
+    blackboard.supply_plan = SUPPLY
+
+    assert blackboard.materialize_complete_plan()["supply_plan"] is None
+
+
+@pytest.mark.unit
+def test_embedded_plans_and_missing_plans_are_returned_unchanged():
+    embedded = {"task_id": "old", "risk_assessment": RISK, "supply_plan": SUPPLY}
+
+    assert materialize_complete_plan(embedded, create_plan_blackboard()) is embedded
+    assert materialize_complete_plan(None, create_plan_blackboard()) is None
+
+
+@pytest.mark.unit
+def test_stored_manifest_materializes_from_a_lazy_view():
+    blackboard = create_plan_blackboard()
+    blackboard.risk_assessment = RISK
+    blackboard.supply_plan = SUPPLY
+    blackboard.complete_plan = _assemble(blackboard)
+    blackboard_service.update_blackboard(blackboard)
+
+    view = blackboard_service.get_view(blackboard.task_id)
+
+    assert view.complete_plan == blackboard.complete_plan
+    assert view.materialize_complete_plan() == blackboard.materialize_complete_plan()
+    assert view.materialize_complete_plan()["supply_plan"] == SUPPLY
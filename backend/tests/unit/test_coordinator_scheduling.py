@@ -0,0 +1,194 @@
+"""Unit tests for the coordinator's dependency scheduling and output merging."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.agents.coordinator_agent import CoordinatorAgent
+from src.models.agent_output import AgentOutput
+from src.services.blackboard_service import blackboard_service
+from src.services.claude_client import ClaudeClient
+
+from .agent_fakes import ScriptedRegistry, Step, Trace, create_plan_blackboard
+
+
+def _run(steps: dict[str, Step], crisis_mode: str = "natural_disaster"):
+    """Run every plan agent of a new blackboard through the coordinator."""
+    trace = Trace()
+    coordinator = CoordinatorAgent(ClaudeClient(), registry=ScriptedRegistry(steps, trace))
+    blackboard = asyncio.run(coordinator.run_agents(create_plan_blackboard(crisis_mode)))
+    return blackboard, trace
+
+
+@pytest.mark.unit
+def test_agents_start_as_soon_as_their_dependencies_complete():
+    blackboard, trace = _run({
+        "RiskAssessmentAgent": Step(delay=0.1),
+        "ResourceLocatorAgent": Step(delay=0.3),
+    }, "economic_crisis")
+
+    # Independent agents start right away
+    first_starts = {name for event, name in trace.events[:3] if event == "start"}
+    assert first_starts == {"RiskAssessmentAgent", "ResourceLocatorAgent", "VideoCuratorAgent"}
+
+    # Risk dependents start when risk finishes, without waiting for the slow locator
+    for dependent in ("SupplyPlanningAgent", "FinancialAdvisorAgent"):
+        assert trace.index("start", dependent) > trace.index("finish", "RiskAssessmentAgent")
+        assert trace.index("start", dependent) < trace.index("finish", "ResourceLocatorAgent")
+
+    # Documentation waits for everything else
+    assert trace.events[-2:] == [("start", "DocumentationAgent"), ("finish", "DocumentationAgent")]
+    assert blackboard.is_complete()
+    assert blackboard.total_tokens_used == 60
+
+
+@pytest.mark.unit
+def test_dependents_see_their_dependencies_output():
+    blackboard, trace = _run({
+        "RiskAssessmentAgent": Step(fields={"risk_assessment": {"overall_risk_level": "HIGH"}}),
+        "SupplyPlanningAgent": Step(
+            fields=lambda bb: {"supply_plan": {"risk_level": bb.risk_assessment["overall_risk_level"]}}
+        ),
+    })
+
+    assert trace.snapshots["RiskAssessmentAgent"][0].risk_assessment is None
+    assert blackboard.supply_plan == {"risk_level": "HIGH"}
+
+
+@pytest.mark.unit
+def test_failed_agent_blocks_only_its_dependents():
+    blackboard, trace = _run({"RiskAssessmentAgent": Step(error="no risk data")})
+
+    assert blackboard.agents_failed == ["RiskAssessmentAgent"]
+    assert sorted(blackboard.agents_completed) == ["ResourceLocatorAgent", "VideoCuratorAgent"]
+    for blocked in ("SupplyPlanningAgent", "DocumentationAgent"):
+        assert trace.count("start", blocked) == 0
+    assert "no risk data" in blackboard.errors[0]["error_message"]
+    assert not blackboard.is_complete()
+
+
+@pytest.mark.unit
+def test_agents_work_on_isolated_snapshots():
+    def mutate(snapshot):
+        snapshot.crisis_profile["household"]["adults"] = 99
+        snapshot.agents_completed.append("Intruder")
+
+    blackboard, trace = _run({
+        "ResourceLocatorAgent": Step(on_start=mutate),
+        "RiskAssessmentAgent": Step(delay=0.05),
+    })
+
+    assert blackboard.crisis_profile["household"]["adults"] == 2
+    assert "Intruder" not in blackboard.agents_completed
+    # Started before risk finished, so its snapshot never sees the risk output
+    assert trace.snapshots["VideoCuratorAgent"][0].risk_assessment is None
+    assert trace.snapshots["DocumentationAgent"][0].risk_assessment == {"by": "RiskAssessmentAgent"}
+
+
+@pytest.mark.unit
+def test_outputs_may_only_write_their_own_fields():
+    with pytest.raises(ValueError):
+        AgentOutput(agent_name="SupplyPlanningAgent", fields={"risk_assessment": {}})
+
+
+@pytest.mark.unit
+def test_failed_output_clears_early_fields():
+    blackboard = create_plan_blackboard()
+    blackboard.apply_output(AgentOutput(
+        agent_name="RiskAssessmentAgent", status="partial", fields={"risk_assessment": {"overall_risk_level": "LOW"}}
+    ))
+    assert "RiskAssessmentAgent" not in blackboard.agents_completed
+
+    changed = blackboard.apply_output(AgentOutput.failed("RiskAssessmentAgent", "boom"))
+
+    assert blackboard.risk_assessment is None
+    assert "risk_assessment" in changed
+    assert blackboard.agents_failed == ["RiskAssessmentAgent"]
+
+
+def _risk_step(early_level: str, final_level: str) -> Step:
+    """Risk agent that publishes an early risk level, then finishes with the final one."""
+    return Step(
+        early={"risk_assessment": {"overall_risk_level": early_level}},
+        delay=0.1,
+        fields={"risk_assessment": {"overall_risk_level": final_level, "severity_score": 70}}
+    )
+
+
+def _supply_step(delay: float) -> Step:
+    """Supply agent whose plan records the risk level it was built for."""
+    return Step(
+        delay=delay,
+        fields=lambda bb: {"supply_plan": {"risk_level": bb.risk_assessment["overall_risk_level"]}}
+    )
+
+
+@pytest.mark.unit
+def test_dependents_start_on_early_output():
+    blackboard, trace = _run({
+        "RiskAssessmentAgent": _risk_step("HIGH", "HIGH"),
+        "SupplyPlanningAgent": _supply_step(0.01),
+    })
+
+    assert trace.index("start", "SupplyPlanningAgent") < trace.index("finish", "RiskAssessmentAgent")
+    assert trace.count("start", "SupplyPlanningAgent") == 1
+    assert blackboard.supply_plan == {"risk_level": "HIGH"}
+    assert blackboard.risk_assessment["severity_score"] == 70
+
+
+@pytest.mark.unit
+def test_finished_dependents_rerun_when_the_final_output_differs():
+    blackboard, trace = _run({
+        "RiskAssessmentAgent": _risk_step("LOW", "HIGH"),
+        "SupplyPlanningAgent": _supply_step(0.01),
+    })
+
+    assert trace.count("finish", "SupplyPlanningAgent") == 2
+    assert trace.snapshots["SupplyPlanningAgent"][1].risk_assessment["overall_risk_level"] == "HIGH"
+    assert blackboard.supply_plan == {"risk_level": "HIGH"}
+    assert blackboard.agents_completed.count("SupplyPlanningAgent") == 1
+    assert blackboard.is_complete()
+
+
+@pytest.mark.unit
+def test_running_dependents_restart_when_the_final_output_differs():
+    blackboard, trace = _run({
+        "RiskAssessmentAgent": _risk_step("LOW", "HIGH"),
+        "SupplyPlanningAgent": _supply_step(0.3),
+    })
+
+    # The first run is cancelled before it finishes
+    assert trace.count("start", "SupplyPlanningAgent") == 2
+    assert trace.count("finish", "SupplyPlanningAgent") == 1
+    assert blackboard.supply_plan == {"risk_level": "HIGH"}
+    assert trace.index("start", "DocumentationAgent") > trace.index("finish", "SupplyPlanningAgent")
+
+
+@pytest.mark.unit
+def test_generate_plan_persists_from_worker_threads(monkeypatch):
+    threads = []
+    for name in ("get_blackboard", "create_blackboard", "update_blackboard", "update_fields"):
+        original = getattr(blackboard_service, name)
+
+        def record(*args, _original=original, **kwargs):
+            threads.append(threading.current_thread())
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(blackboard_service, name, record)
+
+    profile = create_plan_blackboard().crisis_profile
+    profile["task_id"] = f"{profile['task_id']}-plan"
+    coordinator = CoordinatorAgent(ClaudeClient(), registry=ScriptedRegistry({}, Trace()))
+
+    blackboard = asyncio.run(coordinator.generate_plan(profile))
+    # Resuming a failed plan reloads and rewrites it the same way
+    blackboard.status = "failed"
+    blackboard_service.update_blackboard(blackboard)
+    threads.clear()
+    resumed = asyncio.run(coordinator.generate_plan(profile, resume=True))
+    plan_threads = list(threads)
+
+    assert resumed.status == "completed"
+    assert blackboard_service.get_blackboard(profile["task_id"]).status == "completed"
+    assert plan_threads and threading.main_thread() not in plan_threads
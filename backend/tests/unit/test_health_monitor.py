@@ -0,0 +1,63 @@
+"""Unit tests for the background health monitor."""
+
+import pytest
+
+from src.services import health_monitor as health_module
+from src.services.health_monitor import MIN_DOWN_ATTEMPTS, HealthMonitor
+from src.services.request_policy import RequestMetrics
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    """Fresh Claude request history for the monitor."""
+    metrics = RequestMetrics()
+    monkeypatch.setattr(health_module, "request_metrics", metrics)
+    return metrics
+
+
+def _record(metrics: RequestMetrics, outcome: str, count: int = 1) -> None:
+    """Record request attempts with one outcome."""
+    for _ in range(count):
+        metrics.record_attempt("claude-haiku-test", 1, False, outcome, 0.5, "APIError" if outcome == "error" else None)
+
+
+@pytest.mark.unit
+def test_single_failed_attempt_only_degrades_claude(metrics):
+    _record(metrics, "error")
+
+    snapshot = HealthMonitor(error_window=60).refresh(allow_live_probe=False)
+
+    assert snapshot["dependencies"]["claude_api"]["status"] == "degraded"
+    assert snapshot["ready"] is True
+
+
+@pytest.mark.unit
+def test_claude_outage_is_reported_without_making_the_instance_unready(metrics):
+    _record(metrics, "error", MIN_DOWN_ATTEMPTS)
+
+    snapshot = HealthMonitor(error_window=60).refresh(allow_live_probe=False)
+
+    assert snapshot["dependencies"]["claude_api"]["status"] == "down"
+    assert snapshot["dependencies"]["claude_api"]["error_rate"] == 1.0
+    assert snapshot["ready"] is True
+
+
+@pytest.mark.unit
+def test_mostly_successful_traffic_is_up(metrics):
+    _record(metrics, "success", 3)
+    _record(metrics, "error")
+
+    snapshot = HealthMonitor(error_window=60).refresh(allow_live_probe=False)
+
+    assert snapshot["dependencies"]["claude_api"]["status"] == "up"
+
+
+@pytest.mark.unit
+def test_database_failure_makes_the_instance_unready(metrics, monkeypatch):
+    monitor = HealthMonitor(error_window=60)
+    monkeypatch.setattr(monitor, "_probe_database", lambda: {"status": "down", "error": "disk I/O error"})
+
+    snapshot = monitor.refresh(allow_live_probe=False)
+
+    assert snapshot["ready"] is False
+    assert monitor.get_snapshot()["dependencies"]["database"]["status"] == "down"
@@ -0,0 +1,249 @@
+"""Unit tests for the SQLite-backed plan job queue."""
+
+import sqlite3
+import time
+
+import pytest
+
+from src.api.database import get_db
+from src.services.blackboard_service import blackboard_service
+from src.services.job_queue import JobQueue, QueueFullError
+
+from .agent_fakes import create_plan_blackboard
+
+
+@pytest.fixture(autouse=True)
+def empty_queue():
+    """Start every test with an empty plan_jobs table."""
+    conn = get_db()
+    conn.execute("DELETE FROM plan_jobs")
+    conn.commit()
+    conn.close()
+
+
+def _job(task_id: str) -> dict:
+    """Read a job row."""
+    conn = get_db()
+    try:
+        return dict(conn.execute("SELECT * FROM plan_jobs WHERE task_id = ?", (task_id,)).fetchone())
+    finally:
+        conn.close()
+
+
+def _set_lease(task_id: str, lease_expires_at: float) -> None:
+    """Overwrite a job's lease expiry."""
+    conn = get_db()
+    conn.execute("UPDATE plan_jobs SET lease_expires_at = ? WHERE task_id = ?", (lease_expires_at, task_id))
+    conn.commit()
+    conn.close()
+
+
+@pytest.mark.unit
+def test_enqueue_reports_queue_positions():
+    queue = JobQueue(max_concurrent=1, max_queued=5)
+
+    assert queue.enqueue("job-a", {"task_id": "job-a"}) == 1
+    assert queue.enqueue("job-b", {"task_id": "job-b"}) == 2
+
+    assert queue.get_position("job-a") == 1
+    assert queue.get_position("job-b") == 2
+    assert queue.get_position("unknown") is None
+    assert queue.get_stats() == {"queued": 2}
+
+
+@pytest.mark.unit
+def test_enqueue_rejects_jobs_beyond_max_queued():
+    queue = JobQueue(max_concurrent=1, max_queued=2)
+    queue.enqueue("job-a", {})
+    queue.enqueue("job-b", {})
+
+    with pytest.raises(QueueFullError) as excinfo:
+        queue.enqueue("job-c", {})
+
+    assert (excinfo.value.queued, excinfo.value.limit) == (2, 2)
+    assert queue.get_stats() == {"queued": 2}
+
+
+@pytest.mark.unit
+def test_claim_takes_oldest_job_with_a_lease_and_respects_concurrency():
+    queue = JobQueue(max_concurrent=1, max_queued=5, lease_seconds=30)
+    queue.enqueue("job-a", {"task_id": "job-a"})
+    queue.enqueue("job-b", {"task_id": "job-b"})
+
+    before = time.time()
+    assert queue._claim_next("w-1") == ("job-a", {"task_id": "job-a"}, 1)
+
+    job = _job("job-a")
+    assert job["status"] == "running"
+    assert job["worker_id"] == "w-1"
+    assert job["attempts"] == 1
+    assert before + 30 <= job["lease_expires_at"] <= time.time() + 30
+
+    # The only slot is taken
+    assert queue._claim_next("w-2") is None
+
+    queue._finish("job-a", "done")
+    assert _job("job-a")["status"] == "done"
+    assert queue._claim_next("w-2")[0] == "job-b"
+
+
+@pytest.mark.unit
+def test_heartbeat_renews_leases_of_own_running_jobs_only():
+    queue = JobQueue(max_concurrent=2, max_queued=5, lease_seconds=30)
+    other = JobQueue(max_concurrent=2, max_queued=5, lease_seconds=30)
+    queue.enqueue("job-own", {})
+    queue.enqueue("job-other", {})
+    queue._claim_next(f"{queue.worker_prefix}-0")
+    other._claim_next(f"{other.worker_prefix}-0")
+
+    soon = time.time() + 1
+    _set_lease("job-own", soon)
+    _set_lease("job-other", soon)
+    # Claimed by the other process, so not in this queue's active set
+    queue._active.add("job-other")
+
+    queue._renew_leases()
+
+    assert _job("job-own")["lease_expires_at"] >= time.time() + 29
+    assert _job("job-other")["lease_expires_at"] == soon
+
+
+@pytest.mark.unit
+def test_expired_lease_is_reclaimed_as_next_attempt():
+    dead = JobQueue(max_concurrent=1, max_queued=5, lease_seconds=30, max_attempts=3)
+    dead.enqueue("job-a", {"task_id": "job-a"})
+    dead._claim_next("dead-0")
+
+    live = JobQueue(max_concurrent=1, max_queued=5, lease_seconds=30, max_attempts=3)
+    # The lease still counts against the concurrency limit until it expires
+    assert live._claim_next("live-0") is None
+
+    _set_lease("job-a", time.time() - 1)
+
+    assert live._claim_next("live-0") == ("job-a", {"task_id": "job-a"}, 2)
+    assert _job("job-a")["worker_id"] == "live-0"
+
+
+@pytest.mark.unit
+def test_expired_job_out_of_attempts_is_abandoned():
+    queue = JobQueue(max_concurrent=1, max_queued=5, lease_seconds=30, max_attempts=1)
+    queue.enqueue("job-a", {})
+    queue.enqueue("job-b", {})
+    queue._claim_next("dead-0")
+    _set_lease("job-a", time.time() - 1)
+
+    # The abandoned job frees its slot for the next one
+    assert queue._claim_next("live-0")[0] == "job-b"
+
+    job = _job("job-a")
+    assert job["status"] == "failed"
+    assert job["error_message"] == "Abandoned after 1 attempts"
+
+
+@pytest.mark.unit
+def test_workers_run_jobs_and_record_failures():
+    queue = JobQueue(max_concurrent=2, max_queued=5, poll_interval=0.05, lease_seconds=30)
+    seen = []
+
+    def handler(payload: dict, attempt: int) -> None:
+        seen.append((payload["task_id"], attempt))
+        if payload["task_id"] == "job-bad":
+            raise ValueError("boom")
+
+    queue.enqueue("job-ok", {"task_id": "job-ok"})
+    queue.enqueue("job-bad", {"task_id": "job-bad"})
+    queue.start(handler)
+    try:
+        deadline = time.time() + 5
+        while time.time() < deadline and set(queue.get_stats()) & {"queued", "running"}:
+            time.sleep(0.02)
+    finally:
+        queue.stop(timeout=5)
+
+    assert sorted(seen) == [("job-bad", 1), ("job-ok", 1)]
+    assert _job("job-ok")["status"] == "done"
+    bad = _job("job-bad")
+    assert (bad["status"], bad["error_message"]) == ("failed", "boom")
+
+
+@pytest.mark.unit
+def test_finish_releases_the_slot_when_the_database_is_locked(monkeypatch):
+    queue = JobQueue(max_concurrent=1, max_queued=5, lease_seconds=30)
+    queue.enqueue("job-a", {})
+    queue._claim_next("w-1")
+    assert queue._active == {"job-a"}
+
+    def locked():
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(queue, "_get_conn", locked)
+    queue._finish("job-a", "done")
+    monkeypatch.undo()
+
+    # No longer renewed, so the lease runs out and the job is reclaimed
+    assert queue._active == set()
+    _set_lease("job-a", time.time() - 1)
+    assert queue._claim_next("w-2")[:1] == ("job-a",)
+
+
+@pytest.mark.unit
+def test_workers_survive_claim_errors():
+    queue = JobQueue(max_concurrent=1, max_queued=5, poll_interval=0.05, lease_seconds=30)
+    claim = queue._claim_next
+    failures = []
+
+    def flaky_claim(worker_id):
+        if not failures:
+            failures.append(worker_id)
+            raise RuntimeError("corrupt payload")
+        return claim(worker_id)
+
+    queue._claim_next = flaky_claim
+    queue.enqueue("job-a", {"task_id": "job-a"})
+    queue.start(lambda payload, attempt: None)
+    try:
+        deadline = time.time() + 5
+        while time.time() < deadline and _job("job-a")["status"] != "done":
+            time.sleep(0.02)
+    finally:
+        queue.stop(timeout=5)
+
+    assert failures
+    assert _job("job-a")["status"] == "done"
+
+
+class _FailingConnection:
+    """Connection that fails the statement containing a marker."""
+
+    def __init__(self, conn, marker: str) -> None:
+        self._conn = conn
+        self._marker = marker
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def execute(self, sql, *args):
+        if self._marker in sql:
+            raise sqlite3.OperationalError("database is locked")
+        return self._conn.execute(sql, *args)
+
+
+@pytest.mark.unit
+def test_failed_claim_does_not_fail_abandoned_plans(monkeypatch):
+    blackboard = create_plan_blackboard()
+    queue = JobQueue(max_concurrent=1, max_queued=5, lease_seconds=30, max_attempts=1)
+    queue.enqueue(blackboard.task_id, {})
+    queue._claim_next("dead-0")
+    _set_lease(blackboard.task_id, time.time() - 1)
+
+    monkeypatch.setattr(queue, "_get_conn", lambda: _FailingConnection(get_db(), "COUNT(*)"))
+    assert queue._claim_next("live-0") is None
+
+    # The abandonment was rolled back along with the claim
+    assert _job(blackboard.task_id)["status"] == "running"
+    assert blackboard_service.get_blackboard(blackboard.task_id).status == "initialized"
+
+    monkeypatch.undo()
+    queue._claim_next("live-0")
+    assert _job(blackboard.task_id)["status"] == "failed"
+    assert blackboard_service.get_blackboard(blackboard.task_id).status == "failed"
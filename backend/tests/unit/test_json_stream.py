@@ -0,0 +1,86 @@
+"""Unit tests for streamed JSON field extraction."""
+
+import pytest
+
+from src.utils.json_stream import JsonFieldScanner
+
+RESPONSE = (
+    '```json\n{\n  "overall_risk_level": "HIGH",\n  "severity_score": 85,\n'
+    '  "threats": [{"name": "storm surge", "probability": 0.7}],\n'
+    '  "evacuate": true,\n  "summary": "Leave early"\n}\n```'
+)
+
+
+def _feed_in_chunks(text: str, size: int) -> tuple[JsonFieldScanner, list[dict]]:
+    """Feed text in fixed-size deltas, collecting what each delta completed."""
+    scanner = JsonFieldScanner()
+    completed = [scanner.feed(text[i:i + size]) for i in range(0, len(text), size)]
+    return scanner, [fields for fields in completed if fields]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("size", [1, 2, 7, 40, len(RESPONSE)])
+def test_fields_are_extracted_whatever_the_chunking(size):
+    scanner, _ = _feed_in_chunks(RESPONSE, size)
+
+    assert scanner.fields == {
+        "overall_risk_level": "HIGH",
+        "severity_score": 85,
+        "threats": [{"name": "storm surge", "probability": 0.7}],
+        "evacuate": True,
+        "summary": "Leave early"
+    }
+    assert scanner.done
+
+
+@pytest.mark.unit
+def test_each_field_is_reported_once_when_it_completes():
+    _, completed = _feed_in_chunks(RESPONSE, 1)
+
+    assert [list(fields) for fields in completed] == [
+        ["overall_risk_level"], ["severity_score"], ["threats"], ["evacuate"], ["summary"]
+    ]
+
+
+@pytest.mark.unit
+def test_numbers_and_literals_wait_for_the_next_character():
+    scanner = JsonFieldScanner()
+
+    assert scanner.feed('{"severity_score": 8') == {}
+    assert scanner.feed('5') == {}
+    assert scanner.feed(', "evacuate": tru') == {"severity_score": 85}
+    assert scanner.feed('e') == {}
+    assert scanner.feed('}') == {"evacuate": True}
+
+
+@pytest.mark.unit
+def test_strings_and_containers_complete_when_they_close():
+    scanner = JsonFieldScanner()
+
+    assert scanner.feed('{"level": "HI') == {}
+    assert scanner.feed('GH"') == {"level": "HIGH"}
+    assert scanner.feed(', "threats": [{"name": "fl') == {}
+    assert scanner.feed('ood"}, {"name": "wind"}') == {}
+    assert scanner.feed(']') == {"threats": [{"name": "flood"}, {"name": "wind"}]}
+    # A brace inside a string does not close the object
+    assert scanner.feed(', "note": "}"') == {"note": "}"}
+    assert not scanner.done
+
+
+@pytest.mark.unit
+def test_text_after_the_object_closes_is_ignored():
+    scanner = JsonFieldScanner()
+    scanner.feed('Here is the plan: {"level": "LOW"}')
+    assert scanner.done
+
+    assert scanner.feed(' {"level": "HIGH", "extra": 1}') == {}
+    assert scanner.fields == {"level": "LOW"}
+
+
+@pytest.mark.unit
+def test_nothing_is_extracted_before_the_object_starts():
+    scanner = JsonFieldScanner()
+
+    assert scanner.feed("```js") == {}
+    assert scanner.feed("on\n") == {}
+    assert scanner.feed('{"a": "b"}') == {"a": "b"}
@@ -0,0 +1,162 @@
+"""Unit tests for the cross-worker rate limiter."""
+
+import asyncio
+import uuid
+
+import pytest
+
+from src.api.database import get_db
+from src.services.rate_limiter import RateLimiter
+
+
+def _limiter(rpm: int = 6000, tpm: int = 60000, **kwargs) -> tuple[RateLimiter, str, str]:
+    """Build a limiter for a model family of its own."""
+    family = f"fam{uuid.uuid4().hex[:8]}"
+    kwargs.setdefault("share_fraction", 0.0)
+    limiter = RateLimiter(enabled=True, limits=f"{family}={rpm}:{tpm}", sync_seconds=60, **kwargs)
+    return limiter, family, f"claude-{family}-test"
+
+
+def _level(key: str) -> float:
+    """Read a shared bucket level."""
+    conn = get_db()
+    try:
+        return conn.execute("SELECT level FROM rate_limit_buckets WHERE bucket_key = ?", (key,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _flush(limiter: RateLimiter) -> None:
+    """Wait for the limiter's queued bucket writes."""
+    limiter._writer.submit(lambda: None).result()
+
+
+@pytest.mark.unit
+def test_unlimited_models_never_wait():
+    limiter, _, model = _limiter()
+    disabled = RateLimiter(enabled=False, limits="x=1:1")
+
+    assert asyncio.run(limiter.acquire("claude-other-model", 10**9)) == 0.0
+    assert asyncio.run(disabled.acquire("claude-x", 10**9)) == 0.0
+    assert limiter.expected_wait("claude-other-model", 10**9) == 0.0
+
+
+@pytest.mark.unit
+def test_first_request_takes_a_share_and_later_ones_are_served_from_it():
+    limiter, family, model = _limiter(share_fraction=0.1)
+
+    asyncio.run(limiter.acquire(model, 1000))
+
+    # The request plus a tenth of each bucket
+    assert _level(f"{family}:rpm") == pytest.approx(6000 - 601, abs=5)
+    assert _level(f"{family}:tpm") == pytest.approx(60000 - 7000, abs=50)
+
+    before = (_level(f"{family}:rpm"), _level(f"{family}:tpm"))
+    for _ in range(5):
+        assert asyncio.run(limiter.acquire(model, 1000)) < 0.05
+    assert (_level(f"{family}:rpm"), _level(f"{family}:tpm")) == before
+    assert limiter._shares[family]["allowance"][f"{family}:tpm"] == pytest.approx(1000)
+
+
+@pytest.mark.unit
+def test_requests_wait_for_the_bucket_to_refill():
+    limiter, _, model = _limiter(max_poll_seconds=0.05)
+
+    asyncio.run(limiter.acquire(model, 60000, priority="high"))
+    # 500 tokens refill in half a second at 60000 per minute
+    waited = asyncio.run(limiter.acquire(model, 500, priority="high"))
+
+    assert 0.3 < waited < 2.0
+    stats = limiter.get_stats()["queue_wait"]
+    assert stats[f"{limiter._limits_for(model)[0]}:high"]["queued"] == 1
+
+
+@pytest.mark.unit
+def test_lower_priorities_keep_larger_reserves():
+    limiter, _, model = _limiter()
+    asyncio.run(limiter.acquire(model, 45000))
+
+    # 15000 tokens left: high may use all of it, normal must leave 6000, low 18000
+    assert limiter.expected_wait(model, 1000, priority="high") == 0.0
+    assert limiter.expected_wait(model, 1000, priority="normal") == 0.0
+    assert limiter.expected_wait(model, 1000, priority="low") == pytest.approx(4.0, abs=0.3)
+    assert limiter.expected_wait(model, 10000, priority="normal") == pytest.approx(1.0, abs=0.3)
+
+
+@pytest.mark.unit
+def test_waiting_requests_of_one_priority_are_served_in_arrival_order():
+    limiter, _, model = _limiter(max_poll_seconds=0.02)
+    order = []
+
+    async def request(number: int) -> None:
+        await limiter.acquire(model, 100, priority="high")
+        order.append(number)
+
+    async def main() -> None:
+        await limiter.acquire(model, 60000, priority="high")
+        tasks = []
+        for number in range(4):
+            tasks.append(asyncio.create_task(request(number)))
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+
+    assert order == [0, 1, 2, 3]
+
+
+@pytest.mark.unit
+def test_polling_a_drained_bucket_does_not_write(monkeypatch):
+    limiter, _, model = _limiter(max_poll_seconds=0.02)
+    asyncio.run(limiter.acquire(model, 60000, priority="high"))
+
+    writes = []
+    original = limiter._write_levels
+    monkeypatch.setattr(limiter, "_write_levels", lambda *args: writes.append(args) or original(*args))
+
+    async def starved() -> None:
+        # Normal requests must leave 6000 tokens, which takes six seconds to refill
+        await asyncio.wait_for(limiter.acquire(model, 100), timeout=0.3)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(starved())
+
+    assert writes == []
+    assert limiter.get_stats()["waiting"][limiter._limits_for(model)[0]]["requests"] == 0
+
+
+@pytest.mark.unit
+def test_settle_keeps_returned_tokens_in_the_share_up_to_its_size():
+    limiter, family, model = _limiter(share_fraction=0.1)
+    asyncio.run(limiter.acquire(model, 5000))
+    asyncio.run(limiter.acquire(model, 5000))
+    key = f"{family}:tpm"
+    stored = _level(key)
+
+    limiter.settle(model, 5000, 3000)
+    _flush(limiter)
+
+    assert limiter._shares[family]["allowance"][key] == pytest.approx(3000)
+    assert _level(key) == stored
+
+    # Anything beyond the share's normal size goes back to the shared bucket
+    limiter.settle(model, 5000, 0)
+    _flush(limiter)
+
+    assert limiter._shares[family]["allowance"][key] == pytest.approx(6000)
+    assert _level(key) == pytest.approx(stored + 2000, abs=100)
+
+
+@pytest.mark.unit
+def test_penalize_drains_the_request_bucket_for_every_worker():
+    limiter, family, model = _limiter(share_fraction=0.1)
+    other = RateLimiter(enabled=True, limits=f"{family}=6000:60000", sync_seconds=60)
+    asyncio.run(limiter.acquire(model, 100))
+
+    limiter.penalize(model)
+    _flush(limiter)
+
+    assert _level(f"{family}:rpm") < 10
+    assert limiter._shares[family]["allowance"][f"{family}:rpm"] == 0.0
+    # Normal requests must wait for a tenth of the bucket to refill
+    assert other.expected_wait(model, 100, priority="normal") > 5